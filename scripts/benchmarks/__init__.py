@@ -0,0 +1,7 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+
+from .cli import main
+
+__all__ = ["main"]
@@ -0,0 +1,6 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+from .cli import main
+
+main()
@@ -0,0 +1,29 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+
+import argparse
+from collections.abc import Callable
+
+from . import serializers, startup, translations
+
+BENCHMARKS: dict[str, Callable[[int], None]] = {
+    "serializers": serializers.run,
+    "startup": startup.run,
+    "translations": translations.run,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run Botkit micro-benchmarks.")
+    parser.add_argument("benchmark", choices=[*BENCHMARKS, "all"], nargs="?", default="all")
+    parser.add_argument("-n", "--number", type=int, default=100_000, help="Iterations per measurement")
+
+    args = parser.parse_args()
+
+    for name, run in BENCHMARKS.items():
+        if args.benchmark in (name, "all"):
+            run(args.number)
+
+
+__all__ = ["BENCHMARKS", "main"]
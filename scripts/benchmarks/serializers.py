@@ -0,0 +1,44 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+"""Serialization cost of one cooldown check against the Redis cache.
+
+A check on the cache-backed sliding window reads the stored timestamps (``loads``) and writes them back with the new
+invocation (``dumps``). ``json`` is the aiocache default the Redis cache used before serializers were configurable.
+"""
+
+import time
+from timeit import timeit
+
+from aiocache.serializers import BaseSerializer
+
+from src.cache.serializers import SerializerName, create_serializer
+
+SERIALIZERS: tuple[SerializerName, ...] = ("json", "pickle", "orjson", "msgpack")
+LIMITS = (1, 5, 20)
+
+
+def _check_cost(serializer: BaseSerializer, limit: int, number: int) -> float:
+    now = time.time()
+    stored = serializer.dumps(tuple(now - i for i in range(limit)))
+
+    def check() -> None:
+        stamps = serializer.loads(stored)
+        serializer.dumps((*stamps[1:], now))
+
+    return timeit(check, number=number) / number * 1_000_000
+
+
+def run(number: int) -> None:
+    print(f"Serialization cost per cooldown check (µs, {number} iterations)")
+    print(f"{'serializer':<12}" + "".join(f"{f'limit={limit}':>12}" for limit in LIMITS))
+    for name in SERIALIZERS:
+        try:
+            serializer = create_serializer(name)
+        except RuntimeError as e:
+            print(f"{name:<12}skipped: {e}")
+            continue
+        print(f"{name:<12}" + "".join(f"{_check_cost(serializer, limit, number):>12.2f}" for limit in LIMITS))
+
+
+__all__ = ["run"]
@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+"""Time spent loading the translation files at startup.
+
+Every extension and help page translation file is copied to a temporary directory and loaded like the bot does at
+startup. ``cold`` parses the YAML and writes the compiled cache, ``warm`` reads the cache written by the cold start.
+``active`` is a warm start keeping only the ``ACTIVE_LOCALES`` translations. Memory is what the loaded translations
+hold once loaded.
+"""
+
+import shutil
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from src.extensions.help.pages.classes import HelpCategoryTranslation
+from src.i18n.cache import cache_path, load_yaml
+from src.i18n.classes import ExtensionTranslation, set_active_locales
+
+SRC = Path(__file__).parents[2] / "src"
+FILES: tuple[tuple[str, type[BaseModel]], ...] = (
+    ("extensions/*/translations.y*ml", ExtensionTranslation),
+    ("translations/*.y*ml", ExtensionTranslation),
+    ("extensions/help/pages/*.y*ml", HelpCategoryTranslation),
+)
+MAX_ROUNDS = 10
+ACTIVE_LOCALES = ("fr",)
+
+
+def _copy(directory: Path) -> list[tuple[Path, type[BaseModel]]]:
+    files: list[tuple[Path, type[BaseModel]]] = []
+    for i, (pattern, model) in enumerate(FILES):
+        for j, file in enumerate(SRC.glob(pattern)):
+            copy = directory / f"{i}_{j}_{file.name}"
+            shutil.copyfile(file, copy)
+            files.append((copy, model))
+    return files
+
+
+def _load(files: list[tuple[Path, type[BaseModel]]], before: Callable[[Path], None]) -> float:
+    elapsed = 0.0
+    for path, model in files:
+        before(path)
+        start = time.perf_counter()
+        model(**load_yaml(path))
+        elapsed += time.perf_counter() - start
+    return elapsed * 1000
+
+
+def _memory(files: list[tuple[Path, type[BaseModel]]]) -> float:
+    tracemalloc.start()
+    try:
+        loaded = [model(**load_yaml(path)) for path, model in files]
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del loaded
+    return size / 1024
+
+
+def _drop_cache(path: Path) -> None:
+    cache_path(path).unlink(missing_ok=True)
+
+
+def run(number: int) -> None:
+    rounds = min(number, MAX_ROUNDS)
+    with tempfile.TemporaryDirectory() as directory:
+        files = _copy(Path(directory))
+        results = {
+            "cold": (min(_load(files, _drop_cache) for _ in range(rounds)), _memory(files)),
+            "warm": (min(_load(files, lambda _: None) for _ in range(rounds)), _memory(files)),
+        }
+        set_active_locales(ACTIVE_LOCALES)
+        try:
+            results["active"] = (min(_load(files, lambda _: None) for _ in range(rounds)), _memory(files))
+        finally:
+            set_active_locales(None)
+    print(f"Translation loading at startup ({len(files)} files, best of {rounds}, active locales: {ACTIVE_LOCALES})")
+    print(f"{'load':<12}{'ms':>12}{'KiB':>12}")
+    for name, (elapsed, memory) in results.items():
+        print(f"{name:<12}{elapsed:>12.2f}{memory:>12.1f}")
+
+
+__all__ = ["run"]
@@ -0,0 +1,46 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+"""Cost of reading one translated string.
+
+``model_dump`` is the lookup ``RawTranslation.get_for_locale`` did before translations were compiled into per-locale
+tables: the whole model was dumped for each locale read, twice when falling back to the default locale. ``wrapper``
+is a full ``ctx.translations.key`` access, including placeholder formatting.
+"""
+
+from collections.abc import Callable
+from timeit import timeit
+
+from src.i18n.classes import DEFAULT, LOCALE_INDEX, RawTranslation, TranslationWrapper
+
+TRANSLATION = RawTranslation.model_validate({"en-US": "Hello {user}!", "fr": "Bonjour {user} !"})
+LOCALES = ("fr", "de")  # translated, falling back to the default locale
+
+
+def _model_dump(locale: str) -> str | None:
+    field, default = locale.replace("-", "_"), DEFAULT.replace("-", "_")
+    return TRANSLATION.model_dump(by_alias=False).get(field) or TRANSLATION.model_dump(by_alias=False).get(default)
+
+
+def _wrapper(locale: str) -> Callable[[], object]:
+    wrapper = TranslationWrapper({"greeting": TRANSLATION}, locale)
+    return lambda: wrapper.greeting
+
+
+def _cost(lookup: Callable[[], object], number: int) -> float:
+    return timeit(lookup, number=number) / number * 1_000_000
+
+
+def run(number: int) -> None:
+    print(f"Cost of one translated string lookup (µs, {number} iterations)")
+    print(f"{'lookup':<12}" + "".join(f"{locale:>12}" for locale in LOCALES))
+    rows: dict[str, Callable[[str], Callable[[], object]]] = {
+        "model_dump": lambda locale: lambda: _model_dump(locale),
+        "table": lambda locale: lambda: TRANSLATION.lookup(LOCALE_INDEX[locale]),
+        "wrapper": _wrapper,
+    }
+    for name, lookup in rows.items():
+        print(f"{name:<12}" + "".join(f"{_cost(lookup(locale), number):>12.2f}" for locale in LOCALES))
+
+
+__all__ = ["run"]
@@ -6,21 +6,44 @@ import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 # the above line allows us to import from src without any issues whilst using src/__main__.py
+import argparse
 import asyncio
 
 from src.config import config
-from src.log import configure_logging
+from src.log import configure_logging, logger
 from src.patcher import load_and_run_patches
 
 
+async def run_migrations() -> None:
+    if not config.db.enabled:
+        logger.error("The database is disabled, there are no migrations to apply")
+        return
+    from src.database.config import migrate, shutdown  # noqa: PLC0415
+
+    try:
+        await migrate()
+    finally:
+        await shutdown()
+
+
 async def main() -> None:
+    parser = argparse.ArgumentParser(description="Start Botkit.")
+    migrations = parser.add_mutually_exclusive_group()
+    migrations.add_argument("--migrate-only", action="store_true", help="Apply pending database migrations and exit")
+    migrations.add_argument("--no-migrate", action="store_true", help="Start without applying database migrations")
+    args = parser.parse_args()
+
     configure_logging(config.logging)
+    if args.migrate_only:
+        await run_migrations()
+        return
+
     await load_and_run_patches()
     # we import main here to apply patches before importing as many things we can
     # and allow the patches to be applied to later imported modules
     from src.start import start  # noqa: PLC0415
 
-    await start()
+    await start(run_migrations=not args.no_migrate)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,17 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+from .lru import LRUMemoryCache, LRUShard
+from .redis import create_redis_cache
+from .serializers import MsgpackSerializer, OrjsonSerializer, create_serializer
+from .tiered import TieredCache
+
+__all__ = [
+    "LRUMemoryCache",
+    "LRUShard",
+    "MsgpackSerializer",
+    "OrjsonSerializer",
+    "TieredCache",
+    "create_redis_cache",
+    "create_serializer",
+]
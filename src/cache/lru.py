@@ -0,0 +1,233 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+import heapq
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, final, override
+
+import aiocache
+from aiocache.serializers import BaseSerializer, NullSerializer
+
+from src.config.models import LRUConfig
+
+type LRUKey = tuple[str, str]
+type LRUEntry = tuple[Any, float | None, int]  # value, expiry (monotonic), estimated size
+
+
+def estimate_size(value: object) -> int:
+    """Estimate the memory footprint of a value, following containers one level deep."""
+    size = sys.getsizeof(value)
+    if isinstance(value, tuple | list | set | frozenset):
+        size += sum(sys.getsizeof(item) for item in value)  # pyright: ignore[reportUnknownVariableType, reportUnknownArgumentType]
+    elif isinstance(value, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())  # pyright: ignore[reportUnknownVariableType, reportUnknownArgumentType]
+    return size
+
+
+@final
+class LRUShard:
+    """Entries of a single namespace, kept in least recently used order.
+
+    Reads are O(1) and writes O(1), or O(log n) with a TTL. Once ``max_entries`` or ``max_bytes`` is
+    exceeded, the least recently used entries are dropped and counted in :attr:`evictions`. Deadlines are
+    also kept in a heap, so each write drops the entries that expired since, even in unbounded shards.
+    """
+
+    def __init__(self, max_entries: int | None = None, max_bytes: int | None = None) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[str, LRUEntry] = OrderedDict()
+        # (expiry, key) of every write with a TTL. Keys rewritten or removed since are skipped when popped.
+        self.deadlines: list[tuple[float, str]] = []
+        self.bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str, now: float) -> Any:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= now:
+            self.pop(key)
+            self.expirations += 1
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key: str, value: Any, expires_at: float | None, now: float) -> None:
+        size = estimate_size(value) if self.max_bytes is not None else 0
+        self.pop(key)
+        self.entries[key] = (value, expires_at, size)
+        self.bytes += size
+        if expires_at is not None:
+            heapq.heappush(self.deadlines, (expires_at, key))
+        self.purge(now)
+        self.evict(now)
+
+    def pop(self, key: str) -> LRUEntry | None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+        return entry
+
+    def purge(self, now: float) -> None:
+        """Drop the entries that expired at ``now``."""
+        while self.deadlines and self.deadlines[0][0] <= now:
+            expires_at, key = heapq.heappop(self.deadlines)
+            entry = self.entries.get(key)
+            if entry is not None and entry[1] == expires_at:
+                self.pop(key)
+                self.expirations += 1
+
+    def evict(self, now: float) -> None:
+        while self.entries and (
+            (self.max_entries is not None and len(self.entries) > self.max_entries)
+            or (self.max_bytes is not None and self.bytes > self.max_bytes)
+        ):
+            _, (_, expires_at, size) = self.entries.popitem(last=False)
+            self.bytes -= size
+            if expires_at is not None and expires_at <= now:
+                self.expirations += 1
+            else:
+                self.evictions += 1
+
+
+@final
+class LRUMemoryCache(aiocache.BaseCache):
+    """Bounded in-process cache with per-namespace LRU eviction and TTL.
+
+    Each namespace (``cooldown``, ``cooldown:gcra``...) lives in its own :class:`LRUShard`, bounded by
+    the limits configured for it in :class:`~src.config.models.LRUConfig`, so one busy namespace cannot
+    push the others out. Expired entries are dropped when read or by the next write to their namespace,
+    instead of holding one timer per key.
+    """
+
+    NAME = "lru"
+
+    def __init__(
+        self, config: LRUConfig | None = None, serializer: BaseSerializer | None = None, **kwargs: Any
+    ) -> None:
+        super().__init__(serializer=serializer or NullSerializer(), **kwargs)
+        self.config: LRUConfig = config or LRUConfig()
+        self.shards: dict[str, LRUShard] = {}
+
+    def get_shard(self, namespace: str) -> LRUShard:
+        if (shard := self.shards.get(namespace)) is None:
+            limits = self.config.get_limits(namespace)
+            shard = self.shards[namespace] = LRUShard(limits.max_entries, limits.max_bytes)
+        return shard
+
+    @property
+    def evictions(self) -> int:
+        """Total number of entries evicted to respect the size limits, across namespaces."""
+        return sum(shard.evictions for shard in self.shards.values())
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Get the size, eviction and expiration counters of each namespace."""
+        return {
+            namespace: {
+                "entries": len(shard.entries),
+                "bytes": shard.bytes,
+                "evictions": shard.evictions,
+                "expirations": shard.expirations,
+            }
+            for namespace, shard in self.shards.items()
+        }
+
+    @override
+    def _build_key(self, key: str, namespace: str | None = None) -> LRUKey:  # pyright: ignore[reportIncompatibleMethodOverride]
+        return (namespace if namespace is not None else self.namespace or "", key)
+
+    def _read(self, key: LRUKey) -> Any:
+        return self.get_shard(key[0]).get(key[1], time.monotonic())
+
+    def _write(self, key: LRUKey, value: Any, ttl: float | None) -> None:
+        now = time.monotonic()
+        self.get_shard(key[0]).set(key[1], value, now + ttl if ttl else None, now)
+
+    @override
+    async def _get(self, key: LRUKey, encoding: str | None = "utf-8", _conn: Any = None) -> Any:
+        return self._read(key)
+
+    @override
+    async def _gets(self, key: LRUKey, encoding: str | None = "utf-8", _conn: Any = None) -> Any:
+        return self._read(key)
+
+    @override
+    async def _multi_get(self, keys: list[LRUKey], encoding: str | None = "utf-8", _conn: Any = None) -> list[Any]:
+        return [self._read(key) for key in keys]
+
+    @override
+    async def _set(
+        self, key: LRUKey, value: Any, ttl: float | None = None, _cas_token: Any = None, _conn: Any = None
+    ) -> bool | int:
+        if _cas_token is not None and _cas_token != self._read(key):
+            return 0
+        self._write(key, value, ttl)
+        return True
+
+    @override
+    async def _multi_set(self, pairs: list[tuple[LRUKey, Any]], ttl: float | None = None, _conn: Any = None) -> bool:
+        for key, value in pairs:
+            self._write(key, value, ttl)
+        return True
+
+    @override
+    async def _add(self, key: LRUKey, value: Any, ttl: float | None = None, _conn: Any = None) -> bool:
+        if self._read(key) is not None:
+            raise ValueError(f"Key {key} already exists, use .set to update the value")
+        self._write(key, value, ttl)
+        return True
+
+    @override
+    async def _exists(self, key: LRUKey, _conn: Any = None) -> bool:
+        return self._read(key) is not None
+
+    @override
+    async def _increment(self, key: LRUKey, delta: int, _conn: Any = None) -> int:
+        shard = self.get_shard(key[0])
+        now = time.monotonic()
+        current = shard.get(key[1], now)
+        if current is None:
+            value, expires_at = delta, None
+        else:
+            try:
+                value = int(current) + delta
+            except ValueError:
+                raise TypeError("Value is not an integer") from None
+            expires_at = shard.entries[key[1]][1]
+        shard.set(key[1], value, expires_at, now)
+        return value
+
+    @override
+    async def _expire(self, key: LRUKey, ttl: float, _conn: Any = None) -> bool:
+        value = self._read(key)
+        if value is None:
+            return False
+        self._write(key, value, ttl)
+        return True
+
+    @override
+    async def _delete(self, key: LRUKey, _conn: Any = None) -> int:
+        return 0 if self.get_shard(key[0]).pop(key[1]) is None else 1
+
+    @override
+    async def _clear(self, namespace: str | None = None, _conn: Any = None) -> bool:
+        if namespace:
+            for name in list(self.shards):
+                if name == namespace or name.startswith(f"{namespace}:"):
+                    del self.shards[name]
+        else:
+            self.shards.clear()
+        return True
+
+    @override
+    async def _redlock_release(self, key: LRUKey, value: Any) -> int:
+        if self._read(key) == value:
+            return await self._delete(key)
+        return 0
+
+
+__all__ = ["LRUMemoryCache", "LRUShard", "estimate_size"]
@@ -0,0 +1,40 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+import aiocache
+
+from src.config.models import RedisConfig
+
+from .serializers import create_serializer
+
+
+def create_redis_cache(config: RedisConfig, namespace: str = "botkit") -> aiocache.RedisCache:
+    """Create the Redis cache described by the configuration.
+
+    Args:
+        config: The Redis connection, pool and serializer settings.
+        namespace: The default namespace of the cache.
+
+    Returns:
+        The Redis cache. Its connections are opened lazily, on first use.
+
+    """
+    return aiocache.RedisCache(
+        endpoint=config.host,
+        port=config.port,
+        db=config.db,
+        password=config.password,
+        ssl=config.ssl,
+        namespace=namespace,
+        serializer=create_serializer(config.serializer),
+        pool_max_size=config.max_connections,
+        create_connection_timeout=config.connect_timeout,
+        connection_pool_kwargs={
+            "socket_keepalive": config.socket_keepalive,
+            "socket_timeout": config.socket_timeout,
+            "health_check_interval": config.health_check_interval,
+        },
+    )
+
+
+__all__ = ["create_redis_cache"]
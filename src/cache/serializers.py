@@ -0,0 +1,125 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+from typing import Any, Literal, final, override
+
+import orjson
+from aiocache.serializers import BaseSerializer, JsonSerializer, PickleSerializer
+
+try:
+    import msgpack  # pyright: ignore[reportMissingImports]
+except ImportError:
+    msgpack = None
+
+type SerializerName = Literal["orjson", "msgpack", "json", "pickle"]
+
+# Tuples have no JSON equivalent, they are stored as {TUPLE_TAG: [...]} so cooldown timestamps come back as tuples.
+TUPLE_TAG = "__tuple__"
+MSGPACK_TUPLE_CODE = 1
+
+
+_CONTAINERS = (tuple, list, dict)
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, tuple):
+        if any(isinstance(item, _CONTAINERS) for item in value):  # pyright: ignore[reportUnknownVariableType]
+            value = [_encode(item) for item in value]  # pyright: ignore[reportUnknownVariableType]
+        return {TUPLE_TAG: value}
+    if isinstance(value, list):
+        if any(isinstance(item, _CONTAINERS) for item in value):  # pyright: ignore[reportUnknownVariableType]
+            return [_encode(item) for item in value]  # pyright: ignore[reportUnknownVariableType]
+        return value  # pyright: ignore[reportUnknownVariableType]
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}  # pyright: ignore[reportUnknownVariableType]
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        if any(isinstance(item, _CONTAINERS) for item in value):  # pyright: ignore[reportUnknownVariableType]
+            return [_decode(item) for item in value]  # pyright: ignore[reportUnknownVariableType]
+        return value  # pyright: ignore[reportUnknownVariableType]
+    if isinstance(value, dict):
+        if len(value) == 1 and TUPLE_TAG in value:  # pyright: ignore[reportUnknownArgumentType]
+            return tuple(_decode(value[TUPLE_TAG]))  # pyright: ignore[reportUnknownArgumentType]
+        return {key: _decode(item) for key, item in value.items()}  # pyright: ignore[reportUnknownVariableType]
+    return value
+
+
+@final
+class OrjsonSerializer(BaseSerializer):
+    """JSON serializer backed by orjson that round-trips tuples and floats.
+
+    Values are stored as UTF-8 bytes. Floats keep their type (``1.0`` is not read back as ``1``), and tuples are
+    tagged so they are not read back as lists.
+    """
+
+    DEFAULT_ENCODING = None
+
+    @override
+    def dumps(self, value: Any) -> bytes:  # pyright: ignore[reportIncompatibleMethodOverride]
+        return orjson.dumps(_encode(value))
+
+    @override
+    def loads(self, value: bytes | None) -> Any:  # pyright: ignore[reportIncompatibleMethodOverride]
+        if value is None:
+            return None
+        return _decode(orjson.loads(value))
+
+
+@final
+class MsgpackSerializer(BaseSerializer):
+    """Binary serializer backed by msgpack that round-trips tuples and floats.
+
+    Tuples are stored as an extension type and floats always as doubles. Requires the optional ``msgpack`` package.
+    """
+
+    DEFAULT_ENCODING = None
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        if msgpack is None:
+            raise RuntimeError("The msgpack serializer requires the msgpack extra (pdm install -G msgpack).")
+        super().__init__(*args, **kwargs)  # pyright: ignore[reportUnknownMemberType]
+
+    def _default(self, value: Any) -> Any:
+        if isinstance(value, tuple):
+            return msgpack.ExtType(MSGPACK_TUPLE_CODE, self._pack(list(value)))  # pyright: ignore[reportOptionalMemberAccess, reportUnknownMemberType, reportUnknownVariableType]
+        raise TypeError(f"Object of type {type(value).__name__} is not msgpack serializable")
+
+    def _pack(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=self._default, strict_types=True, use_bin_type=True)  # pyright: ignore[reportOptionalMemberAccess, reportUnknownMemberType, reportUnknownVariableType]
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code == MSGPACK_TUPLE_CODE:
+            return tuple(self._unpack(data))  # pyright: ignore[reportUnknownArgumentType]
+        return msgpack.ExtType(code, data)  # pyright: ignore[reportOptionalMemberAccess, reportUnknownMemberType, reportUnknownVariableType]
+
+    def _unpack(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, ext_hook=self._ext_hook, raw=False, strict_map_key=False)  # pyright: ignore[reportOptionalMemberAccess, reportUnknownMemberType, reportUnknownVariableType]
+
+    @override
+    def dumps(self, value: Any) -> bytes:  # pyright: ignore[reportIncompatibleMethodOverride]
+        return self._pack(value)
+
+    @override
+    def loads(self, value: bytes | None) -> Any:  # pyright: ignore[reportIncompatibleMethodOverride]
+        if value is None:
+            return None
+        return self._unpack(value)
+
+
+def create_serializer(name: SerializerName) -> BaseSerializer:
+    """Create the cache serializer registered under the given configuration name."""
+    match name:
+        case "orjson":
+            return OrjsonSerializer()
+        case "msgpack":
+            return MsgpackSerializer()
+        case "json":
+            return JsonSerializer()
+        case "pickle":
+            return PickleSerializer()
+
+
+__all__ = ["MsgpackSerializer", "OrjsonSerializer", "SerializerName", "create_serializer"]
@@ -0,0 +1,273 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+import asyncio
+import uuid
+from collections.abc import Callable, Sequence
+from logging import getLogger
+from typing import Any, final
+
+import aiocache
+import orjson
+
+from .lru import LRUMemoryCache
+
+logger = getLogger("bot").getChild("cache")
+
+INVALIDATION_RETRY_DELAY = 1
+
+
+@final
+class TieredCache(aiocache.BaseCache):
+    """Near-cache: a small in-process L1 in front of a shared Redis L2.
+
+    Reads are served from L1 when possible and fill it for at most ``l1_ttl`` seconds. Writes go to L2,
+    then are published on ``channel`` so every other process drops its L1 copy. The publication is sent
+    in the background, so a write costs a single round trip. If the invalidation subscription drops, L1
+    is flushed before resubscribing since messages may have been missed; the short L1 TTL bounds
+    staleness in the meantime.
+
+    A read missing L1 only fills it if the key was not invalidated while L2 was being read, otherwise an
+    old value read just before a write could be put back in L1 after the write dropped it.
+    """
+
+    NAME = "tiered"
+
+    def __init__(
+        self,
+        l1: LRUMemoryCache,
+        l2: aiocache.RedisCache,
+        *,
+        l1_ttl: float = 1.0,
+        channel: str = "botkit:invalidate",
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.l1 = l1
+        self.l2 = l2
+        self.l1_ttl = l1_ttl
+        self.channel = channel
+        self.instance_id = uuid.uuid4().hex
+        self._listener: asyncio.Task[None] | None = None
+        self._publishing: set[asyncio.Task[Any]] = set()
+        # Keys being read from L2, with the number of reads in flight and how many times they were invalidated
+        self._fills: dict[tuple[str | None, str], list[int]] = {}
+
+    def _namespace(self, namespace: str | None) -> str | None:
+        return namespace if namespace is not None else self.namespace
+
+    def _local_ttl(self, ttl: float | None) -> float:
+        return min(ttl, self.l1_ttl) if ttl else self.l1_ttl
+
+    def _start_fill(self, namespace: str | None, key: str) -> int:
+        fill = self._fills.setdefault((namespace, key), [0, 0])
+        fill[0] += 1
+        return fill[1]
+
+    def _end_fill(self, namespace: str | None, key: str, generation: int) -> bool:
+        """Whether the value read from L2 can fill L1, i.e. the key was not invalidated since the read started."""
+        fill = self._fills[namespace, key]
+        fill[0] -= 1
+        if not fill[0]:
+            del self._fills[namespace, key]
+        return fill[1] == generation
+
+    def _bump_fills(self, namespace: str | None, keys: Sequence[str] | None) -> None:
+        if keys is not None:
+            for key in keys:
+                if (fill := self._fills.get((namespace, key))) is not None:
+                    fill[1] += 1
+            return
+        for (fill_namespace, _), fill in self._fills.items():
+            if namespace is None or fill_namespace == namespace or (fill_namespace or "").startswith(f"{namespace}:"):
+                fill[1] += 1
+
+    async def _fill(self, key: str, value: Any, namespace: str | None, generation: int) -> None:
+        if self._end_fill(namespace, key, generation) and value is not None:
+            await self.l1.set(key, value, ttl=self.l1_ttl, namespace=namespace)
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.l2.client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    logger.debug(f"Subscribed to cache invalidations on {self.channel}")
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            await self._on_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Cache invalidation subscription lost, flushing local cache")
+            self._bump_fills(None, None)
+            await self.l1.clear()
+            await asyncio.sleep(INVALIDATION_RETRY_DELAY)
+
+    async def _on_invalidation(self, data: bytes) -> None:
+        instance_id, namespace, keys = orjson.loads(data)
+        if instance_id == self.instance_id:
+            return
+        self._bump_fills(namespace, keys)
+        if keys is None:
+            await self.l1.clear(namespace=namespace)
+            return
+        for key in keys:
+            await self.l1.delete(key, namespace=namespace)
+
+    async def _invalidate(self, namespace: str | None, keys: Sequence[str] | None) -> None:
+        """Drop keys (or the whole namespace when ``keys`` is None) from every L1, this one included."""
+        self._bump_fills(namespace, keys)
+        if keys is None:
+            await self.l1.clear(namespace=namespace)
+        else:
+            for key in keys:
+                await self.l1.delete(key, namespace=namespace)
+        task = asyncio.create_task(
+            self.l2.client.publish(self.channel, orjson.dumps([self.instance_id, namespace, keys]))
+        )
+        self._publishing.add(task)
+        task.add_done_callback(self._published)
+
+    def _published(self, task: asyncio.Task[Any]) -> None:
+        self._publishing.discard(task)
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            logger.error("Could not publish a cache invalidation", exc_info=exc)
+
+    async def get(
+        self,
+        key: str,
+        default: Any = None,
+        loads_fn: Callable[[Any], Any] | None = None,
+        namespace: str | None = None,
+        _conn: Any = None,
+    ) -> Any:
+        self._ensure_listener()
+        namespace = self._namespace(namespace)
+        value = await self.l1.get(key, namespace=namespace)
+        if value is None:
+            generation = self._start_fill(namespace, key)
+            try:
+                value = await self.l2.get(key, loads_fn=loads_fn, namespace=namespace)
+            finally:
+                await self._fill(key, value, namespace, generation)
+        return default if value is None else value
+
+    async def multi_get(
+        self,
+        keys: Sequence[str],
+        loads_fn: Callable[[Any], Any] | None = None,
+        namespace: str | None = None,
+        _conn: Any = None,
+    ) -> list[Any]:
+        self._ensure_listener()
+        namespace = self._namespace(namespace)
+        values: list[Any] = await self.l1.multi_get(keys, namespace=namespace)
+        missing = [i for i, value in enumerate(values) if value is None]
+        if missing:
+            generations = [self._start_fill(namespace, keys[i]) for i in missing]
+            fetched: list[Any] = [None] * len(missing)
+            try:
+                fetched = await self.l2.multi_get([keys[i] for i in missing], loads_fn=loads_fn, namespace=namespace)
+            finally:
+                for i, value, generation in zip(missing, fetched, generations, strict=True):
+                    values[i] = value
+                    await self._fill(keys[i], value, namespace, generation)
+        return values
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float | None = None,
+        dumps_fn: Callable[[Any], Any] | None = None,
+        namespace: str | None = None,
+        _cas_token: Any = None,
+        _conn: Any = None,
+    ) -> bool | int:
+        self._ensure_listener()
+        namespace = self._namespace(namespace)
+        result = await self.l2.set(key, value, ttl=ttl, dumps_fn=dumps_fn, namespace=namespace, _cas_token=_cas_token)
+        await self._invalidate(namespace, [key])
+        if result:
+            await self.l1.set(key, value, ttl=self._local_ttl(ttl), namespace=namespace)
+        return result
+
+    async def multi_set(
+        self,
+        pairs: Sequence[tuple[str, Any]],
+        ttl: float | None = None,
+        dumps_fn: Callable[[Any], Any] | None = None,
+        namespace: str | None = None,
+        _conn: Any = None,
+    ) -> bool:
+        self._ensure_listener()
+        namespace = self._namespace(namespace)
+        result = await self.l2.multi_set(pairs, ttl=ttl, dumps_fn=dumps_fn, namespace=namespace)
+        await self._invalidate(namespace, [key for key, _ in pairs])
+        return result
+
+    async def add(
+        self,
+        key: str,
+        value: Any,
+        ttl: float | None = None,
+        dumps_fn: Callable[[Any], Any] | None = None,
+        namespace: str | None = None,
+        _conn: Any = None,
+    ) -> bool:
+        self._ensure_listener()
+        namespace = self._namespace(namespace)
+        result = await self.l2.add(key, value, ttl=ttl, dumps_fn=dumps_fn, namespace=namespace)
+        await self._invalidate(namespace, [key])
+        return result
+
+    async def delete(self, key: str, namespace: str | None = None, _conn: Any = None) -> int:
+        self._ensure_listener()
+        namespace = self._namespace(namespace)
+        result = await self.l2.delete(key, namespace=namespace)
+        await self._invalidate(namespace, [key])
+        return result
+
+    async def exists(self, key: str, namespace: str | None = None, _conn: Any = None) -> bool:
+        self._ensure_listener()
+        namespace = self._namespace(namespace)
+        return await self.l1.exists(key, namespace=namespace) or await self.l2.exists(key, namespace=namespace)
+
+    async def increment(self, key: str, delta: int = 1, namespace: str | None = None, _conn: Any = None) -> int:
+        self._ensure_listener()
+        namespace = self._namespace(namespace)
+        result = await self.l2.increment(key, delta, namespace=namespace)
+        await self._invalidate(namespace, [key])
+        return result
+
+    async def expire(self, key: str, ttl: float, namespace: str | None = None, _conn: Any = None) -> bool:
+        self._ensure_listener()
+        namespace = self._namespace(namespace)
+        result = await self.l2.expire(key, ttl, namespace=namespace)
+        await self._invalidate(namespace, [key])
+        return result
+
+    async def clear(self, namespace: str | None = None, _conn: Any = None) -> bool:
+        self._ensure_listener()
+        result = await self.l2.clear(namespace=namespace)
+        await self._invalidate(namespace, None)
+        return result
+
+    async def raw(self, command: str, *args: Any, _conn: Any = None, **kwargs: Any) -> Any:
+        return await self.l2.raw(command, *args, **kwargs)
+
+    async def close(self, *args: Any, _conn: Any = None, **kwargs: Any) -> Any:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        if self._publishing:
+            await asyncio.gather(*self._publishing, return_exceptions=True)
+        await self.l1.close()
+        return await self.l2.close(*args, **kwargs)
+
+
+__all__ = ["TieredCache"]
@@ -15,11 +15,42 @@ class RedisConfig(BaseModel):
     password: str | None = None
     db: int
     ssl: bool
+    serializer: Literal["orjson", "msgpack", "json", "pickle"] = "json"
+    max_connections: int | None = None
+    socket_keepalive: bool = True
+    connect_timeout: float | None = 5.0
+    socket_timeout: float | None = None
+    health_check_interval: int = 30
+
+
+class LRULimitsConfig(BaseModel):
+    max_entries: int | None = None
+    max_bytes: int | None = None
+
+
+class LRUConfig(BaseModel):
+    default: LRULimitsConfig = LRULimitsConfig(max_entries=10_000)
+    namespaces: dict[str, LRULimitsConfig] = {}
+
+    def get_limits(self, namespace: str) -> LRULimitsConfig:
+        """Get the limits of a namespace, falling back to its parent (``cooldown`` for ``cooldown:gcra``)."""
+        if namespace in self.namespaces:
+            return self.namespaces[namespace]
+        if (parent := namespace.split(":", 1)[0]) in self.namespaces:
+            return self.namespaces[parent]
+        return self.default
+
+
+class TieredConfig(BaseModel):
+    l1_ttl: float = 1.0
+    channel: str = "botkit:invalidate"
 
 
 class CacheConfig(BaseModel):
-    type: Literal["memory", "redis"] = "memory"
+    type: Literal["memory", "redis", "lru", "tiered"] = "memory"
     redis: RedisConfig | None = None
+    lru: LRUConfig = LRUConfig()
+    tiered: TieredConfig = TieredConfig()
 
 
 class PrefixConfig(BaseModel):
@@ -59,6 +90,7 @@ class BotConfig(BaseModel):
     cache: CacheConfig = CacheConfig()
     rest: RestConfig = RestConfig()
     cache_app_emojis: bool = True
+    locales: list[str] | None = None
 
 
 class LoggingConfig(BaseModel):
@@ -80,10 +112,30 @@ class BackendConfig(BaseModel):
     server_header: bool = False
 
 
+class DbPoolConfig(BaseModel):
+    minsize: int = 1
+    maxsize: int = 5
+    max_inactive_connection_lifetime: float = 300.0
+    statement_cache_size: int | None = None
+    max_cached_statement_lifetime: int | None = None
+
+
+class DbInstrumentationConfig(BaseModel):
+    enabled: bool = False
+    slow_query_threshold: float | None = 0.25
+    log_interval: float | None = 300.0
+
+
 class DbExtraApp(BaseModel):
     url: str | None = None
     params: dict[str, object] | None = None
     models: list[str] = []
+    pool: DbPoolConfig | None = None
+
+
+class DbCacheConfig(BaseModel):
+    enabled: bool = False
+    ttl: int = 300
 
 
 class DbConfig(BaseModel):
@@ -91,6 +143,10 @@ class DbConfig(BaseModel):
     enabled: bool = True
     params: dict[str, object] | None = None
     extra_apps: dict[str, DbExtraApp] = {}
+    cache: DbCacheConfig = DbCacheConfig()
+    pool: DbPoolConfig = DbPoolConfig()
+    warmup: bool = False
+    instrumentation: DbInstrumentationConfig = DbInstrumentationConfig()
 
 
 class Config(BaseModel):
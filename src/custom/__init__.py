@@ -33,20 +33,29 @@ from discord.ext.bridge import (
 )
 
 from src import log
-from src.config.models import RedisConfig
-from src.i18n.classes import ExtensionTranslation, RawTranslation, TranslationWrapper, apply_locale
+from src.cache import LRUMemoryCache, TieredCache, create_redis_cache
+from src.config.models import LRUConfig, RedisConfig, TieredConfig
+from src.i18n.classes import (
+    DEFAULT,
+    ExtensionTranslation,
+    RawTranslation,
+    TranslationStrings,
+    TranslationWrapper,
+    apply_cached_locale,
+)
 
 if TYPE_CHECKING:
     from src.database.models import Guild, User
 
 logger = getLogger("bot")
 
+# Placeholder of contexts whose command has no translations, shared by every context
+NO_TRANSLATIONS: TranslationWrapper[dict[str, RawTranslation]] = apply_cached_locale(TranslationStrings(), DEFAULT)
+
 
 class ApplicationContext(bridge.BridgeApplicationContext):
     def __init__(self, bot: "Bot", interaction: discord.Interaction) -> None:
-        self.translations: TranslationWrapper[dict[str, RawTranslation]] = TranslationWrapper(
-            {}, "en-US"
-        )  # empty placeholder
+        self.translations: TranslationWrapper[dict[str, RawTranslation]] = NO_TRANSLATIONS
         super().__init__(bot=bot, interaction=interaction)
         self.bot: Bot
         self.user_obj: User | None = None
@@ -56,7 +65,7 @@ class ApplicationContext(bridge.BridgeApplicationContext):
     @override
     def __setattr__(self, key: Any, value: Any) -> None:
         if key == "command" and hasattr(value, "translations"):
-            self.translations = apply_locale(
+            self.translations = apply_cached_locale(
                 value.translations,
                 self.locale,
             )
@@ -71,7 +80,7 @@ async def remove_reaction(
 
 class ExtContext(bridge.BridgeExtContext):
     def __init__(self, **kwargs: Any) -> None:
-        self.translations: TranslationWrapper[dict[str, RawTranslation]] = TranslationWrapper({}, "en-US")
+        self.translations: TranslationWrapper[dict[str, RawTranslation]] = NO_TRANSLATIONS
         super().__init__(**kwargs)
         self.bot: Bot
         self.user_obj: User | None = None
@@ -83,7 +92,7 @@ class ExtContext(bridge.BridgeExtContext):
             locale: str | None = None
             if guild := self.guild:
                 locale = guild.preferred_locale
-            self.translations = apply_locale(
+            self.translations = apply_cached_locale(
                 self.command.translations,  # pyright: ignore [reportAttributeAccessIssue, reportOptionalMemberAccess, reportUnknownArgumentType]
                 locale,
             )
@@ -107,28 +116,40 @@ class CustomBot(bridge.Bot):
     __rest__: bool = False
 
     def __init__(
-        self, *args: Any, cache_type: str = "memory", cache_config: RedisConfig | None = None, **options: Any
+        self,
+        *args: Any,
+        cache_type: str = "memory",
+        cache_config: RedisConfig | None = None,
+        lru_config: LRUConfig | None = None,
+        tiered_config: TieredConfig | None = None,
+        **options: Any,
     ) -> None:
         self.translations: list[ExtensionTranslation] = options.pop("translations", [])
 
         self.botkit_cache: aiocache.BaseCache
         # Initialize cache based on type and config
-        if cache_type == "redis":
-            if cache_config:
-                logger.info("Using Redis cache")
-                self.botkit_cache = aiocache.RedisCache(
-                    endpoint=cache_config.host,
-                    port=cache_config.port,
-                    db=cache_config.db,
-                    password=cache_config.password,
-                    ssl=cache_config.ssl,
+        if cache_type in {"redis", "tiered"}:
+            if cache_config and cache_type == "tiered":
+                tiered_config = tiered_config or TieredConfig()
+                logger.info("Using tiered cache (local L1 in front of Redis)")
+                self.botkit_cache = TieredCache(
+                    LRUMemoryCache(lru_config, namespace="botkit"),
+                    create_redis_cache(cache_config),
+                    l1_ttl=tiered_config.l1_ttl,
+                    channel=tiered_config.channel,
                     namespace="botkit",
                 )
+            elif cache_config:
+                logger.info("Using Redis cache")
+                self.botkit_cache = create_redis_cache(cache_config)
             else:
                 logger.warning(
                     "Redis cache type specified but no configuration provided. Falling back to memory cache."
                 )
                 self.botkit_cache = aiocache.SimpleMemoryCache(namespace="botkit")
+        elif cache_type == "lru":
+            logger.info("Using bounded LRU memory cache")
+            self.botkit_cache = LRUMemoryCache(lru_config, namespace="botkit")
         else:
             logger.info("Using memory cache")
             self.botkit_cache = aiocache.SimpleMemoryCache(namespace="botkit")
@@ -160,6 +181,32 @@ class CustomBot(bridge.Bot):
             ctx.load_translations()
         return ctx
 
+    @override
+    async def sync_commands(self, *args: Any, **kwargs: Any) -> None:
+        """Sync the application commands, then dispatch ``application_commands_sync``."""
+        await super().sync_commands(*args, **kwargs)
+        self.dispatch("application_commands_sync")
+
+    @override
+    async def fetch_emojis(self) -> list[discord.AppEmoji]:
+        """Fetch the application emojis, then dispatch ``app_emojis_update``."""
+        emojis = await super().fetch_emojis()
+        self.dispatch("app_emojis_update")
+        return emojis
+
+    @override
+    async def create_emoji(self, *, name: str, image: bytes) -> discord.AppEmoji:
+        """Create an application emoji, then dispatch ``app_emojis_update``."""
+        emoji = await super().create_emoji(name=name, image=image)
+        self.dispatch("app_emojis_update")
+        return emoji
+
+    @override
+    async def delete_emoji(self, emoji: discord.abc.Snowflake) -> None:
+        """Delete an application emoji, then dispatch ``app_emojis_update``."""
+        await super().delete_emoji(emoji)
+        self.dispatch("app_emojis_update")
+
     @property
     @override
     def intents(self) -> discord.Intents:
@@ -218,9 +265,23 @@ class CustomRestBot(PycordRestBot, CustomBot):  # pyright: ignore[reportIncompat
     _UvicornConfig: type[BaseUvicornConfig] = CustomUvicornConfig
 
     def __init__(
-        self, *args: Any, cache_type: str = "memory", cache_config: RedisConfig | None = None, **options: Any
+        self,
+        *args: Any,
+        cache_type: str = "memory",
+        cache_config: RedisConfig | None = None,
+        lru_config: LRUConfig | None = None,
+        tiered_config: TieredConfig | None = None,
+        **options: Any,
     ) -> None:
-        CustomBot.__init__(self, *args, cache_type=cache_type, cache_config=cache_config, **options)
+        CustomBot.__init__(
+            self,
+            *args,
+            cache_type=cache_type,
+            cache_config=cache_config,
+            lru_config=lru_config,
+            tiered_config=tiered_config,
+            **options,
+        )
         PycordRestBot.__init__(self, *args, **options)
 
         @self.listen(name="on_connect", once=True)
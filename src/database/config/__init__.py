@@ -2,7 +2,9 @@
 # Copyright: 2024-2026 NiceBots.xyz
 
 
+import asyncio
 import ssl
+import time
 from collections import defaultdict
 from logging import getLogger
 from pathlib import Path
@@ -10,9 +12,12 @@ from typing import Any
 from urllib.parse import parse_qs, urlparse
 
 import aerich
-from tortoise import Tortoise
+from aerich.models import Aerich
+from tortoise import Tortoise, connections
+from tortoise.exceptions import OperationalError
 
 from src.config import config
+from src.config.models import DbPoolConfig
 
 logger = getLogger("bot").getChild("database")
 
@@ -54,11 +59,15 @@ def create_ssl_context() -> ssl.SSLContext:
     return ssl_context
 
 
+ENGINE = "src.database.instrumentation" if config.db.instrumentation.enabled else "tortoise.backends.asyncpg"
+
 INT_PARAMS = {
     "statement_cache_size",
     "max_cached_statement_lifetime",
     "max_cacheable_statement_size",
     "command_timeout",
+    "minsize",
+    "maxsize",
 }
 
 
@@ -89,6 +98,24 @@ def parse_postgres_url(url: str) -> dict[str, Any]:
     return credentials
 
 
+def apply_pool(credentials: dict[str, Any], pool: DbPoolConfig) -> dict[str, Any]:
+    """Add the pool settings to connection credentials.
+
+    Settings already present in the credentials, i.e. given as URL query parameters, take precedence.
+    """
+    for key, value in pool.model_dump(exclude_none=True).items():
+        credentials.setdefault(key, value)
+    return credentials
+
+
+def get_pool(apps: list[str]) -> DbPoolConfig:
+    """Get the pool settings of a connection shared by the given extra apps."""
+    return next(
+        (pool for app in apps if (pool := config.db.extra_apps[app].pool) is not None),
+        config.db.pool,
+    )
+
+
 def apply_params(uri: str, params: dict[str, Any] | None) -> str:
     if params is None:
         return uri
@@ -129,14 +156,14 @@ def parse_url_apps_mapping(url_apps_mapping: dict[str, list[str]]) -> tuple[dict
     for i, (url, apps) in enumerate(url_apps_mapping.items()):
         connection_name = f"connection_{i}"
 
-        credentials = parse_postgres_url(url)
+        credentials = apply_pool(parse_postgres_url(url), get_pool(apps))
         if ssl_context:
             credentials["ssl"] = ssl_context
 
         logger.debug(f"Connection {connection_name} credentials keys: {list(credentials.keys())}")
         logger.debug(f"SSL in credentials: {'ssl' in credentials}")
 
-        connection_config[connection_name] = {"engine": "tortoise.backends.asyncpg", "credentials": credentials}
+        connection_config[connection_name] = {"engine": ENGINE, "credentials": credentials}
 
         for app in apps:
             app_connection[app] = connection_name
@@ -146,7 +173,7 @@ def parse_url_apps_mapping(url_apps_mapping: dict[str, list[str]]) -> tuple[dict
 
     logger.debug(f"Default URL (sanitized): {default_url.split('@')[1] if '@' in default_url else 'N/A'}")
 
-    credentials = parse_postgres_url(default_url)
+    credentials = apply_pool(parse_postgres_url(default_url), config.db.pool)
     if ssl_context:
         credentials["ssl"] = ssl_context
 
@@ -155,7 +182,7 @@ def parse_url_apps_mapping(url_apps_mapping: dict[str, list[str]]) -> tuple[dict
     if "ssl" in credentials:
         logger.debug(f"SSL value type: {type(credentials['ssl'])}")
 
-    connection_config["default"] = {"engine": "tortoise.backends.asyncpg", "credentials": credentials}
+    connection_config["default"] = {"engine": ENGINE, "credentials": credentials}
 
     return app_connection, connection_config
 
@@ -190,11 +217,41 @@ TORTOISE_ORM = {
 }
 
 
-async def init() -> None:
+MIGRATIONS_LOCATION = "./src/database/migrations/"
+
+
+def get_migration_versions(app: str = "models") -> list[str]:
+    """Get the migration files of an app, as recorded by aerich once applied."""
+    return sorted(
+        (path.name for path in (Path(MIGRATIONS_LOCATION) / app).glob("*.py") if path.name != "__init__.py"),
+        key=lambda name: int(name.split("_", 1)[0]),
+    )
+
+
+async def get_pending_migrations(app: str = "models") -> list[str]:
+    """Get the migration files of an app that are not recorded as applied.
+
+    This reads the aerich table directly, without importing any migration module. Tortoise must be initialized.
+    """
+    versions = get_migration_versions(app)
+    try:
+        applied = set(await Aerich.filter(app=app).values_list("version", flat=True))
+    except OperationalError:  # the aerich table does not exist yet
+        return versions
+    return [version for version in versions if version not in applied]
+
+
+async def migrate() -> None:
+    """Apply the pending migrations, skipping aerich entirely when the schema is already at head."""
+    await Tortoise.init(config=TORTOISE_ORM)
+    if not (pending := await get_pending_migrations()):
+        logger.info("Database schema is up to date")
+        return
+    logger.info(f"Applying {len(pending)} pending migrations")
     command = aerich.Command(
         TORTOISE_ORM,
         app="models",
-        location="./src/database/migrations/",
+        location=MIGRATIONS_LOCATION,
     )
     await command.init()
     migrated = await command.upgrade(run_in_transaction=True)
@@ -202,8 +259,41 @@ async def init() -> None:
     await Tortoise.init(config=TORTOISE_ORM)
 
 
+async def init(*, run_migrations: bool = True) -> None:
+    """Initialize the database connections.
+
+    Args:
+        run_migrations: Whether to apply the pending migrations first.
+
+    """
+    if config.db.instrumentation.enabled:
+        from src.database import instrumentation  # noqa: PLC0415
+
+        instrumentation.metrics.slow_query_threshold = config.db.instrumentation.slow_query_threshold
+        if config.db.instrumentation.log_interval:
+            instrumentation.start_summaries(config.db.instrumentation.log_interval)
+    if run_migrations:
+        await migrate()
+    else:
+        await Tortoise.init(config=TORTOISE_ORM)
+    if config.db.warmup:
+        await warmup()
+
+
+async def warmup() -> None:
+    """Open the connection pools, so the first queries do not wait for ``minsize`` connections to be established."""
+    start = time.perf_counter()
+    await asyncio.gather(*(connections.get(name).execute_query("SELECT 1") for name in CONNECTION_CONFIG_MAPPING))
+    logger.info(f"Warmed up {len(CONNECTION_CONFIG_MAPPING)} connection pools in {time.perf_counter() - start:.2f}s")
+
+
 async def shutdown() -> None:
+    if config.db.instrumentation.enabled:
+        from src.database import instrumentation  # noqa: PLC0415
+
+        instrumentation.stop_summaries()
+        instrumentation.metrics.log_summary()
     await Tortoise.close_connections()
 
 
-__all__ = ["APP_CONNECTION_MAPPING", "init", "shutdown"]
+__all__ = ["APP_CONNECTION_MAPPING", "get_pending_migrations", "init", "migrate", "shutdown", "warmup"]
@@ -0,0 +1,279 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+"""Opt-in query instrumentation for the asyncpg connections.
+
+When ``db.instrumentation.enabled`` is set, the connections built in ``src.database.config`` use this module as their
+Tortoise engine. Every statement is then timed and counted per model and operation, and slow statements are logged
+with the code that issued them.
+"""
+
+import asyncio
+import re
+import sys
+import time
+from bisect import bisect_left
+from functools import lru_cache
+from logging import getLogger
+from pathlib import Path
+from typing import Any, final, override
+
+from tortoise import Tortoise
+from tortoise.backends.asyncpg.client import AsyncpgDBClient, TransactionWrapper
+from tortoise.backends.base.client import NestedTransactionContext, TransactionContext, TransactionContextPooled
+
+logger = getLogger("bot").getChild("database").getChild("queries")
+
+# Upper bounds, in seconds, of the latency histogram buckets. A last bucket counts slower queries.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+CALL_SITE_DEPTH = 3
+
+_OPERATION = re.compile(r"^\s*(\w+)")
+_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE)\s+"?(\w+)"?', re.IGNORECASE)
+_SRC = str(Path(__file__).parent.parent)
+
+
+@lru_cache(maxsize=1024)
+def parse_query(query: str) -> tuple[str, str]:
+    """Get the operation and the table of a statement.
+
+    Args:
+        query: The SQL statement.
+
+    Returns:
+        The first keyword of the statement (``SELECT``, ``INSERT``, ``WITH``...) and the first table it reads from or
+        writes to, or ``"-"`` when there is none.
+
+    """
+    operation = match.group(1).upper() if (match := _OPERATION.match(query)) else "-"
+    table = match.group(1) if (match := _TABLE.search(query)) else "-"
+    return operation, table
+
+
+_model_names: dict[str, str] = {}
+
+
+def _model_name(table: str) -> str:
+    if (name := _model_names.get(table)) is not None:
+        return name
+    if not Tortoise.apps:
+        return table
+    _model_names.update(
+        (model._meta.db_table, model.__name__)  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+        for app in Tortoise.apps.values()
+        for model in app.values()
+    )
+    return _model_names.setdefault(table, table)
+
+
+def get_call_site() -> str:
+    """Describe the innermost frames of the bot's own code in the current call stack."""
+    frames: list[str] = []
+    frame = sys._getframe(1)  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+    while frame is not None and len(frames) < CALL_SITE_DEPTH:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_SRC) and filename != __file__:
+            frames.append(f"{Path(filename).relative_to(_SRC).as_posix()}:{frame.f_lineno} in {frame.f_code.co_name}")
+        frame = frame.f_back
+    return " < ".join(frames) or "unknown"
+
+
+@final
+class QueryStats:
+    """Latency histogram and row count of the queries of one model and operation."""
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.errors: int = 0
+        self.rows: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+        self.buckets: list[int] = [0] * (len(BUCKETS) + 1)
+
+    def record(self, duration: float, rows: int, *, error: bool = False) -> None:
+        self.count += 1
+        self.errors += error
+        self.rows += rows
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.buckets[bisect_left(BUCKETS, duration)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Estimate a latency percentile, as the upper bound of the bucket it falls in.
+
+        Args:
+            q: The percentile, between 0 and 1.
+
+        Returns:
+            The estimated latency in seconds. Queries above the last bucket are reported as the slowest query.
+
+        """
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip(BUCKETS, self.buckets, strict=False):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": self.total * 1000,
+            "avg_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(0.5) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "max_ms": self.max * 1000,
+            "buckets": {
+                **{f"le_{bound * 1000:g}ms": count for bound, count in zip(BUCKETS, self.buckets, strict=False)},
+                "inf": self.buckets[-1],
+            },
+        }
+
+
+@final
+class QueryMetrics:
+    """Query statistics aggregated per model and operation."""
+
+    def __init__(self, slow_query_threshold: float | None = None) -> None:
+        self.slow_query_threshold = slow_query_threshold
+        self.stats: dict[tuple[str, str], QueryStats] = {}
+
+    def record(self, query: str, duration: float, rows: int, *, error: bool = False) -> None:
+        """Record an executed statement, logging it if it was slow.
+
+        Args:
+            query: The SQL statement.
+            duration: How long the statement took, in seconds.
+            rows: The number of rows returned or affected.
+            error: Whether the statement failed.
+
+        """
+        operation, table = parse_query(query)
+        key = (_model_name(table), operation)
+        if (stats := self.stats.get(key)) is None:
+            stats = self.stats[key] = QueryStats()
+        stats.record(duration, rows, error=error)
+
+        if self.slow_query_threshold is not None and duration >= self.slow_query_threshold:
+            logger.warning(
+                f"Slow query ({duration * 1000:.1f} ms, {rows} rows) at {get_call_site()}: {' '.join(query.split())}"
+            )
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Get the statistics of every model and operation, slowest total first."""
+        return [
+            {"model": model, "operation": operation, **stats.to_dict()}
+            for (model, operation), stats in sorted(self.stats.items(), key=lambda item: -item[1].total)
+        ]
+
+    def log_summary(self) -> None:
+        """Log one line of statistics per model and operation."""
+        for entry in self.snapshot():
+            logger.info(
+                f"{entry['model']} {entry['operation']}: {entry['count']} queries, {entry['rows']} rows, "
+                f"avg {entry['avg_ms']:.1f} ms, p95 {entry['p95_ms']:.1f} ms, max {entry['max_ms']:.1f} ms"
+            )
+
+    def reset(self) -> None:
+        self.stats.clear()
+
+
+metrics = QueryMetrics()
+_summary_task: asyncio.Task[None] | None = None
+
+
+async def _log_summaries(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        metrics.log_summary()
+
+
+def start_summaries(interval: float) -> None:
+    """Log the aggregated statistics every ``interval`` seconds."""
+    global _summary_task  # noqa: PLW0603
+    if _summary_task is None or _summary_task.done():
+        _summary_task = asyncio.create_task(_log_summaries(interval))
+
+
+def stop_summaries() -> None:
+    """Stop logging the aggregated statistics periodically."""
+    if _summary_task is not None:
+        _summary_task.cancel()
+
+
+class InstrumentedAsyncpgDBClient(AsyncpgDBClient):
+    """asyncpg client recording every statement in ``metrics``."""
+
+    @override
+    async def execute_insert(self, query: str, values: list[Any]) -> Any:
+        start, result = time.perf_counter(), None
+        try:
+            result = await super().execute_insert(query, values)
+        except Exception:
+            metrics.record(query, time.perf_counter() - start, 0, error=True)
+            raise
+        metrics.record(query, time.perf_counter() - start, int(result is not None))
+        return result
+
+    @override
+    async def execute_many(self, query: str, values: list[Any]) -> None:
+        start = time.perf_counter()
+        try:
+            await super().execute_many(query, values)
+        except Exception:
+            metrics.record(query, time.perf_counter() - start, 0, error=True)
+            raise
+        metrics.record(query, time.perf_counter() - start, len(values))
+
+    @override
+    async def execute_query(self, query: str, values: list[Any] | None = None) -> tuple[int, list[dict[str, Any]]]:
+        start = time.perf_counter()
+        try:
+            result = await super().execute_query(query, values)
+        except Exception:
+            metrics.record(query, time.perf_counter() - start, 0, error=True)
+            raise
+        metrics.record(query, time.perf_counter() - start, result[0])
+        return result
+
+    @override
+    async def execute_query_dict(self, query: str, values: list[Any] | None = None) -> list[dict[str, Any]]:
+        start = time.perf_counter()
+        try:
+            result = await super().execute_query_dict(query, values)
+        except Exception:
+            metrics.record(query, time.perf_counter() - start, 0, error=True)
+            raise
+        metrics.record(query, time.perf_counter() - start, len(result))
+        return result
+
+    @override
+    def _in_transaction(self) -> TransactionContext:  # pyright: ignore[reportMissingTypeArgument]
+        return TransactionContextPooled(InstrumentedTransactionWrapper(self), self._pool_init_lock)
+
+
+class InstrumentedTransactionWrapper(InstrumentedAsyncpgDBClient, TransactionWrapper):
+    """asyncpg transaction recording every statement in ``metrics``."""
+
+    @override
+    def _in_transaction(self) -> TransactionContext:  # pyright: ignore[reportMissingTypeArgument]
+        return NestedTransactionContext(InstrumentedTransactionWrapper(self))
+
+
+# Tortoise engine entry point
+client_class = InstrumentedAsyncpgDBClient
+
+__all__ = [
+    "InstrumentedAsyncpgDBClient",
+    "QueryMetrics",
+    "QueryStats",
+    "client_class",
+    "get_call_site",
+    "metrics",
+    "parse_query",
+    "start_summaries",
+    "stop_summaries",
+]
@@ -0,0 +1,58 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 Communauté Les Frères Poulain, NiceBots.xyz
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "afkdeadline" (
+    "id" UUID NOT NULL PRIMARY KEY,
+    "kind" VARCHAR(10) NOT NULL,
+    "key" BIGINT NOT NULL,
+    "member_id" BIGINT NOT NULL,
+    "channel_id" BIGINT,
+    "deadline" TIMESTAMPTZ NOT NULL,
+    CONSTRAINT "uid_afkdeadline_kind_dee07c" UNIQUE ("kind", "key")
+);
+COMMENT ON COLUMN "afkdeadline"."kind" IS 'REMINDER: reminder\nDISCONNECT: disconnect';
+COMMENT ON TABLE "afkdeadline" IS 'Pending AFK reminder or disconnect, kept so they survive restarts.';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "afkdeadline";"""
+
+
+MODELS_STATE = (
+    "eJztWu1v2jgY/1esfOqkriopLT10OgkKu3K3wtTS22ljigw2YJE4LHbaVbv+7+fHOK8kKV"
+    "TbHevgQ5s8b3Z+z0v82PlqeT6hrjhqTRcdionLOLWa6KvFsQcXRexDZOHlMmECQeKxq+Xx"
+    "dEHSgmMhAzyRijXFrqCKRKiYBGwpmc9B4R3lhPEZar35EwXUY5zQAPkBIkxMfM7pRB6iBV"
+    "1KJHwk5/QBiTC4Y3dUCQuJAymOYBziT9RAys63MTniI96SMhDNEUfqt1A2muj9nCrxAHRQ"
+    "9JCICX3P6ReZGmyKMPKoN14NrBXiwTWXo5BjLu5pQEmsd2RGow9NNFQ6xgIjaKqsRFLiUB"
+    "uMB/OoEHhGI7FkIGHsrcw4jGSsZp5COdRlVD2Kb3Qmc6xsuLGSuS8e+R4LJCiXiPHDkjlE"
+    "I2kUedYMM9oGqeipRcoMJdrNIWefQ+pIf6Y9oZz98aMFzgGmgs369EldgNUvVAAXbpcLZ8"
+    "qoSzJxzbSKpjvyYalpt7e9zhstCRE1dia+G3o8kV4+yLnPY/EwZOQIdIA3o5wGWM0zFek8"
+    "dF2TFxFp9QCKIIOQxlMlCYHQKQ5dyBfr12nIJ5AmSI8Ef+q/mamlxBynPxg6N92h41hr6Q"
+    "VTyKWHISlgITUZlwDU18eV3QQQTbVggIvL1vXBydkrDYEv5CzQTA2X9agVscQrVQ16gnLk"
+    "mizOF3McdHnoaax7ahqYT+ga5pFuDnU16efgHRESwJN6FEEZgbU5vNZ196rX73Svm3E0j3"
+    "ind3Mx6Pe7F8NmKoLzVarYDZaHvzgu5TM5V7e14wq3/NW61p6pHWvP+KrMrkpw33BszQIH"
+    "pRyicmTNH20263FZHPlGIecENd3dccLGMa7mq/69/sW2T04a9vHJ2flpvdE4PT8+V7J6xu"
+    "usRoUH2r3fe/1hFnwgZCGPq+92wGfU9vA/G/7kRbYd/lm9ZznAlPSfG//0ajCLfkchJ5lH"
+    "i/FP6+XQJ0bxKLr4AZOhAtdh76p7M2xdvQPznhCfXY1Wa9gFjq2pDznqwVnuJRAbQe97w0"
+    "sEt+jDoN/Nv8RjueEHC+aEQ+k73L93MEljEpEj0iMsrKaL1EsfCGM8WdzjgDhrHN/2y2TX"
+    "WZ7t5SmYq3UmMWjCPE1fcrHK0r4vC9uWNLuybTHZziPBp9qWcj8XLFH3a9JdWpPqJZmKu2"
+    "1fCFm9b/NGfhrxF/c+oBzAKMLe912KeTH4Ka0c8mOl9r3qf+SN/za224PB20zpb/dyqPZv"
+    "r9pdtfLX4a+EmCxb/Phc0lVorrdgJeueRGWXO6/NozzXUdn1jXoqu17RVQEzC/RcrVZosA"
+    "3OicZLhNk+3wRl+7wcZOBlMZ766u28FcaJxh7jzTCmdzQo2CHYbMcmVt5ltK1Lp9ZEc6c2"
+    "4pfOGVydwVXN1kR7xDvAJ8DvOA24ajxn62aTKlNeYtbqyySggJyDC2p5dR+V1XyBnZSlHp"
+    "AMuPtgXtg/SGdl1hZrjVXa6+GSPNPrWc2913fF6wX9tJ79jrTTHT/waBhYBa10xDqsaqNJ"
+    "SujJkz9jEWk766d4WTacyF3TpUJZLU4FwigUcEa0OkmCXm+MBU2d25WcFu1b8X0r/lO34j"
+    "tSaH4PWS7jMozKIjOLRZ4sMbdQJErqS4q3XXFh41BSMeKv49/qiJsRdKAc+qqJOqv4XJnp"
+    "dcwR+DSg1FHLMcLUGEay5fkh118EABdFXBhXK89xdIC+hAPG0Cs3YASKbXyHcliVoJsmps"
+    "mxfV4WlMkdyVRIk6JE1fTKPA0jiX2a7tN0n6bfN01bNGCTeVGiGk5lquJEZmdOvn6WqLVr"
+    "9Ub9/OSsHgdrTKmK0bJ4TEC9o4GAKa0hW75hmlLZ5T28Z+6Y2qenG+zKKanSfTnNy+7MQV"
+    "JtgbARf4Ho1o43+1qt6nO1te/VSg+w/rgZ9Lc9wCJsItE/yGXiR/x8qgJcACOzuRVhenDV"
+    "+jsP98XbQTvfq4OB9v/dHT7+CzqK2MA="
+)
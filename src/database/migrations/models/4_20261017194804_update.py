@@ -0,0 +1,51 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 Communauté Les Frères Poulain, NiceBots.xyz
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "channelnote" ADD "last_message_id" BIGINT;
+        ALTER TABLE "channelnote" ADD "messages_since" INT;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "channelnote" DROP COLUMN "last_message_id";
+        ALTER TABLE "channelnote" DROP COLUMN "messages_since";"""
+
+
+MODELS_STATE = (
+    "eJztWv9v2jgU/1es/NRJXVVSWnrodBIUtnK3wtTS22ljigw2YJE4LHb6Rbv+7+dnnJCEJA"
+    "Vuu2Md/NAm75udz/N7tp/91fJ8Ql1x1BjPWhQTl3Fq1dFXi2MPHvLYh8jC8/mSCQSJh66W"
+    "x+MZSQoOhQzwSCrWGLuCKhKhYhSwuWQ+B4X3lBPGJ6jx5g8UUI9xQgPkB4gwMfI5pyN5iG"
+    "Z0LpHwkZzSRyTC4I7dUSUsJA6kOIJ2iD9SDSk738bkgA94Q8pA1Accqd9M2aijD1OqxAPQ"
+    "QdFHIib0O6cPMtHYGGHkUW+4aFgrxI1rLkchx1zc04CSWO/ItEYf66ivdIwFRtBYWYmkxK"
+    "E2GDfmUSHwhEZiy4aEsbcw4zCSspr6CuVQl1H1Kb7RGU2xsuHGSuY9v+V7LJCgXCLGDwv6"
+    "ELWkUeRpM8xoG6SirxYJM5RoN4ecfQmpI/2J9oRy9qdPFjgHmAo26/Nn9QBWH6gALrzOZ8"
+    "6YUZekxjXTKpruyMe5pt3edlpvtCSMqKEz8t3Q40vp+aOc+jwWD0NGjkAHeBPKaYBVPxMj"
+    "nYeua+IiIi0+QBFkENK4q2RJIHSMQxfixfp1HPIRhAnSLcGf6m+mawkxx+n2+s5Nu+841k"
+    "p4QRcy4WFIClgITcYlAPX1aWF3CYimWtDAxWXj+uDk7JWGwBdyEmimhst60opY4oWqBn2J"
+    "cuSaNM4XUxy0eehprDuqG5iP6ArmkW4GddXpbfCOCEvAl/kogjICa314rev2Vafbal/X49"
+    "E84K3OzUWv221f9OuJEZzNUvlusDz84LiUT+RUvVaOS9zyZ+Nae6ZyrD3jqzS7SMFdw7E1"
+    "CxyUcIiKkRV/NNmkw2X+yDcKGSeo7u6OE9Ye46q/6t/rX2z75KRmH5+cnZ9Wa7XT8+NzJa"
+    "t7vMqqlXig2Xnb6fbT4AMhDXmcfTcDPqW2h39r+JcT2Wb4p/W2coBJ6T83/snVYBr9lkJO"
+    "Mo/m45/Uy6BPjOJR9PADBkMJrv3OVfum37h6D+Y9Ib64Gq1Gvw0cW1MfM9SDs8wkEBtBHz"
+    "r9SwSv6GOv285O4rFc/6MFfcKh9B3u3zuYJDGJyBHpCRZW41li0gfCEI9m9zggzgrHt/0i"
+    "2VWWZ3tZCuZqnUkMmtBPsy+5WERp15e525Yku3TbYqKdR4LPbVuK/ZyzRN2vSXdpTaqXZG"
+    "rcbTohpPW+zYz8POIvbj6gHMDIw973XYp5PvgJrQzyQ6X2vfJ/5I3/dmw3e713qdTf7GRQ"
+    "7d5eNdtq5a+HvxJismjx43NJF0NzdQtWsO5Zquzyzmv9UZ7ZUdnVtfZUdrVkVwXMNNBTtV"
+    "qhwSY4LzVeIsz2+Too2+fFIAMvjfHYV7PzRhgvNfYYr4cxvaNBToVgvYpNrLzLaFuXTqWO"
+    "pk5lwC+dM3g6g6eKrYn2gLeAT4DfcmrwVNumdLNOlilOMSv5xcVCOqbcuvHKJUd5v5/dvp"
+    "yjcRSOYCYG0o4oKehkFV+QE+xKtVY9PzmrxtjHlDLIc1YsAYVvd3DOoqW8YJDWfIElA0t9"
+    "IOlx99GMgh+khGAG7EoFIen1cE629Hpac+/1XfF6TuFI935H6kYtP/BoGFg5NaOIdVhWLy"
+    "IJoWePuI1FpO2sHlen2XD0fE3nCmW1CxMIo1DAYejiyBSKGkMsaOKAuuBYdF9z2tecfuqa"
+    "044kmrchy0RcilGaZCaxyLMp5haSREF+SfA2Sy5sGEoqBvx1/Fvc5WAEHSiHvqqj1mJ8Ls"
+    "x0Wuauxzig1FHLMcJUG0ay4fkh11dfgIsiLrSrlac4uikyh5P00Cs2YATybXyHdFgWoOsG"
+    "pomxfVzmpMkdiVQIk7xA1fTSOA0jiX2Y7sN0H6bfN0wbNGCjaV6gGk5pqOKlzM4c8f4so/"
+    "Zf1oiKV9d3NBDQpRVki08GEiq7XKze8mjAPj1do/yspAoL0JqXrsxBUG2AsBF/gehWjte7"
+    "lll2L3PlYmbhSe3vN73upie1hI0k+hu5TPyI9wRLwAUwUsWtCNODq8ZfWbgv3vWa2b06GG"
+    "j+37vDp38Adc/Crg=="
+)
@@ -1,5 +1,6 @@
 # SPDX-License-Identifier: MIT
 # Copyright: 2024-2026 Communauté Les Frères Poulain, NiceBots.xyz
+from .afk_deadline import AfkDeadline, AfkDeadlineKind
 from .channel_note import (
     CONTENT_MAX_LENGTH as CONTENT_MAX_LENGTH_CHANNEL_NOTE,
 )
@@ -29,6 +30,8 @@ __all__ = [
     "HEADER_MAX_LENGTH_CHANNEL_NOTE",
     "SLOTS_PER_DAY_CHANNEL_NOTE",
     "SLOTS_PER_WEEK_CHANNEL_NOTE",
+    "AfkDeadline",
+    "AfkDeadlineKind",
     "ChannelNote",
     "ChannelNoteEvery",
     "Dormeur",
@@ -0,0 +1,40 @@
+# Copyright Communauté Les Frères Poulain 2025, 2026
+# SPDX-License-Identifier: MIT
+
+from datetime import datetime
+from enum import StrEnum
+from uuid import UUID
+
+from tortoise import fields
+from tortoise.models import Model
+
+
+class AfkDeadlineKind(StrEnum):
+    REMINDER = "reminder"
+    DISCONNECT = "disconnect"
+
+
+class AfkDeadline(Model):
+    """Pending AFK reminder or disconnect, kept so they survive restarts.
+
+    Attrs:
+        kind: Whether the deadline is the next reminder of a member or the disconnect of an unanswered reminder.
+        key: The member id for reminders, the reminder message id for disconnects.
+        member_id: The member the deadline applies to.
+        channel_id: The channel the reminder message was sent in, for disconnects.
+        deadline: When the reminder is sent or the member is disconnected.
+    """
+
+    id: fields.Field[UUID] = fields.UUIDField(pk=True)
+
+    kind: AfkDeadlineKind = fields.CharEnumField(enum_type=AfkDeadlineKind)
+    key: fields.Field[int] = fields.BigIntField()
+    member_id: fields.Field[int] = fields.BigIntField()
+    channel_id: fields.Field[int | None] = fields.BigIntField(null=True)
+    deadline: fields.Field[datetime] = fields.DatetimeField()
+
+    class Meta:
+        unique_together = (("kind", "key"),)
+
+
+__all__ = ["AfkDeadline", "AfkDeadlineKind"]
@@ -1,12 +1,15 @@
 # Copyright Communauté Les Frères Poulain 2025, 2026
 # SPDX-License-Identifier: MIT
 
+from collections.abc import Iterable
 from datetime import datetime
 from enum import StrEnum
+from typing import Self
 from uuid import UUID
 
 from tortoise import fields
 from tortoise.models import Model
+from tortoise.queryset import QuerySet
 
 CONTENT_MAX_LENGTH = 1024
 HEADER_MAX_LENGTH = 128
@@ -23,6 +26,21 @@ class ChannelNoteEvery(StrEnum):
     D_1 = "d_1"
     D_7 = "d_7"
 
+    @property
+    def period(self) -> int:
+        """Get the number of slots between two sends, the first one being in slot 0."""
+        match self:
+            case ChannelNoteEvery.H_1:
+                return 1
+            case ChannelNoteEvery.H_6:
+                return 6
+            case ChannelNoteEvery.H_12:
+                return 12
+            case ChannelNoteEvery.D_1:
+                return SLOTS_PER_DAY
+            case ChannelNoteEvery.D_7:
+                return SLOTS_PER_WEEK
+
 
 class ChannelNote(Model):
     id: fields.Field[UUID] = fields.UUIDField(pk=True)
@@ -33,6 +51,8 @@ class ChannelNote(Model):
     header: fields.Field[str] = fields.CharField(max_length=HEADER_MAX_LENGTH)
     footer: fields.Field[str] = fields.CharField(max_length=FOOTER_MAX_LENGTH)
     every: ChannelNoteEvery = fields.CharEnumField(enum_type=ChannelNoteEvery)
+    last_message_id: fields.Field[int | None] = fields.BigIntField(null=True)
+    messages_since: fields.Field[int | None] = fields.IntField(null=True)
 
     created_at: fields.Field[datetime] = fields.DatetimeField(auto_now_add=True)
     updated_at: fields.Field[datetime] = fields.DatetimeField(auto_now=True)
@@ -51,17 +71,24 @@ class ChannelNote(Model):
             set[int]: The slots for which this channel note should be sent.
 
         """
-        match self.every:
-            case ChannelNoteEvery.H_1:
-                return set(range(SLOTS_PER_WEEK))
-            case ChannelNoteEvery.H_6:
-                return set(range(0, SLOTS_PER_WEEK, 6))
-            case ChannelNoteEvery.H_12:
-                return set(range(0, SLOTS_PER_WEEK, 12))
-            case ChannelNoteEvery.D_1:
-                return set(range(0, SLOTS_PER_WEEK, 24))
-            case ChannelNoteEvery.D_7:
-                return {0}
+        return set(range(0, SLOTS_PER_WEEK, self.every.period))
+
+    @classmethod
+    def due_in(cls, slots: Iterable[int]) -> QuerySet[Self]:
+        """Get the enabled channel notes to send in any of the given slots.
+
+        The cadences due in the slots are computed once, so the filtering is done by the database.
+
+        Args:
+            slots (Iterable[int]): The slots, as returned by ``ChannelNoteCog.get_current_slot``.
+
+        Returns:
+            QuerySet[Self]: The channel notes to send.
+
+        """
+        slots = set(slots)
+        due = [every for every in ChannelNoteEvery if any(slot % every.period == 0 for slot in slots)]
+        return cls.filter(enabled=True, every__in=due)
 
 
 __all__ = ("CONTENT_MAX_LENGTH", "FOOTER_MAX_LENGTH", "HEADER_MAX_LENGTH", "ChannelNote", "ChannelNoteEvery")
@@ -0,0 +1,220 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Sequence
+from logging import getLogger
+from typing import Any
+from weakref import WeakSet
+
+import aiocache
+from tortoise.models import Model
+from tortoise.signals import post_delete, post_save
+
+from src.database.models import Guild, User
+
+logger = getLogger("bot").getChild("database").getChild("cache")
+
+NAMESPACE = "models"
+
+# Prefetch sets each model has been read with, so every cached variant of an object can be invalidated.
+_prefetch_sets: defaultdict[type[Model], set[tuple[str, ...]]] = defaultdict(lambda: {()})
+_caches: WeakSet[aiocache.BaseCache] = WeakSet()
+# Instances being read from the database, with the number of reads in flight and how many times they were invalidated
+_fills: dict[tuple[type[Model], Any], list[int]] = {}
+
+
+def _normalize_prefetch(prefetch_related: Sequence[str]) -> tuple[str, ...]:
+    return tuple(sorted(set(prefetch_related)))
+
+
+def get_cache_key(model: type[Model], pk: Any, prefetch_related: Sequence[str] = ()) -> str:
+    """Get the cache key of a model instance read with the given related fields prefetched.
+
+    Args:
+        model: The model class.
+        pk: The primary key of the instance.
+        prefetch_related: The related fields prefetched with the instance.
+
+    Returns:
+        The cache key, in the form ``Model:pk`` or ``Model:pk:related,fields``.
+
+    """
+    key = f"{model.__name__}:{pk}"
+    if prefetch := _normalize_prefetch(prefetch_related):
+        key += ":" + ",".join(prefetch)
+    return key
+
+
+def _dump_row(instance: Model) -> dict[str, Any]:
+    projection = instance._meta.fields_db_projection  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+    return {column: getattr(instance, name) for name, column in projection.items()}
+
+
+def _load_row[M: Model](model: type[M], row: dict[str, Any]) -> M:
+    meta = model._meta  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+    values = {
+        column: meta.fields_map[name].to_python_value(row[column]) for name, column in meta.fields_db_projection.items()
+    }
+    return model._init_from_db(**values)  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+
+
+def _dump(instance: Model | None, prefetch_related: tuple[str, ...]) -> dict[str, Any]:
+    if instance is None:
+        return {"row": None}
+    related: dict[str, Any] = {}
+    for name in prefetch_related:
+        value = getattr(instance, name)
+        if value is None or isinstance(value, Model):
+            related[name] = None if value is None else _dump_row(value)
+        else:
+            related[name] = [_dump_row(obj) for obj in value]
+    return {"row": _dump_row(instance), "related": related}
+
+
+def _load[M: Model](model: type[M], entry: dict[str, Any]) -> M | None:
+    if entry["row"] is None:
+        return None
+    instance = _load_row(model, entry["row"])
+    for name, value in entry["related"].items():
+        related_model: type[Model] = model._meta.fields_map[name].related_model  # noqa: SLF001  # pyright: ignore[reportAttributeAccessIssue, reportPrivateUsage]
+        if value is None or isinstance(value, dict):
+            setattr(instance, name, None if value is None else _load_row(related_model, value))  # pyright: ignore[reportUnknownArgumentType]
+        else:
+            related_objects = [_load_row(related_model, row) for row in value]  # pyright: ignore[reportUnknownVariableType]
+            getattr(instance, name)._set_result_for_query(related_objects)  # noqa: SLF001
+    return instance
+
+
+def _start_fill(model: type[Model], pk: Any) -> int:
+    fill = _fills.setdefault((model, pk), [0, 0])
+    fill[0] += 1
+    return fill[1]
+
+
+def _end_fill(model: type[Model], pk: Any) -> int:
+    fill = _fills[model, pk]
+    fill[0] -= 1
+    if not fill[0]:
+        del _fills[model, pk]
+    return fill[1]
+
+
+async def get_or_none_cached[M: Model](
+    cache: aiocache.BaseCache, model: type[M], pk: Any, prefetch_related: Sequence[str] = (), *, ttl: int
+) -> M | None:
+    """Get a model instance by primary key, reading through the cache.
+
+    Both found and missing instances are cached for ``ttl`` seconds. Cached entries are invalidated when an instance
+    of a cached model is saved or deleted through Tortoise (``post_save``/``post_delete``). The row read is not cached
+    if the instance is invalidated while it is being read, since it may predate the write. Bulk
+    ``QuerySet.update()``/``delete()`` calls, changes to prefetched related objects and writes made by other processes
+    do not send those signals here and are only picked up when the entry expires.
+
+    Args:
+        cache: The cache to read through, usually ``bot.botkit_cache``.
+        model: The model class.
+        pk: The primary key of the instance.
+        prefetch_related: The related fields to prefetch. Nested (``a__b``) prefetches bypass the cache.
+        ttl: How long, in seconds, an entry may be served from the cache.
+
+    Returns:
+        The instance, or None if it does not exist.
+
+    """
+    prefetch = _normalize_prefetch(prefetch_related)
+    if any("__" in name for name in prefetch):
+        return await model.get_or_none(pk=pk).prefetch_related(*prefetch)
+
+    entry: dict[str, Any] | None = await cache.get(get_cache_key(model, pk, prefetch), namespace=NAMESPACE)
+    if entry is not None:
+        return _load(model, entry)
+
+    generation = _start_fill(model, pk)
+    try:
+        instance = await model.get_or_none(pk=pk).prefetch_related(*prefetch)
+        if _fills[model, pk][1] == generation:
+            await _store(cache, model, pk, instance, prefetch, ttl=ttl)
+    finally:
+        invalidated = _end_fill(model, pk) != generation
+    if invalidated:
+        # Invalidated while the entry was being written, which may have landed after the invalidation
+        await cache.delete(get_cache_key(model, pk, prefetch), namespace=NAMESPACE)
+    return instance
+
+
+async def get_cached[M: Model](
+    cache: aiocache.BaseCache, model: type[M], pk: Any, prefetch_related: Sequence[str] = ()
+) -> M | None:
+    """Get a model instance from the cache only.
+
+    Args:
+        cache: The cache to read from.
+        model: The model class.
+        pk: The primary key of the instance.
+        prefetch_related: The related fields prefetched with the instance.
+
+    Returns:
+        The cached instance, or None if it is not cached or was cached as missing.
+
+    """
+    entry: dict[str, Any] | None = await cache.get(get_cache_key(model, pk, prefetch_related), namespace=NAMESPACE)
+    return None if entry is None else _load(model, entry)
+
+
+async def set_cached(
+    cache: aiocache.BaseCache, instance: Model, prefetch_related: Sequence[str] = (), *, ttl: int
+) -> None:
+    """Store a model instance in the cache.
+
+    Args:
+        cache: The cache to store the instance in.
+        instance: The instance, with ``prefetch_related`` already fetched.
+        prefetch_related: The related fields fetched on the instance. Nested (``a__b``) prefetches are not cached.
+        ttl: How long, in seconds, the entry may be served from the cache.
+
+    """
+    prefetch = _normalize_prefetch(prefetch_related)
+    if not any("__" in name for name in prefetch):
+        await _store(cache, type(instance), instance.pk, instance, prefetch, ttl=ttl)
+
+
+async def _store(
+    cache: aiocache.BaseCache,
+    model: type[Model],
+    pk: Any,
+    instance: Model | None,
+    prefetch: tuple[str, ...],
+    *,
+    ttl: int,
+) -> None:
+    _prefetch_sets[model].add(prefetch)
+    _caches.add(cache)
+    await cache.set(get_cache_key(model, pk, prefetch), _dump(instance, prefetch), ttl=ttl, namespace=NAMESPACE)
+
+
+async def invalidate(model: type[Model], pk: Any) -> None:
+    """Remove every cached variant of a model instance from the caches it was stored in.
+
+    Args:
+        model: The model class.
+        pk: The primary key of the instance.
+
+    """
+    if (fill := _fills.get((model, pk))) is not None:
+        fill[1] += 1
+    keys = [get_cache_key(model, pk, prefetch) for prefetch in _prefetch_sets[model]]
+    await asyncio.gather(*(cache.delete(key, namespace=NAMESPACE) for cache in list(_caches) for key in keys))
+
+
+@post_save(User, Guild)
+@post_delete(User, Guild)
+async def _invalidate_on_write(sender: type[Model], instance: Model, *_: Any) -> None:
+    try:
+        await invalidate(sender, instance.pk)
+    except Exception:
+        logger.warning(f"Could not invalidate cached {sender.__name__} {instance.pk}", exc_info=True)
+
+
+__all__ = ["NAMESPACE", "get_cache_key", "get_cached", "get_or_none_cached", "invalidate", "set_cached"]
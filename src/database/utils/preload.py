@@ -1,19 +1,46 @@
 # SPDX-License-Identifier: MIT
 # Copyright: 2024-2026 NiceBots.xyz
 
-from collections.abc import Callable, Sequence
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
 from functools import partial
 from typing import Literal, Protocol, overload
 
 from discord.ext import commands
+from tortoise.models import Model
 
 from src import custom
+from src.config import config
 from src.database.models import Guild, User
 
+from .cache import get_cached, get_or_none_cached, set_cached
+from .upsert import upsert
+
+
+async def _get_or_none[M: Model](
+    ctx: custom.Context, model: type[M], pk: int, prefetch_related: Sequence[str]
+) -> M | None:
+    if not config.db.cache.enabled:
+        return await model.get_or_none(pk=pk).prefetch_related(*prefetch_related)
+    return await get_or_none_cached(ctx.bot.botkit_cache, model, pk, prefetch_related, ttl=config.db.cache.ttl)
+
+
+async def _get_or_create[M: Model](ctx: custom.Context, model: type[M], pk: int, prefetch_related: Sequence[str]) -> M:
+    cache = ctx.bot.botkit_cache if config.db.cache.enabled else None
+    if cache is not None and (instance := await get_cached(cache, model, pk, prefetch_related)) is not None:
+        return instance
+    instance = await upsert(model, pk)
+    await asyncio.gather(*(instance.fetch_related(name) for name in prefetch_related))
+    if cache is not None:
+        await set_cached(cache, instance, prefetch_related, ttl=config.db.cache.ttl)
+    return instance
+
 
 async def _preload_user(ctx: custom.Context, prefetch_related: Sequence[str]) -> Literal[True]:
     """Preload the user object into the context object.
 
+    The lookup reads through ``bot.botkit_cache`` unless ``db.cache.enabled`` is false.
+
     Args:
     ----
         ctx: The context object to preload the user object into.
@@ -24,18 +51,16 @@ async def _preload_user(ctx: custom.Context, prefetch_related: Sequence[str]) ->
         bool: (True) always.
 
     """
-    if isinstance(ctx, custom.ExtContext):
-        ctx.user_obj = (
-            await User.get_or_none(id=ctx.author.id).prefetch_related(*prefetch_related) if ctx.author else None
-        )
-    else:
-        ctx.user_obj = await User.get_or_none(id=ctx.user.id).prefetch_related(*prefetch_related) if ctx.user else None
+    author = ctx.author if isinstance(ctx, custom.ExtContext) else ctx.user
+    ctx.user_obj = await _get_or_none(ctx, User, author.id, prefetch_related) if author else None
     return True
 
 
 async def _preload_guild(ctx: custom.Context, prefetch_related: Sequence[str]) -> Literal[True]:
     """Preload the guild object into the context object.
 
+    The lookup reads through ``bot.botkit_cache`` unless ``db.cache.enabled`` is false.
+
     Args:
     ----
         ctx: The context object to preload the guild object into.
@@ -46,13 +71,16 @@ async def _preload_guild(ctx: custom.Context, prefetch_related: Sequence[str]) -
         bool: (True) always.
 
     """
-    ctx.guild_obj = await Guild.get_or_none(id=ctx.guild.id).prefetch_related(*prefetch_related) if ctx.guild else None
+    ctx.guild_obj = await _get_or_none(ctx, Guild, ctx.guild.id, prefetch_related) if ctx.guild else None
     return True
 
 
 async def _preload_or_create_user(ctx: custom.Context, prefetch_related: Sequence[str]) -> Literal[True]:
     """Preload or create the user object into the context object. If the user object does not exist, create it.
 
+    The user is read from ``bot.botkit_cache`` when cached, otherwise it is created if needed in a single upsert and
+    its related fields are fetched concurrently.
+
     Args:
     ----
         ctx: The context object to preload or create the user object into.
@@ -63,17 +91,16 @@ async def _preload_or_create_user(ctx: custom.Context, prefetch_related: Sequenc
         bool: (True) always.
 
     """
-    user: User | None
-    user, _ = await User.get_or_create(id=ctx.author.id) if ctx.author else (None, None)
-    if user is not None:
-        await user.fetch_related(*prefetch_related)
-    ctx.user_obj = user
+    ctx.user_obj = await _get_or_create(ctx, User, ctx.author.id, prefetch_related) if ctx.author else None
     return True
 
 
 async def _preload_or_create_guild(ctx: custom.Context, prefetch_related: Sequence[str]) -> Literal[True]:
     """Preload or create the guild object into the context object. If the guild object does not exist, create it.
 
+    The guild is read from ``bot.botkit_cache`` when cached, otherwise it is created if needed in a single upsert and
+    its related fields are fetched concurrently.
+
     Args:
     ----
         ctx: The context object to preload or create the guild object into.
@@ -84,11 +111,7 @@ async def _preload_or_create_guild(ctx: custom.Context, prefetch_related: Sequen
         bool: (True) always.
 
     """
-    guild: Guild | None
-    guild, _ = await Guild.get_or_create(id=ctx.guild.id) if ctx.guild else (None, None)
-    if guild is not None:
-        await guild.fetch_related(*prefetch_related)
-    ctx.guild_obj = guild
+    ctx.guild_obj = await _get_or_create(ctx, Guild, ctx.guild.id, prefetch_related) if ctx.guild else None
     return True
 
 
@@ -119,6 +142,76 @@ def preload_x[T](
     return check_decorator(f) if f is not None else check_decorator
 
 
+async def _preload(
+    ctx: custom.Context, *, user: Sequence[str] | None, guild: Sequence[str] | None, create: bool
+) -> Literal[True]:
+    """Preload the user and guild objects into the context object concurrently.
+
+    Args:
+    ----
+        ctx: The context object to preload the objects into.
+        user: List of related fields to prefetch on the user, or None to not preload the user.
+        guild: List of related fields to prefetch on the guild, or None to not preload the guild.
+        create: Whether to create the objects that do not exist.
+
+    Returns:
+    -------
+        bool: (True) always.
+
+    """
+    preloads: list[Awaitable[Literal[True]]] = []
+    if user is not None:
+        preloads.append((_preload_or_create_user if create else _preload_user)(ctx, user))
+    if guild is not None:
+        preloads.append((_preload_or_create_guild if create else _preload_guild)(ctx, guild))
+    await asyncio.gather(*preloads)
+    return True
+
+
+def _prefetch(value: bool | Sequence[str]) -> Sequence[str] | None:
+    if isinstance(value, bool):
+        return [] if value else None
+    return value
+
+
+@overload
+def preload[T](
+    f: T, *, user: bool | Sequence[str] = True, guild: bool | Sequence[str] = True, create: bool = False
+) -> T: ...
+
+
+@overload
+def preload[T](
+    f: None = None, *, user: bool | Sequence[str] = True, guild: bool | Sequence[str] = True, create: bool = False
+) -> Callable[[T], T]: ...
+
+
+def preload[T](
+    f: T | None = None, *, user: bool | Sequence[str] = True, guild: bool | Sequence[str] = True, create: bool = False
+) -> T | Callable[[T], T]:
+    """Preload the user and guild objects into ``ctx.user_obj`` and ``ctx.guild_obj`` with a single check.
+
+    Unlike stacking ``preload_user`` and ``preload_guild``, both lookups run concurrently.
+
+    Args:
+    ----
+        f: The command to decorate.
+        user: Whether to preload the user, or the list of its related fields to prefetch.
+        guild: Whether to preload the guild, or the list of its related fields to prefetch.
+        create: Whether to create the user and guild objects that do not exist.
+
+    Returns:
+    -------
+        The decorated command, or the decorator if ``f`` is None.
+
+    """
+    func = partial(_preload, user=_prefetch(user), guild=_prefetch(guild), create=create)
+
+    check_decorator = commands.check(func)
+
+    return check_decorator(f) if f is not None else check_decorator
+
+
 preload_guild = partial(preload_x, preloader=_preload_guild)
 preload_user = partial(preload_x, preloader=_preload_user)
 preload_or_create_guild = partial(preload_x, preloader=_preload_or_create_guild)
@@ -0,0 +1,119 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+import asyncio
+from collections.abc import Iterable
+from typing import Any
+
+from tortoise.models import Model
+
+from .cache import invalidate
+
+INSERTED_COLUMN = "__inserted"
+
+
+def _placeholders(dialect: str, start: int, count: int) -> list[str]:
+    if dialect == "postgres":
+        return [f"${i}" for i in range(start, start + count)]
+    return ["?"] * count
+
+
+def _insert_values(model: type[Model], pks: list[Any]) -> tuple[list[str], list[list[Any]]]:
+    meta = model._meta  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+    names = [
+        name
+        for name, column in meta.fields_db_projection.items()
+        if column not in meta.generated_db_fields or name == meta.pk_attr
+    ]
+    rows: list[list[Any]] = []
+    for pk in pks:
+        instance = model(**{meta.pk_attr: pk})
+        rows.append([meta.fields_map[name].to_db_value(getattr(instance, name), instance) for name in names])
+    return [meta.fields_db_projection[name] for name in names], rows
+
+
+async def upsert_many[M: Model](model: type[M], pks: Iterable[Any]) -> dict[Any, M]:
+    """Get the instances with the given primary keys, creating the missing ones with their default values.
+
+    On PostgreSQL this is a single ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` statement that also selects the
+    rows that already existed. Other dialects run the insert, then select the existing rows it did not return. A row
+    inserted concurrently by another transaction may be invisible to the statement, it is then selected separately.
+
+    Unlike ``Model.get_or_create``, no transaction is opened and no ``post_save`` signal is sent, cached reads of the
+    created instances are invalidated directly.
+
+    Args:
+        model: The model class. Every field other than the primary key must have a default.
+        pks: The primary keys to get or create.
+
+    Returns:
+        The instances, by primary key.
+
+    """
+    pks = list(dict.fromkeys(pks))
+    if not pks:
+        return {}
+
+    meta = model._meta  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+    db = model._choose_db(for_write=True)  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+    dialect = db.capabilities.dialect
+    table, pk_column = f'"{meta.db_table}"', f'"{meta.db_pk_column}"'
+    columns, rows = _insert_values(model, pks)
+
+    values: list[Any] = []
+    tuples: list[str] = []
+    for row in rows:
+        tuples.append(f"({', '.join(_placeholders(dialect, len(values) + 1, len(row)))})")
+        values.extend(row)
+    # Identifiers come from the model metadata, every value is a bound parameter.
+    insert = (
+        f"INSERT INTO {table} ({', '.join(f'"{column}"' for column in columns)}) VALUES {', '.join(tuples)} "  # noqa: S608
+        "ON CONFLICT DO NOTHING RETURNING *"
+    )
+    pk_values = [rows[i][columns.index(meta.db_pk_column)] for i in range(len(pks))]
+
+    if dialect == "postgres":
+        pk_placeholders = ", ".join(_placeholders(dialect, len(values) + 1, len(pk_values)))
+        results = await db.execute_query_dict(
+            f"WITH inserted AS ({insert}) "  # noqa: S608
+            f'SELECT *, TRUE AS "{INSERTED_COLUMN}" FROM inserted UNION ALL '
+            f"SELECT *, FALSE FROM {table} WHERE {pk_column} IN ({pk_placeholders})",
+            [*values, *pk_values],
+        )
+    else:
+        results = [{**result, INSERTED_COLUMN: True} for result in await db.execute_query_dict(insert, values)]
+
+    instances: dict[Any, M] = {}
+    inserted: list[Any] = []
+    for result in results:
+        is_inserted = result.pop(INSERTED_COLUMN)
+        instance = model._init_from_db(**result)  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+        instances[instance.pk] = instance
+        if is_inserted:
+            inserted.append(instance.pk)
+
+    if missing := [pk for pk in pks if pk not in instances]:
+        for instance in await model.filter(pk__in=missing).using_db(db):
+            instances[instance.pk] = instance
+
+    await asyncio.gather(*(invalidate(model, pk) for pk in inserted))
+    return instances
+
+
+async def upsert[M: Model](model: type[M], pk: Any) -> M:
+    """Get the instance with the given primary key, creating it with its default values if it does not exist.
+
+    See ``upsert_many``.
+
+    Args:
+        model: The model class.
+        pk: The primary key to get or create.
+
+    Returns:
+        The instance.
+
+    """
+    return (await upsert_many(model, [pk]))[pk]
+
+
+__all__ = ["upsert", "upsert_many"]
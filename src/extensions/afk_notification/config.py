@@ -30,6 +30,8 @@ class AfkNotifConfig(BaseModel):
     guild_id: int
     logs_channel_id: int
     role_id: int | None = None
+    dormeurs_refresh_every: int = 900
+    schedule_persist_every: int = 30
 
     @field_validator("start_time", mode="before")
     @classmethod
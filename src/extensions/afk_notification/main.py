@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: MIT
 
 import asyncio
-from datetime import datetime, time, timedelta
+from datetime import UTC, datetime, time, timedelta
 from logging import getLogger
 from typing import Self, final, override
 
@@ -11,12 +11,19 @@ from discord.ext import tasks
 from discord.utils import format_dt
 
 from src import custom
-from src.database.models import Dormeur
+from src.database.models import AfkDeadline, AfkDeadlineKind, Dormeur
+from src.database.utils.atomics import in_transaction
 
 from .config import EUROPE_PARIS, AfkNotifConfig
+from .scheduler import DeadlineScheduler
 
 logger = getLogger("bot").getChild("afk_notification")
 
+# Scheduler keys: (REMINDER, member id) for the next reminder, (DISCONNECT, message id) for each unanswered reminder.
+type ScheduleKey = tuple[AfkDeadlineKind, int]
+# Member id, channel id and deadline of a persisted scheduler key.
+type PersistedDeadline = tuple[int, int | None, datetime]
+
 
 def is_time_between(start: time, end: time, current: datetime) -> bool:
     """Check if a given time is between start and end times.
@@ -40,18 +47,43 @@ def is_time_between(start: time, end: time, current: datetime) -> bool:
 
 class NotifyView(discord.ui.DesignerView):
     @override
-    def __init__(self, member: discord.Member, config: "AfkNotifConfig", bot: custom.Bot) -> None:
+    def __init__(
+        self,
+        member: discord.Member,
+        config: "AfkNotifConfig",
+        bot: custom.Bot,
+        scheduler: DeadlineScheduler[ScheduleKey],
+        deadline: datetime | None = None,
+        restored: discord.PartialMessage | None = None,
+    ) -> None:
+        """Create the reminder view.
+
+        Args:
+            member: The member the reminder is for.
+            config: The extension configuration.
+            bot: The bot.
+            scheduler: The scheduler running the disconnect.
+            deadline: The disconnect deadline of a reminder sent before a restart. The view then has no timeout so it
+                can be registered again with ``bot.add_view``.
+            restored: The message of a reminder sent before a restart, its button is disabled at the deadline.
+
+        """
         self.member: discord.Member = member
         self.config: AfkNotifConfig = config
         self.bot: custom.Bot = bot
-        super().__init__(timeout=self.config.afk_reminder_timeout, disable_on_timeout=True)
+        self.scheduler: DeadlineScheduler[ScheduleKey] = scheduler
+        self.key: ScheduleKey | None = None
+        self.restored: discord.PartialMessage | None = restored
+        super().__init__(timeout=None if deadline else self.config.afk_reminder_timeout, disable_on_timeout=True)
 
         button: discord.ui.Button[Self] = discord.ui.Button(
-            label="Je suis réveillé(e) !", style=discord.ButtonStyle.success
+            label="Je suis réveillé(e) !",
+            style=discord.ButtonStyle.success,
+            custom_id=f"afk_notification:awake:{member.id}",
         )
         button.callback = self.button_callback
 
-        self.datetime_timeout: datetime = datetime.now(tz=EUROPE_PARIS) + timedelta(
+        self.datetime_timeout: datetime = deadline or datetime.now(tz=EUROPE_PARIS) + timedelta(
             seconds=self.config.afk_reminder_timeout
         )
 
@@ -64,10 +96,22 @@ class NotifyView(discord.ui.DesignerView):
             discord.ui.ActionRow(button),
         )
         self.add_item(container)
-        self.task: asyncio.Task[None] = asyncio.create_task(self.disconnect_member())
+
+    def schedule_disconnect(self, message_id: int) -> None:
+        """Disconnect the member at the deadline shown in the reminder, unless they click the button before."""
+        self.key = (AfkDeadlineKind.DISCONNECT, message_id)
+        delay = (self.datetime_timeout - datetime.now(tz=EUROPE_PARIS)).total_seconds()
+        self.scheduler.schedule(self.key, delay, self.disconnect_member)
 
     async def disconnect_member(self) -> None:
-        await asyncio.sleep(self.config.afk_reminder_timeout)
+        if self.restored is not None:
+            # Restored views have no timeout to disable the button, do it like on_timeout does for fresh views
+            self.stop()
+            self.disable_all_items()
+            try:
+                await self.restored.edit(view=self)
+            except discord.HTTPException:
+                logger.warning(f"Could not disable the reminder {self.restored.id} of {self.member}", exc_info=True)
         if self.member.voice and self.member.voice.channel:
             voice_channel = self.member.voice.channel
             logger.info(f"Disconnecting AFK member: {self.member} ({self.member.id})")
@@ -116,7 +160,8 @@ class NotifyView(discord.ui.DesignerView):
             await interaction.response.defer()
         except discord.HTTPException:
             logger.exception(f"Failed to defer interaction for {self.member} ({self.member.id})")
-        self.task.cancel()
+        if self.key is not None:
+            self.scheduler.cancel(self.key)
         await self.on_timeout()
         self.stop()
 
@@ -127,58 +172,176 @@ class AfkNotif(discord.Cog):
         self.bot = bot
         self.config = config
 
-        self.tasks: dict[int, asyncio.Task[None]] = {}
+        self.scheduler: DeadlineScheduler[ScheduleKey] = DeadlineScheduler()
+        self.dormeur_ids: set[int] = set()
+        # Member and channel of each pending disconnect, by reminder message id.
+        self.disconnects: dict[int, tuple[int, int]] = {}
+        self.persisted: dict[ScheduleKey, PersistedDeadline] = {}
         self.loop = tasks.loop(time=self.config.start_time)(self.register_all)
+        self.refresh_loop = tasks.loop(seconds=self.config.dormeurs_refresh_every)(self.load_dormeurs)
+        self.refresh_loop.before_loop(self.delay_dormeurs_refresh)
+        self.persist_loop = tasks.loop(seconds=self.config.schedule_persist_every)(self.persist_schedule)
+
+    async def load_dormeurs(self) -> None:
+        """Reload the ids of all dormeurs from the database in a single query.
+
+        The reminders of members who are no longer dormeurs are cancelled.
+        """
+        dormeurs: set[int] = set(await Dormeur.all().values_list("discord_id", flat=True))  # pyright: ignore[reportArgumentType]
+        for member_id in self.dormeur_ids - dormeurs:
+            if self.scheduler.cancel((AfkDeadlineKind.REMINDER, member_id)):
+                logger.debug(f"Cancelled reminder for removed dormeur {member_id}")
+        self.dormeur_ids = dormeurs
+        logger.debug(f"Loaded {len(self.dormeur_ids)} dormeur(s)")
+
+    async def delay_dormeurs_refresh(self) -> None:
+        """Skip the first iteration of the refresh loop, ``on_ready`` already loaded the dormeurs."""
+        await asyncio.sleep(self.config.dormeurs_refresh_every)
+
+    def schedule_reminder(self, member: discord.Member) -> None:
+        logger.debug(f"Scheduling reminder in {self.config.afk_reminder_every}s for {member} ({member.id})")
+        self.scheduler.schedule(
+            (AfkDeadlineKind.REMINDER, member.id), self.config.afk_reminder_every, lambda: self.notify_member(member)
+        )
 
     async def notify_member(self, member: discord.Member) -> None:
-        try:
-            while True:
-                logger.debug(f"Starting {self.config.afk_reminder_every}s sleep for {member} ({member.id})")
-                await asyncio.sleep(self.config.afk_reminder_every)
-
-                if not member.voice or not member.voice.channel:
-                    logger.debug(f"Member {member} ({member.id}) no longer in voice, stopping notifications")
-                    return
+        if not member.voice or not member.voice.channel:
+            logger.debug(f"Member {member} ({member.id}) no longer in voice, stopping notifications")
+            return
 
-                if not is_time_between(self.config.start_time, self.config.stop_time, datetime.now(tz=EUROPE_PARIS)):
-                    logger.debug(f"Outside time window for {member} ({member.id}), stopping notifications")
-                    return
+        if not is_time_between(self.config.start_time, self.config.stop_time, datetime.now(tz=EUROPE_PARIS)):
+            logger.debug(f"Outside time window for {member} ({member.id}), stopping notifications")
+            return
 
-                logger.info(f"Sending AFK notification to {member} ({member.id}) in {member.voice.channel}")
-                view = NotifyView(member, self.config, self.bot)
-                try:
-                    await member.voice.channel.send(view=view, delete_after=self.config.afk_reminder_timeout * 2)
-                except discord.Forbidden:
-                    logger.exception(f"Missing permission to send message in {member.voice.channel}")
-                    view.task.cancel()
-                    return
-                except discord.HTTPException:
-                    view.task.cancel()
-                    logger.exception(f"Failed to send AFK notification to {member} ({member.id})")
-                except Exception:
-                    view.task.cancel()
-                    raise
-
-        except asyncio.CancelledError:
-            logger.debug(f"Notification task cancelled for {member} ({member.id})")
-            raise
+        logger.info(f"Sending AFK notification to {member} ({member.id}) in {member.voice.channel}")
+        view = NotifyView(member, self.config, self.bot, self.scheduler)
+        try:
+            message = await member.voice.channel.send(view=view, delete_after=self.config.afk_reminder_timeout * 2)
+        except discord.Forbidden:
+            logger.exception(f"Missing permission to send message in {member.voice.channel}")
+            return
+        except discord.HTTPException:
+            logger.exception(f"Failed to send AFK notification to {member} ({member.id})")
+        else:
+            self.disconnects[message.id] = (member.id, message.channel.id)
+            view.schedule_disconnect(message.id)
+        self.schedule_reminder(member)
+
+    async def persist_schedule(self) -> None:
+        """Write the scheduler deadlines that changed since the last call to the database.
+
+        Deadlines are compared with the ones last written and only the changed rows are written, in a single
+        transaction with one delete query per kind of deadline and one insert query, whatever the number of members.
+        Reminders only moved by whole ``afk_reminder_every`` periods are unchanged, since the restore moves them to
+        their next occurrence anyway, so the rows of members being reminded are not rewritten at every reminder.
+        """
+        now, loop_now = datetime.now(tz=UTC), asyncio.get_running_loop().time()
+        current: dict[ScheduleKey, PersistedDeadline] = {}
+        for key, when in self.scheduler.items():
+            kind, id_ = key
+            member_id, channel_id = (id_, None) if kind is AfkDeadlineKind.REMINDER else self.disconnects[id_]
+            previous = self.persisted.get(key)
+            deadline = now + timedelta(seconds=when - loop_now)
+            if previous is not None and self.is_written(kind, previous[2], deadline):
+                deadline = previous[2]
+            current[key] = (member_id, channel_id, deadline)
+        self.disconnects = {id_: self.disconnects[id_] for kind, id_ in current if kind is AfkDeadlineKind.DISCONNECT}
+
+        stale = [key for key, value in self.persisted.items() if current.get(key) != value]
+        new = [key for key, value in current.items() if self.persisted.get(key) != value]
+        if not stale and not new:
+            return
+        try:
+            async with in_transaction():
+                for kind in AfkDeadlineKind:
+                    if ids := [id_ for key_kind, id_ in stale if key_kind is kind]:
+                        await AfkDeadline.filter(kind=kind, key__in=ids).delete()
+                if new:
+                    await AfkDeadline.bulk_create(
+                        AfkDeadline(
+                            kind=kind,
+                            key=id_,
+                            member_id=current[kind, id_][0],
+                            channel_id=current[kind, id_][1],
+                            deadline=current[kind, id_][2],
+                        )
+                        for kind, id_ in new
+                    )
         except Exception:
-            logger.exception(f"Error in notify_member for {member} ({member.id})")
-        finally:
-            logger.debug(f"Cleaning up task for {member} ({member.id})")
-            self.tasks.pop(member.id, None)
+            logger.exception("Failed to persist the AFK schedule")
+            return
+        self.persisted = current
+        logger.debug(f"Persisted AFK schedule: {len(stale)} removed, {len(new)} written")
+
+    def is_written(self, kind: AfkDeadlineKind, written: datetime, deadline: datetime) -> bool:
+        """Check whether a scheduler deadline is the one written to the database.
+
+        Deadlines are converted from the loop clock, so they may be off by a fraction of a second. Reminders moved by
+        whole periods are the same reminders.
+        """
+        offset = abs((deadline - written).total_seconds())
+        if kind is AfkDeadlineKind.REMINDER:
+            offset %= self.config.afk_reminder_every
+            offset = min(offset, self.config.afk_reminder_every - offset)
+        return offset < 1
+
+    async def restore_schedule(self) -> None:
+        """Schedule again the reminders and disconnects persisted before a restart.
+
+        Overdue disconnects run right away. Overdue reminders keep their cadence and are moved to their next
+        occurrence, so a restart does not send a reminder to everyone at once. Reminder messages are deleted when
+        they would have been without the restart.
+        """
+        guild = self.bot.get_guild(self.config.guild_id)
+        rows = await AfkDeadline.all()
+        self.persisted = {(row.kind, row.key): (row.member_id, row.channel_id, row.deadline) for row in rows}
+        if not guild:
+            return
 
-    async def register_all(self) -> None:
+        now = datetime.now(tz=UTC)
+        restored = 0
+        for row in rows:
+            delay = (row.deadline - now).total_seconds()
+            message = None
+            if row.kind is AfkDeadlineKind.DISCONNECT and row.channel_id is not None:
+                message = self.bot.get_partial_messageable(row.channel_id).get_partial_message(row.key)
+                # Replaces the delete_after of the message, which did not survive the restart
+                await message.delete(delay=max(delay + self.config.afk_reminder_timeout, 0))
+            member = guild.get_member(row.member_id)
+            if not member or not member.voice or not member.voice.channel:
+                continue
+            if row.kind is AfkDeadlineKind.REMINDER:
+                if member.id not in self.dormeur_ids:
+                    continue
+                self.scheduler.schedule(
+                    (AfkDeadlineKind.REMINDER, member.id),
+                    delay if delay >= 0 else delay % self.config.afk_reminder_every,
+                    lambda member=member: self.notify_member(member),
+                )
+            elif message is not None and row.channel_id is not None:
+                view = NotifyView(
+                    member, self.config, self.bot, self.scheduler, deadline=row.deadline, restored=message
+                )
+                self.bot.add_view(view, message_id=row.key)
+                self.disconnects[row.key] = (member.id, row.channel_id)
+                view.schedule_disconnect(row.key)
+            restored += 1
+        logger.info(f"Restored {restored} of {len(rows)} persisted AFK deadline(s)")
+
+    async def register_all(self, *, reload: bool = True) -> None:
         logger.info("Registering all members in voice channels")
         guild = self.bot.get_guild(self.config.guild_id)
         if not guild:
             logger.warning(f"Guild {self.config.guild_id} not found")
             return
 
+        if reload:
+            await self.load_dormeurs()
+
         count = 0
         for channel in guild.voice_channels:
             for member in channel.members:
-                if member.id not in self.tasks:
+                if (AfkDeadlineKind.REMINDER, member.id) not in self.scheduler:
                     await self.register_new_member(member)
                     count += 1
 
@@ -191,23 +354,35 @@ class AfkNotif(discord.Cog):
             logger.debug(f"Member {member} ({member.id}) does not have required role {self.config.role_id}")
             return
 
-        if not await Dormeur.filter(discord_id=member.id).exists():
+        if member.id not in self.dormeur_ids:
             logger.debug(f"Member {member} ({member.id}) is not a dormeur")
             return
 
         logger.info(f"Registering new member for AFK notifications: {member} ({member.id})")
-        self.tasks[member.id] = asyncio.create_task(self.notify_member(member))
+        self.schedule_reminder(member)
 
     @discord.Cog.listener("on_ready", once=True)
     async def on_ready(self) -> None:
         logger.info("AfkNotif cog ready, starting daily registration loop")
+        await self.load_dormeurs()
+        await self.restore_schedule()
+        if is_time_between(self.config.start_time, self.config.stop_time, datetime.now(tz=EUROPE_PARIS)):
+            await self.register_all(reload=False)
+        self.scheduler.start()
+        self.refresh_loop.start()
         self.loop.start()
+        self.persist_loop.start()
+
+    @override
+    def cog_unload(self) -> None:
+        self.scheduler.stop()
+        self.refresh_loop.cancel()
+        self.loop.cancel()
+        self.persist_loop.cancel()
 
     async def cancel_member(self, member: discord.Member) -> bool:
-        if task := self.tasks.get(member.id):
-            logger.debug(f"Cancelling notification task for {member} ({member.id})")
-            task.cancel()
-            self.tasks.pop(member.id)
+        if self.scheduler.cancel((AfkDeadlineKind.REMINDER, member.id)):
+            logger.debug(f"Cancelled reminder for {member} ({member.id})")
             return True
         return False
 
@@ -234,7 +409,7 @@ class AfkNotif(discord.Cog):
             logger.debug(f"Member {member} ({member.id}) moved from {before.channel} to {after.channel}")
             await self.cancel_member(member)
 
-        if member.id not in self.tasks:
+        if (AfkDeadlineKind.REMINDER, member.id) not in self.scheduler:
             logger.debug(f"Member {member} ({member.id}) joined voice channel: {after.channel}")
             await self.register_new_member(member)
 
@@ -250,6 +425,7 @@ class AfkNotif(discord.Cog):
             await ctx.respond(f"{member.mention} est déjà un dormeur.", ephemeral=True)
             return
         await Dormeur.create(discord_id=member.id)
+        self.dormeur_ids.add(member.id)
         if is_time_between(self.config.start_time, self.config.stop_time, datetime.now(tz=EUROPE_PARIS)):
             await self.register_new_member(member)
             logger.debug(f"Registered new member {member} ({member.id}) for AFK notifications")
@@ -262,10 +438,9 @@ class AfkNotif(discord.Cog):
             await ctx.respond(f"{member.mention} n'est pas un dormeur.", ephemeral=True)
             return
         await Dormeur.filter(discord_id=member.id).delete()
-        if task := self.tasks.get(member.id):
-            logger.debug(f"Cancelling notification task for removed dormeur {member} ({member.id})")
-            task.cancel()
-            self.tasks.pop(member.id)
+        self.dormeur_ids.discard(member.id)
+        if self.scheduler.cancel((AfkDeadlineKind.REMINDER, member.id)):
+            logger.debug(f"Cancelled reminder for removed dormeur {member} ({member.id})")
 
         await ctx.respond(f"{member.mention} a été supprimé en tant que dormeur.", ephemeral=True)
 
@@ -0,0 +1,129 @@
+# Copyright Communauté Les Frères Poulain 2025, 2026
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+from collections.abc import Callable, Coroutine, Hashable
+from dataclasses import dataclass, field
+from logging import getLogger
+from typing import Any, final
+
+logger = getLogger("bot").getChild("afk_notification").getChild("scheduler")
+
+type Callback = Callable[[], Coroutine[Any, Any, None]]
+
+
+@dataclass(order=True, slots=True)
+class _Entry[K: Hashable]:
+    when: float
+    seq: int
+    key: K = field(compare=False)
+    callback: Callback = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+@final
+class DeadlineScheduler[K: Hashable]:
+    """Run callbacks at their deadline from a single task.
+
+    Deadlines are kept in a heap, at most one per key. Scheduling or rescheduling a key is O(log n); cancelled
+    entries are only marked and are dropped when they reach the top of the heap.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[_Entry[K]] = []
+        self._entries: dict[K, _Entry[K]] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._running: set[asyncio.Task[None]] = set()
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def when(self, key: K) -> float | None:
+        """Get the deadline of a key, in event loop time, or None if it is not scheduled."""
+        entry = self._entries.get(key)
+        return None if entry is None else entry.when
+
+    def items(self) -> list[tuple[K, float]]:
+        """Get every scheduled key with its deadline, in event loop time."""
+        return [(key, entry.when) for key, entry in self._entries.items()]
+
+    def schedule(self, key: K, delay: float, callback: Callback) -> None:
+        """Run ``callback`` in ``delay`` seconds, replacing the deadline already scheduled for ``key``.
+
+        Args:
+            key: The key identifying the deadline.
+            delay: The number of seconds to wait. Negative delays run the callback on the next iteration.
+            callback: The coroutine function to run.
+
+        """
+        self.cancel(key)
+        entry = _Entry(asyncio.get_running_loop().time() + delay, next(self._counter), key, callback)
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry:
+            self._wakeup.set()
+
+    def cancel(self, key: K) -> bool:
+        """Cancel the deadline scheduled for ``key``.
+
+        Returns:
+            Whether a deadline was scheduled.
+
+        """
+        if (entry := self._entries.pop(key, None)) is None:
+            return False
+        entry.cancelled = True
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [entry for entry in self._heap if not entry.cancelled]
+            heapq.heapify(self._heap)
+        return True
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop the scheduler and the callbacks still running. Scheduled deadlines are kept."""
+        if self._task is not None:
+            self._task.cancel()
+        for task in self._running:
+            task.cancel()
+
+    def _pop_due(self, now: float) -> float | None:
+        while self._heap:
+            entry = self._heap[0]
+            if entry.cancelled:
+                heapq.heappop(self._heap)
+                continue
+            if entry.when > now:
+                return entry.when - now
+            heapq.heappop(self._heap)
+            del self._entries[entry.key]
+            task = asyncio.create_task(entry.callback())
+            self._running.add(task)
+            task.add_done_callback(self._done)
+        return None
+
+    def _done(self, task: asyncio.Task[None]) -> None:
+        self._running.discard(task)
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            logger.error("Scheduled callback failed", exc_info=exc)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            timeout = self._pop_due(loop.time())
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+
+__all__ = ["DeadlineScheduler"]
@@ -1,7 +1,11 @@
 # SPDX-License-Identifier: MIT
 # Copyright: 2024-2026 Communauté Les Frères Poulain, NiceBots.xyz
+import asyncio
+import time
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from typing import final, override
+from typing import Any, final, override
+from uuid import UUID
 
 import discord
 from discord.ext import tasks
@@ -25,6 +29,81 @@ logger = base_logger.getChild("channel_note")
 
 
 HISTORY_NOSEND_LIMIT = 6
+COMPONENTS_V2_FLAGS = discord.MessageFlags(is_components_v2=True).value
+
+
+@dataclass(slots=True)
+class ChannelActivity:
+    """Activity of a channel with a note since the bot last posted in it.
+
+    Attrs:
+        note_id: The id of the channel note.
+        last_message_id: The id of the last note posted by the bot.
+        messages_since: The number of messages posted since the bot last posted, capped at ``HISTORY_NOSEND_LIMIT``.
+            None when it is not known yet and has to be read from the channel history.
+        dirty: Whether the activity changed since it was last persisted.
+    """
+
+    note_id: UUID
+    last_message_id: int | None
+    messages_since: int | None
+    dirty: bool = False
+
+
+@dataclass(slots=True)
+class DeliveryReport:
+    """Outcome of the deliveries of one tick of ``ChannelNoteCog.channel_note_task``.
+
+    Attrs:
+        slots: The slots handled by the tick.
+        latencies: How long each sent note took to send, in seconds.
+        skipped: The number of due notes not sent because of recent bot messages or a missing channel.
+        failed: The number of due notes that could not be sent.
+        duration: How long the whole tick took, in seconds.
+    """
+
+    slots: set[int]
+    latencies: list[float] = field(default_factory=list)
+    skipped: int = 0
+    failed: int = 0
+    duration: float = 0.0
+
+    def summary(self) -> str:
+        latencies = sorted(self.latencies)
+        summary = (
+            f"Channel notes for slots {sorted(self.slots)}: {len(latencies)} sent, {self.skipped} skipped, "
+            f"{self.failed} failed in {self.duration:.2f}s"
+        )
+        if latencies:
+            summary += f", latency p50 {latencies[len(latencies) // 2]:.2f}s max {latencies[-1]:.2f}s"
+        return summary
+
+
+def render_note(note: ChannelNote) -> list[dict[str, Any]]:
+    """Render the components of the message of a channel note.
+
+    Args:
+        note: The channel note.
+
+    Returns:
+        list[dict[str, Any]]: The components payload, to be sent with the components v2 flag.
+
+    """
+    container = Container[DesignerView](
+        TextDisplay(
+            content=f"## {note.header}",
+        ),
+        TextDisplay(
+            content=note.content,
+        ),
+    )
+    if note.footer:
+        container.add_item(
+            TextDisplay(
+                content=note.footer,
+            ),
+        )
+    return DesignerView(container).to_components()
 
 
 @final
@@ -137,25 +216,26 @@ class ChannelNoteConfigModal(discord.ui.DesignerModal):
             await self.note.save()
             await interaction.respond(self.translations.note_created, ephemeral=True)
         else:
-            modified: bool = False
+            # Only the edited fields are saved, the activity columns are written by the cog in the meantime
+            modified: list[str] = []
             if self.note.enabled != self.enabled_checkbox.value:
                 self.note.enabled = self.enabled_checkbox.value
-                modified = True
+                modified.append("enabled")
             if self.note.content != self.content_input.value:
                 self.note.content = self.content_input.value
-                modified = True
+                modified.append("content")
             if self.note.header != self.header_input.value:
                 self.note.header = self.header_input.value
-                modified = True
+                modified.append("header")
             if self.note.footer != self.footer_input.value:
                 self.note.footer = self.footer_input.value
-                modified = True
+                modified.append("footer")
             if self.note.every != ChannelNoteEvery(self.every_select.values[0]):
                 self.note.every = ChannelNoteEvery(self.every_select.values[0])
-                modified = True
+                modified.append("every")
 
             if modified:
-                await self.note.save()
+                await self.note.save(update_fields=[*modified, "updated_at"])
                 await interaction.respond(self.translations.note_modified, ephemeral=True)
             else:
                 await interaction.respond(self.translations.note_not_modified, ephemeral=True)
@@ -167,12 +247,98 @@ class ChannelNoteCog(discord.Cog):
         self.bot = bot
         self.last_slot: int | None = None
         self.config = config
+        self.activity: dict[int, ChannelActivity] = {}
+        self.last_report: DeliveryReport | None = None
+        # Rendered components of each note, with the updated_at of the note they were rendered from. Pruned weekly.
+        self.rendered: dict[UUID, tuple[datetime, list[dict[str, Any]]]] = {}
+        self.persist_activity_task = tasks.loop(seconds=self.config.activity_persist_every)(self.persist_activity)
 
     @discord.Cog.listener(once=True)
     async def on_ready(self) -> None:
+        await self.load_activity()
+        self.persist_activity_task.start()
         self.channel_note_task.start()
         logger.info("Channel note task started")
 
+    @override
+    def cog_unload(self) -> None:
+        self.channel_note_task.cancel()
+        self.persist_activity_task.cancel()
+
+    async def load_activity(self) -> None:
+        """Load the activity of every channel with a note from the database."""
+        rows = await ChannelNote.all().values_list("discord_id", "id", "last_message_id", "messages_since")
+        self.activity = {
+            discord_id: ChannelActivity(note_id, last_message_id, messages_since)
+            for discord_id, note_id, last_message_id, messages_since in rows  # pyright: ignore[reportGeneralTypeIssues]
+        }
+        logger.info(f"Tracking activity of {len(self.activity)} channel(s)")
+
+    async def persist_activity(self) -> None:
+        """Write the channel activity that changed since the last call to the database, in a single query."""
+        dirty = [activity for activity in self.activity.values() if activity.dirty]
+        if not dirty:
+            return
+        for activity in dirty:
+            activity.dirty = False
+        try:
+            await ChannelNote.bulk_update(
+                [
+                    ChannelNote(
+                        id=activity.note_id,
+                        last_message_id=activity.last_message_id,
+                        messages_since=activity.messages_since,
+                    )
+                    for activity in dirty
+                ],
+                fields=["last_message_id", "messages_since"],
+            )
+        except Exception:
+            for activity in dirty:
+                activity.dirty = True
+            logger.exception("Failed to persist channel note activity")
+
+    @discord.Cog.listener("on_message")
+    async def on_message(self, message: discord.Message) -> None:
+        activity = self.activity.get(message.channel.id)
+        if activity is None:
+            return
+        if self.bot.user is not None and message.author.id == self.bot.user.id:
+            activity.messages_since = 0
+        elif activity.messages_since is None or activity.messages_since >= HISTORY_NOSEND_LIMIT:
+            return
+        else:
+            activity.messages_since += 1
+        activity.dirty = True
+
+    async def get_messages_since(self, channel: discord.abc.Messageable, note: ChannelNote) -> int:
+        """Get the number of messages posted in a channel since the bot last posted in it.
+
+        The count is tracked from ``on_message``. The channel history is only read when the count is not known yet,
+        for new notes and notes that were never sent since tracking was added.
+
+        Args:
+            channel: The channel of the note.
+            note: The channel note.
+
+        Returns:
+            int: The number of messages, capped at ``HISTORY_NOSEND_LIMIT``.
+
+        """
+        activity = self.activity.get(note.discord_id)
+        if activity is None:
+            activity = self.activity[note.discord_id] = ChannelActivity(
+                note.id, note.last_message_id, note.messages_since
+            )
+        if activity.messages_since is None:
+            activity.messages_since = HISTORY_NOSEND_LIMIT
+            for i, message in enumerate(await channel.history(limit=HISTORY_NOSEND_LIMIT).flatten()):
+                if message.author.id == self.bot.user.id:  # pyright: ignore[reportOptionalMemberAccess]
+                    activity.messages_since = i
+                    break
+            activity.dirty = True
+        return activity.messages_since
+
     @discord.slash_command(default_member_permissions=discord.Permissions(administrator=True))  # pyright: ignore[reportUntypedFunctionDecorator]
     async def channel_note(self, ctx: custom.ApplicationContext) -> None:
         assert ctx.channel is not None
@@ -196,15 +362,15 @@ class ChannelNoteCog(discord.Cog):
         return now.weekday() * 24 + now.hour
 
     @tasks.loop(hours=1)
-    async def channel_note_task(self) -> None:  # noqa: PLR0912
+    async def channel_note_task(self) -> None:
         current_slot = self.get_current_slot()
         logger.info(f"Current slot: {current_slot}")
         if self.last_slot == current_slot:
             logger.info("Current slot is the same as the last slot, skipping")
             return
         if self.last_slot is None:
-            self.last_slot = current_slot
             if not self.config.send_on_start:
+                self.last_slot = current_slot
                 logger.info("Send on start is disabled, skipping")
                 return
             logger.info("Last slot is None, setting last slot to current slot")
@@ -215,46 +381,69 @@ class ChannelNoteCog(discord.Cog):
                 if self.last_slot < current_slot
                 else set(range(self.last_slot + 1, SLOTS_PER_WEEK_CHANNEL_NOTE)) | set(range(current_slot + 1))
             )
-        notes = await ChannelNote.all()
-        for note in notes:
-            logger.info(f"Checking note: {note.id}")
-            if not note.enabled:
-                logger.info(f"Note {note} is not enabled, skipping")
-                continue
-            if not len(note.slots & slots_to_handle) > 0:
-                logger.info(
-                    f"Note {note} does not match the current slot, it has slots {note.slots}"
-                    + "and the current slots are {slots_to_handle}, skipping"
-                )
-                continue
-            if channel := self.bot.get_channel(note.discord_id):
-                skip = False
-                async for message in channel.history(limit=HISTORY_NOSEND_LIMIT):  # pyright: ignore[reportAttributeAccessIssue]
-                    if message.author.id == self.bot.user.id:
-                        logger.info(f"Message {message.id} is from the bot, skipping")
-                        skip = True
-                        break
-                if skip:
-                    continue
+        report = DeliveryReport(slots_to_handle)
+        start = time.perf_counter()
+        notes = await ChannelNote.due_in(slots_to_handle)
+        if 0 in slots_to_handle:
+            # Every enabled note is due in slot 0, forget the rendered components of deleted and disabled notes
+            self.rendered = {note.id: self.rendered[note.id] for note in notes if note.id in self.rendered}
+        semaphore = asyncio.Semaphore(self.config.delivery_concurrency)
+        # If the tick is cancelled, last_slot is left unchanged so the next tick handles the same slots again. Notes
+        # already sent are then skipped, their channel activity having been reset.
+        async with asyncio.TaskGroup() as group:
+            for note in notes:
+                group.create_task(self.deliver(note, semaphore, report))
+        report.duration = time.perf_counter() - start
+        self.last_report = report
+        self.last_slot = current_slot
+        logger.info(report.summary())
+
+    async def deliver(self, note: ChannelNote, semaphore: asyncio.Semaphore, report: DeliveryReport) -> None:
+        """Send a due note to its channel, unless the bot posted in it recently.
+
+        Up to ``delivery_concurrency`` notes are sent at once. Each channel has its own rate limit bucket, which the
+        HTTP client of the library waits on when it is exhausted.
+
+        Args:
+            note: The channel note.
+            semaphore: The semaphore bounding the concurrent deliveries of the tick.
+            report: The report of the tick, updated with the outcome of the delivery.
+
+        """
+        if not (channel := self.bot.get_channel(note.discord_id)):
+            logger.info(f"Channel {note.discord_id} of note {note} not found, skipping")
+            report.skipped += 1
+            return
+        async with semaphore:
+            try:
+                if (messages_since := await self.get_messages_since(channel, note)) < HISTORY_NOSEND_LIMIT:  # pyright: ignore[reportArgumentType]
+                    logger.info(f"Only {messages_since} message(s) since the bot last posted in {channel.id}, skipping")
+                    report.skipped += 1
+                    return
                 logger.info(f"Note {note} matches the current slot, sending to channel {channel.id}")
-                container = Container[DesignerView](
-                    TextDisplay(
-                        content=f"## {note.header}",
-                    ),
-                    TextDisplay(
-                        content=note.content,
-                    ),
+                components = self.get_components(note)
+                start = time.perf_counter()
+                message = await self.bot.http.send_message(
+                    channel.id,
+                    None,
+                    components=components,  # pyright: ignore[reportArgumentType]
+                    flags=COMPONENTS_V2_FLAGS,
+                    allowed_mentions=self.bot.allowed_mentions and self.bot.allowed_mentions.to_dict(),  # pyright: ignore[reportArgumentType]
                 )
-                if note.footer:
-                    container.add_item(
-                        TextDisplay(
-                            content=note.footer,
-                        ),
-                    )
-                await channel.send(view=DesignerView(container))  # pyright: ignore[reportAttributeAccessIssue]
-            else:
-                logger.info(f"Note {note} is not enabled or does not match the current slot, skipping")
-        self.last_slot = current_slot
+            except Exception:
+                logger.exception(f"Failed to send note {note} to channel {channel.id}")
+                report.failed += 1
+                return
+        report.latencies.append(time.perf_counter() - start)
+        activity = self.activity[note.discord_id]
+        activity.last_message_id, activity.messages_since, activity.dirty = int(message["id"]), 0, True
+
+    def get_components(self, note: ChannelNote) -> list[dict[str, Any]]:
+        """Get the rendered components of a note, rendering them again only if the note was updated since."""
+        cached = self.rendered.get(note.id)
+        if cached is None or cached[0] != note.updated_at:
+            cached = self.rendered[note.id] = (note.updated_at, render_note(note))
+        return cached[1]
 
 
 __all__ = ("ChannelNoteCog",)
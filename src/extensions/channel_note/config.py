@@ -6,3 +6,5 @@ from pydantic import BaseModel
 class ChannelNoteConfig(BaseModel):
     enabled: bool = True
     send_on_start: bool = True
+    activity_persist_every: int = 300
+    delivery_concurrency: int = 5
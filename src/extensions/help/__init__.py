@@ -13,7 +13,7 @@ from src import custom
 from src.extensions.help.pages.classes import (
     HelpCategoryTranslation,
 )
-from src.i18n.classes import RawTranslation, TranslationWrapper, apply_locale
+from src.i18n.classes import RawTranslation, TranslationStrings, TranslationWrapper, apply_cached_locale, apply_locale
 
 from .pages import help_translation
 
@@ -287,7 +287,7 @@ def get_categories_data(
 class Help(commands.Cog):
     def __init__(self, bot: custom.Bot, ui_translations: dict[str, RawTranslation], locales: set[str]) -> None:
         self.bot = bot
-        self.ui_translations = ui_translations
+        self.ui_translations = TranslationStrings(ui_translations)
         self.locales = locales
         super().__init__()
 
@@ -314,7 +314,7 @@ class Help(commands.Cog):
         """Display help information using the new UI components."""
         help_view = HelpView(
             categories_data=self.categories_data.get(ctx.locale or "") or self.categories_data["en-US"],
-            ui_translations=apply_locale(self.ui_translations, ctx.locale),
+            ui_translations=apply_cached_locale(self.ui_translations, ctx.locale),
             bot=self.bot,
         )
         await ctx.respond(view=help_view, ephemeral=True)
@@ -1,7 +1,7 @@
 # SPDX-License-Identifier: MIT
 # Copyright: 2024-2026 NiceBots.xyz
 
-from .classes import add_global_kv, apply_locale
+from .classes import add_global_kv, apply_locale, set_active_locales
 from .utils import apply, load_translation
 
-__all__ = ["add_global_kv", "apply", "apply_locale", "load_translation"]
+__all__ = ["add_global_kv", "apply", "apply_locale", "load_translation", "set_active_locales"]
@@ -0,0 +1,106 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+"""Compiled cache of the YAML translation files.
+
+Parsing YAML is by far the slowest part of loading translations, validating the parsed data is cheap in comparison.
+The parsed data of each file is therefore stored as JSON in a ``__pycache__`` directory beside it, like Python does for
+bytecode, and read back with orjson as long as the file keeps the same path, size and modification time.
+"""
+
+import contextlib
+import math
+import os
+from logging import getLogger
+from pathlib import Path
+from typing import Any
+
+import orjson
+import yaml
+
+logger = getLogger("bot").getChild("i18n").getChild("cache")
+
+CACHE_VERSION = 2
+CACHE_DIR = "__pycache__"
+
+
+def cache_path(path: Path) -> Path:
+    """Get the path of the compiled cache of a YAML file."""
+    return path.parent / CACHE_DIR / f"{path.name}.json"
+
+
+def _cache_key(path: Path) -> list[Any]:
+    stat = path.stat()
+    return [CACHE_VERSION, str(path.resolve()), stat.st_mtime_ns, stat.st_size]
+
+
+def _read_cache(cached: Path, key: list[Any]) -> tuple[bool, Any]:
+    try:
+        entry = orjson.loads(cached.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return False, None
+    if not isinstance(entry, dict) or entry.get("key") != key or "data" not in entry:
+        return False, None
+    return True, entry["data"]
+
+
+def _is_json(data: Any) -> bool:
+    """Check whether data is read back unchanged from JSON.
+
+    orjson also serializes values YAML can produce, like dates, as strings, so the types are checked explicitly.
+    """
+    if isinstance(data, dict):
+        return all(isinstance(key, str) and _is_json(value) for key, value in data.items())  # pyright: ignore[reportUnknownVariableType]
+    if isinstance(data, list):
+        return all(_is_json(item) for item in data)  # pyright: ignore[reportUnknownVariableType]
+    if isinstance(data, float):
+        return math.isfinite(data)
+    return data is None or isinstance(data, str | int)
+
+
+def _write_cache(cached: Path, key: list[Any], data: Any) -> None:
+    content = None
+    # YAML values with no JSON equivalent (dates, non string keys, integers over 64 bits...) would not round-trip
+    if _is_json(data):
+        with contextlib.suppress(TypeError):
+            content = orjson.dumps({"key": key, "data": data})
+    if content is None:
+        logger.debug(f"Not caching {cached.name}, its content can't be stored as JSON")
+        return
+    tmp = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+    try:
+        cached.parent.mkdir(exist_ok=True)
+        tmp.write_bytes(content)
+        tmp.replace(cached)
+    except OSError as e:
+        logger.debug(f"Could not write {cached}: {e}")
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+
+
+def load_yaml(path: str | Path) -> Any:
+    """Load a YAML file, going through its compiled cache.
+
+    Args:
+        path: The path to the YAML file.
+
+    Returns:
+        The parsed content of the file.
+
+    Raises:
+        yaml.YAMLError: If the file is not a valid YAML file.
+
+    """
+    path = Path(path)
+    key = _cache_key(path)
+    cached = cache_path(path)
+    hit, data = _read_cache(cached, key)
+    if hit:
+        return data
+    with path.open(encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    _write_cache(cached, key, data)
+    return data
+
+
+__all__ = ["cache_path", "load_yaml"]
@@ -1,10 +1,14 @@
 # SPDX-License-Identifier: MIT
 # Copyright: 2024-2026 NiceBots.xyz
 
-from collections.abc import Generator, Iterator, Mapping, Sequence
-from typing import Any, ClassVar, Self, cast, overload, override
+import _string  # pyright: ignore[reportMissingModuleSource]
+import warnings
+from collections.abc import Generator, Iterable, Iterator, Mapping, Sequence
+from functools import lru_cache
+from string import Formatter
+from typing import TYPE_CHECKING, Any, ClassVar, Self, cast, final, overload, override
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 LOCALES = (
     "en-US",
@@ -41,6 +45,53 @@ LOCALES = (
 )
 DEFAULT = "en-US"
 
+# Position of each locale in LOCALES, by its Discord name ("en-US") and its RawTranslation field name ("en_US").
+LOCALE_INDEX: dict[str, int] = {
+    **{locale: i for i, locale in enumerate(LOCALES)},
+    **{locale.replace("-", "_"): i for i, locale in enumerate(LOCALES)},
+}
+DEFAULT_INDEX = LOCALE_INDEX[DEFAULT]
+# RawTranslation field name of each locale of LOCALES.
+_FIELDS = tuple(locale.replace("-", "_") for locale in LOCALES)
+
+
+def _locale_index(locale: str) -> int:
+    if (index := LOCALE_INDEX.get(locale)) is None:
+        raise ValueError(f"Invalid locale {locale}")
+    return index
+
+
+# Keys (Discord names and field names) of the locales kept when a RawTranslation is validated, None to keep them all
+_active_keys: frozenset[str] | None = None
+# Indexes in LOCALES of the locales a RawTranslation stores, and slot of each locale of LOCALES among them. Inactive
+# locales share the slot of the default locale.
+_active_indexes: tuple[int, ...] = tuple(range(len(LOCALES)))
+_slots: tuple[int, ...] = _active_indexes
+
+
+def set_active_locales(locales: Iterable[str] | None) -> None:
+    """Only keep the translations of ``locales`` and of the default locale in the translations validated from now on.
+
+    Other locales fall back to the default locale, as if they were not translated.
+
+    Args:
+        locales: The locales in use, or None to keep every locale.
+
+    Raises:
+        ValueError: If one of the locales is not supported.
+
+    """
+    global _active_keys, _active_indexes, _slots  # noqa: PLW0603
+    if locales is None:
+        _active_keys = None
+        _active_indexes = _slots = tuple(range(len(LOCALES)))
+        return
+    active = {_locale_index(locale) for locale in locales} | {DEFAULT_INDEX}
+    _active_keys = frozenset(key for index in active for key in (LOCALES[index], _FIELDS[index]))
+    _active_indexes = tuple(sorted(active))
+    slot = {index: i for i, index in enumerate(_active_indexes)}
+    _slots = tuple(slot.get(index, slot[DEFAULT_INDEX]) for index in range(len(LOCALES)))
+
 
 class _Placeholder:
     def __init__(self, key: str) -> None:
@@ -197,9 +248,108 @@ def add_global_kv(key: str, values: Mapping[str, str]) -> None:
     TranslationWrapper.GLOBAL_KV[key] = values
 
 
+_ATTR_DICT_NAMES = frozenset({*dir(AttrDict), "underlying"})
+
+
+@final
+class _Field:
+    __slots__ = ("key", "source", "spec", "steps")
+
+    def __init__(self, field_name: str, spec: str) -> None:
+        """Parse a replacement field of a template.
+
+        Args:
+            field_name: The field name, such as ``commands.help`` or ``emojis[name]``.
+            spec: The format specifier of the field.
+
+        """
+        key, rest = _string.formatter_field_name_split(field_name)  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+        self.key: str = key  # pyright: ignore[reportUnknownMemberType]
+        self.steps: tuple[tuple[bool, str | int], ...] = tuple(rest)  # pyright: ignore[reportUnknownArgumentType]
+        self.spec: str = spec
+        # What str.format_map renders through _Placeholder when the key is missing
+        self.source: str = "{" + field_name + (":" + spec if spec else "") + "}"
+
+    def render(self, mapping: Mapping[str, str]) -> str:
+        value: Any = mapping
+        for i, (is_attr, step) in enumerate(self.steps):
+            if i == 0:
+                # Same lookup as AttrDict
+                try:
+                    value = value[step]
+                except KeyError as e:
+                    if is_attr:
+                        raise AttributeError(step) from e
+                    raise
+            else:
+                value = getattr(value, step) if is_attr else value[step]  # pyright: ignore[reportArgumentType]
+        if not self.steps:
+            value = AttrDict(mapping)
+        return format(value, self.spec)
+
+
+@final
+class _Template:
+    __slots__ = ("literal", "segments", "template")
+
+    def __init__(self, template: str) -> None:
+        """Parse a template into literals and replacement fields.
+
+        Templates using features the fields do not reproduce (conversions, positional fields, nested fields in format
+        specifiers) are rendered with ``str.format_map`` instead.
+
+        Args:
+            template: The format string.
+
+        """
+        self.template: str = template
+        self.segments: list[str | _Field] | None = []
+        for literal, field_name, spec, conversion in Formatter().parse(template):
+            if literal:
+                self.segments.append(literal)
+            if field_name is None:
+                continue
+            if conversion or not field_name or field_name[0].isdigit() or "{" in (spec or ""):
+                self.segments = None
+                break
+            field = _Field(field_name, spec or "")
+            if field.steps and field.steps[0][0] and field.steps[0][1] in _ATTR_DICT_NAMES:
+                # Resolved to an attribute of AttrDict itself rather than to a key
+                self.segments = None
+                break
+            self.segments.append(field)
+        # Templates without fields render to the same string whatever the data
+        self.literal: str | None = None
+        if self.segments is not None and all(isinstance(segment, str) for segment in self.segments):
+            self.literal = "".join(cast("list[str]", self.segments))
+
+    def render(self, data: Mapping[str, Mapping[str, str]]) -> str:
+        if self.literal is not None:
+            return self.literal
+        if self.segments is None:
+            return self.template.format_map(LazyPartialDict(dict(data)))
+        parts: list[str] = []
+        for segment in self.segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+            elif (mapping := data.get(segment.key)) is None:
+                parts.append(segment.source)
+            else:
+                parts.append(segment.render(mapping))
+        return "".join(parts)
+
+
+@lru_cache(maxsize=4096)
+def _compile(template: str) -> _Template:
+    return _Template(template)
+
+
 def partial_fmt(template: str, data: dict[str, Mapping[str, str]]) -> str:
     """Format a template string with partial data, leaving missing keys intact.
 
+    Templates are parsed once and cached. Rendering then only resolves the fields of the template, and templates
+    without fields are returned as is (with ``{{``/``}}`` unescaped, like ``str.format_map``).
+
     Args:
         template: A format string with `{key.attr}` style placeholders.
         data: A dict mapping top-level keys to dicts of their attributes.
@@ -208,7 +358,7 @@ def partial_fmt(template: str, data: dict[str, Mapping[str, str]]) -> str:
         The template with available keys resolved, missing keys left as-is.
 
     """
-    return template.format_map(LazyPartialDict(data))
+    return _compile(template).render(data)
 
 
 class RawTranslation(BaseModel):
@@ -244,12 +394,59 @@ class RawTranslation(BaseModel):
     uk: str | None = None
     vi: str | None = None
 
-    class Config:
-        populate_by_name: bool = True
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
+
+    # Compiled when the model is validated. _resolved holds the translations of the active locales with missing ones
+    # replaced by the DEFAULT one, _slots the position in _resolved of each locale of LOCALES. They are plain slots
+    # rather than pydantic private attributes, which are much slower to read. Copies do not carry them and compile
+    # them again on first use.
+    __slots__ = ("_resolved", "_slots")
+
+    @model_validator(mode="before")
+    @classmethod
+    def _drop_inactive_locales(cls, data: Any) -> Any:
+        if _active_keys is None or not isinstance(data, dict):
+            return data
+        return {key: value for key, value in data.items() if key in _active_keys}  # pyright: ignore[reportUnknownVariableType]
+
+    @override
+    def model_post_init(self, context: Any, /) -> None:
+        self._compile()
+
+    if not TYPE_CHECKING:
+        # Hidden from type checkers like pydantic's own, so unknown attributes are still reported
+
+        def __getattr__(self, name: str) -> Any:
+            if name in RawTranslation.__slots__:
+                self._compile()
+                return object.__getattribute__(self, name)
+            return super().__getattr__(name)
+
+    def _compile(self) -> None:
+        default = getattr(self, _FIELDS[DEFAULT_INDEX])
+        object.__setattr__(
+            self, "_resolved", tuple(getattr(self, _FIELDS[index]) or default for index in _active_indexes)
+        )
+        object.__setattr__(self, "_slots", _slots)
+
+    def localizations(self) -> dict[str, str]:
+        """Get the translations by Discord locale name, without the missing ones."""
+        return {
+            locale: value
+            for locale, field in zip(LOCALES, _FIELDS, strict=True)
+            if (value := getattr(self, field)) is not None
+        }
 
     def get_for_locale(self, locale: str) -> str | None:
         """Get translation for a specific locale, falling back to the field default."""
-        return self.model_dump(by_alias=False).get(locale.replace("-", "_"))
+        index = LOCALE_INDEX.get(locale)
+        return None if index is None else getattr(self, _FIELDS[index])
+
+    def lookup(self, index: int, default_index: int = DEFAULT_INDEX) -> str | None:
+        """Get the translation of the locale at ``index`` in ``LOCALES``, or of ``default_index`` if it is missing."""
+        if default_index == DEFAULT_INDEX:
+            return self._resolved[self._slots[index]]
+        return getattr(self, _FIELDS[index]) or getattr(self, _FIELDS[default_index])
 
 
 class Translation(BaseModel):
@@ -257,6 +454,19 @@ class Translation(BaseModel):
         return apply_locale(self, locale)
 
 
+class TranslationStrings(dict[str, RawTranslation]):
+    """Translation strings keeping the wrappers :func:`apply_cached_locale` created for them.
+
+    The wrappers live as long as the strings, such as the strings of a command.
+    """
+
+    __slots__ = ("wrappers",)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wrappers: dict[tuple[str, str], TranslationWrapper[Any]] = {}
+
+
 Translatable = Translation | dict[str, RawTranslation]
 
 type WrappedInput[V: Translatable] = None | str | int | float | bool | RawTranslation | Sequence["WrappedInput[V]"] | V
@@ -264,12 +474,27 @@ type WrappedValue[V: Translatable] = None | str | int | float | bool | list["Wra
 
 
 class TranslationWrapper[T: Translatable]:
+    """View of a translation model in one locale.
+
+    Wrappers returned by :func:`apply_cached_locale` are shared between callers and can't be relocalized.
+    """
+
     def __init__(self, model: T, locale: str, default: str = DEFAULT) -> None:
         self._model: T = model
-        self._default: str
-        self.default = default.replace("-", "_")
-        self._locale: str
-        self.locale = locale.replace("-", "_")
+        self._default: str = default.replace("-", "_")
+        self._default_index: int = _locale_index(self._default)
+        self._locale: str = locale.replace("-", "_")
+        self._index: int = _locale_index(self._locale)
+        self._shared: bool = False
+
+    def _relocalize(self, locale: str, default: str) -> None:
+        if self._shared:
+            raise AttributeError(
+                "Wrappers shared by apply_cached_locale can't be relocalized, use apply_locale instead"
+            )
+        self._default_index = _locale_index(default)
+        self._index = _locale_index(locale)
+        self._default, self._locale = default, locale
 
     GLOBAL_KV: ClassVar[dict[str, Mapping[str, str]]] = {}
 
@@ -293,7 +518,7 @@ class TranslationWrapper[T: Translatable]:
         if isinstance(value, str | int | float | bool):
             return value
         if isinstance(value, RawTranslation):
-            r = value.get_for_locale(self._locale) or value.get_for_locale(self._default)
+            r = value.lookup(self._index, self._default_index)
             return partial_fmt(r, self.GLOBAL_KV) if r else None
         if isinstance(value, Sequence):
             return [self._wrap_value(item) for item in value]
@@ -349,11 +574,12 @@ class TranslationWrapper[T: Translatable]:
 
     @locale.setter
     def locale(self, value: str | None) -> None:  # pyright: ignore[reportPropertyTypeMismatch]
-        if value is None:
-            value = self.default
-        if value.replace("_", "-") not in LOCALES:
-            raise ValueError(f"Invalid locale {value}")
-        self._locale = value
+        warnings.warn(
+            "Setting TranslationWrapper.locale is deprecated, use apply_locale instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        self._relocalize(self._default if value is None else value, self._default)
 
     @property
     def default(self) -> str:
@@ -361,9 +587,12 @@ class TranslationWrapper[T: Translatable]:
 
     @default.setter
     def default(self, value: str) -> None:
-        if value.replace("_", "-") not in LOCALES:
-            raise ValueError(f"Invalid locale {value}")
-        self._default = value
+        warnings.warn(
+            "Setting TranslationWrapper.default is deprecated, use apply_locale instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        self._relocalize(self._locale, value)
 
     @override
     def __repr__(self) -> str:
@@ -408,11 +637,38 @@ def apply_locale[T: "Translatable"](
     locale: str | None,
     default: str | None = DEFAULT,
 ) -> TranslationWrapper[T]:
+    """Get the wrapper of ``model`` for ``locale``.
+
+    A wrapper given as ``model`` is relocalized in place and returned, unless it is shared by
+    :func:`apply_cached_locale`, in which case a new wrapper of its model is returned.
+    """
     default = default if default is not None else DEFAULT
     if locale is None:
         locale = DEFAULT
     if isinstance(model, TranslationWrapper):
-        model.locale = locale
-        model.default = default
-        return model
+        if not model._shared:  # noqa: SLF001
+            model._relocalize(locale.replace("-", "_"), default.replace("-", "_"))  # noqa: SLF001
+            return model
+        model = model._model  # noqa: SLF001
     return TranslationWrapper(model, locale, default)
+
+
+def apply_cached_locale[T: "Translatable"](
+    model: T | TranslationWrapper[T],
+    locale: str | None,
+    default: str | None = DEFAULT,
+) -> TranslationWrapper[T]:
+    """Get the wrapper of ``model`` for ``locale``, created once and then shared by every caller.
+
+    The wrappers of :class:`TranslationStrings` are kept on the strings, other models get a new wrapper at each call.
+    Shared wrappers can't be relocalized.
+    """
+    if isinstance(model, TranslationWrapper):
+        model = model._model  # noqa: SLF001
+    if not isinstance(model, TranslationStrings):
+        return apply_locale(model, locale, default)
+    key = (locale or DEFAULT, default or DEFAULT)
+    if (wrapper := model.wrappers.get(key)) is None:
+        wrapper = model.wrappers[key] = apply_locale(model, locale, default)
+        wrapper._shared = True  # noqa: SLF001
+    return wrapper  # pyright: ignore[reportReturnType]
@@ -1,11 +1,9 @@
 # SPDX-License-Identifier: MIT
 # Copyright: 2024-2026 NiceBots.xyz
 from collections.abc import Iterator, Mapping
-from datetime import timedelta
 from typing import TYPE_CHECKING, override
 
 import discord
-from cachetools import TTLCache
 
 from src.config import config
 from src.log import logger as main_logger
@@ -22,12 +20,28 @@ class AppCommandMapping(Mapping[str, str]):
     def __init__(self, bot: "custom.Bot") -> None:
         """Initialize a mapping for app command placeholders.
 
+        The mapping is empty until :meth:`rebuild` is called.
+
         Args:
             bot: Bot instance used to resolve application commands.
 
         """
         self.bot: custom.Bot = bot
-        self._cache: TTLCache[str, str] = TTLCache(maxsize=32, ttl=timedelta(hours=1).seconds)
+        self._index: dict[str, str] = {}
+
+    def rebuild(self) -> None:
+        """Index every application command by qualified name.
+
+        Must be called again whenever commands are synced, since slash command mentions contain their ids.
+        """
+        index: dict[str, str] = {}
+        for command in self.bot.walk_application_commands():  # pyright: ignore[reportUnknownVariableType]
+            # Like Bot.get_application_command, the first command registered with a name wins
+            index.setdefault(
+                command.qualified_name,  # pyright: ignore[reportUnknownArgumentType, reportUnknownMemberType]
+                command.mention if isinstance(command, discord.SlashCommand) else command.name,  # pyright: ignore[reportUnknownArgumentType, reportUnknownMemberType]
+            )
+        self._index = index
 
     @override
     def __getitem__(self, key: str) -> str:
@@ -43,14 +57,7 @@ class AppCommandMapping(Mapping[str, str]):
             KeyError: If no command matches the provided key.
 
         """
-        key = key.replace("__", " ")
-        if key in self._cache:
-            return self._cache[key]
-        if command := self.bot.get_application_command(key):  # pyright: ignore[reportUnknownVariableType]
-            r = command.mention if isinstance(command, discord.SlashCommand) else command.name
-            self._cache[key] = r
-            return r
-        raise KeyError(key)
+        return self._index[key.replace("__", " ")]
 
     @override
     def __iter__(self) -> Iterator[str]:
@@ -60,30 +67,39 @@ class AppCommandMapping(Mapping[str, str]):
             An iterator of command keys using ``__`` separators.
 
         """
-        for cmd in self.bot.walk_application_commands():  # pyright: ignore[reportUnknownVariableType]
-            yield cmd.qualified_name.replace(" ", "__")
+        for name in self._index:
+            yield name.replace(" ", "__")
 
     @override
     def __len__(self) -> int:
-        """Return the number of registered application commands.
+        """Return the number of indexed application commands.
 
         Returns:
-            Count of application commands.
+            Count of application commands, subcommands included.
 
         """
-        return len(self.bot._application_commands)  # pyright: ignore[reportUnknownArgumentType, reportPrivateUsage]  # noqa: SLF001
+        return len(self._index)
 
 
 class EmojiMapping(Mapping[str, str]):
     def __init__(self, bot: "custom.Bot") -> None:
         """Initialize a mapping for application emoji placeholders.
 
+        The mapping is empty until :meth:`rebuild` is called.
+
         Args:
             bot: Bot instance used to resolve application emojis.
 
         """
         self.bot: custom.Bot = bot
-        self._cache: TTLCache[str, str] = TTLCache(maxsize=32, ttl=timedelta(hours=1).seconds)
+        self._index: dict[str, str] = {}
+
+    def rebuild(self) -> None:
+        """Index the application emojis by name. Must be called again whenever they change."""
+        index: dict[str, str] = {}
+        for emoji in self.bot.app_emojis:
+            index.setdefault(emoji.name, emoji.mention)
+        self._index = index
 
     @override
     def __getitem__(self, key: str) -> str:
@@ -99,15 +115,7 @@ class EmojiMapping(Mapping[str, str]):
             KeyError: If no emoji with the given name exists.
 
         """
-        if key in self._cache:
-            return self._cache[key]
-        try:
-            emoji = next(emoji for emoji in self.bot.app_emojis if emoji.name == key).mention
-            self._cache[key] = emoji
-        except StopIteration as e:
-            raise KeyError(key) from e
-        else:
-            return emoji
+        return self._index[key]
 
     @override
     def __iter__(self) -> Iterator[str]:
@@ -117,8 +125,7 @@ class EmojiMapping(Mapping[str, str]):
             An iterator of application emoji names.
 
         """
-        for emoji in self.bot.app_emojis:
-            yield emoji.name
+        return iter(self._index)
 
     @override
     def __len__(self) -> int:
@@ -128,7 +135,7 @@ class EmojiMapping(Mapping[str, str]):
             Count of application emojis.
 
         """
-        return len(self.bot.app_emojis)
+        return len(self._index)
 
 
 class TranslationCog(discord.Cog):
@@ -140,13 +147,27 @@ class TranslationCog(discord.Cog):
 
         """
         self.bot: custom.Bot = bot
+        self.command_mapping: AppCommandMapping = AppCommandMapping(bot)
+        self.emoji_mapping: EmojiMapping = EmojiMapping(bot)
         if config.bot.rest.enabled:
             self.bot.add_listener(self.on_ready, "on_connect")
         else:
             self.bot.add_listener(self.on_ready, "on_ready")
+        self.bot.add_listener(self.on_application_commands_sync, "on_application_commands_sync")
+        self.bot.add_listener(self.on_app_emojis_update, "on_app_emojis_update")
 
     async def on_ready(self) -> None:
         """Populate global translation mappings when the bot becomes ready."""
-        add_global_kv("commands", AppCommandMapping(self.bot))
-        add_global_kv("emojis", EmojiMapping(self.bot))
+        self.command_mapping.rebuild()
+        self.emoji_mapping.rebuild()
+        add_global_kv("commands", self.command_mapping)
+        add_global_kv("emojis", self.emoji_mapping)
         logger.success("Loaded translation cog")
+
+    async def on_application_commands_sync(self) -> None:
+        """Reindex the commands once synced, when their ids are known."""
+        self.command_mapping.rebuild()
+
+    async def on_app_emojis_update(self) -> None:
+        """Reindex the application emojis after they changed."""
+        self.emoji_mapping.rebuild()
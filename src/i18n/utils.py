@@ -4,15 +4,16 @@
 from typing import TYPE_CHECKING
 
 import discord
-import yaml
 from discord.ext import commands as prefixed
 
 from src.log import logger as main_logger
 
+from .cache import load_yaml
 from .classes import (
     Deg1CommandTranslation,
     Deg2CommandTranslation,
     ExtensionTranslation,
+    TranslationStrings,
 )
 from .cog import TranslationCog
 
@@ -124,27 +125,27 @@ def localize_commands[  # noqa: PLR0912
                     err += 1
                     continue
                 if translation.name:
-                    name = remove_none(translation.name.model_dump(by_alias=True))
+                    name = translation.name.localizations()
                     command.name = name.get(default_locale, command.name)
                     if not isinstance(command, prefixed.Command):
                         command.name_localizations = name
                 if translation.description:
-                    description = remove_none(translation.description.model_dump(by_alias=True))
+                    description = translation.description.localizations()
                     command.description = description.get(default_locale, command.description)
                     if not isinstance(command, prefixed.Command):
                         command.description_localizations = description  # pyright: ignore [reportAttributeAccessIssue]
                 if translation.strings:
-                    command.translations = translation.strings  # pyright: ignore[reportAttributeAccessIssue]
+                    command.translations = TranslationStrings(translation.strings)  # pyright: ignore[reportAttributeAccessIssue]
                 if isinstance(command, discord.SlashCommand) and translation.options:
                     for option in command.options:
                         if option.name in translation.options:
                             opt = translation.options[option.name]
                             if opt.name:
-                                name = remove_none(opt.name.model_dump(by_alias=True))
+                                name = opt.name.localizations()
                                 option.name = name.get(default_locale, option.name)
                                 option.name_localizations = name
                             if opt.description:
-                                description = remove_none(opt.description.model_dump(by_alias=True))
+                                description = opt.description.localizations()
                                 option.description = description.get(default_locale, option.description)
                                 option.description_localizations = description
                         else:
@@ -163,7 +164,7 @@ def localize_commands[  # noqa: PLR0912
 
 
 def load_translation(path: str) -> ExtensionTranslation:
-    """Load a translation from a file.
+    """Load a translation from a file, through its compiled cache.
 
     Args:
     ----
@@ -178,9 +179,7 @@ def load_translation(path: str) -> ExtensionTranslation:
         yaml.YAMLError: If the file is not a valid YAML file.
 
     """
-    with open(path, encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-    return ExtensionTranslation(**data)
+    return ExtensionTranslation(**load_yaml(path))
 
 
 def apply(
@@ -53,12 +53,13 @@ async def run_bot_and_backend(
         logger.debug("", exc_info=e)
 
 
-async def start(run_bot: bool | None = None, run_backend: bool | None = None) -> None:
+async def start(run_bot: bool | None = None, run_backend: bool | None = None, *, run_migrations: bool = True) -> None:
     """Start the bot and/or backend server based on configuration.
 
     Args:
         run_bot: Whether to start the bot (defaults to config.use.bot)
         run_backend: Whether to start the backend server (defaults to config.use.backend)
+        run_migrations: Whether to apply pending database migrations before starting
 
     """
     if not config.bot.token:
@@ -69,7 +70,7 @@ async def start(run_bot: bool | None = None, run_backend: bool | None = None) ->
         from src.database.config import init as init_db  # noqa: PLC0415
 
         logger.info("Initializing database...")
-        await init_db()
+        await init_db(run_migrations=run_migrations)
 
     unzip_extensions()
 
@@ -4,7 +4,7 @@
 """Backend server initialization and startup logic."""
 
 import asyncio
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import discord
 import uvicorn
@@ -29,7 +29,16 @@ def create_backend_app() -> FastAPI:
         A configured FastAPI application instance
 
     """
-    return FastAPI(title="Botkit Backend")
+    app = FastAPI(title="Botkit Backend")
+    if config.db.enabled and config.db.instrumentation.enabled:
+        from src.database.instrumentation import metrics  # noqa: PLC0415
+
+        @app.get("/metrics/database")
+        async def database_metrics() -> list[dict[str, Any]]:  # pyright: ignore[reportUnusedFunction]
+            """Query latency and row count statistics, per model and operation."""
+            return metrics.snapshot()
+
+    return app
 
 
 def create_backend_bot() -> "custom.Bot":
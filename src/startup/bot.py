@@ -38,6 +38,8 @@ def create_bot(config: BotConfig) -> custom.Bot:
         command_prefix=(str(config.prefix) or commands.when_mentioned),
         cache_type=config.cache.type,
         cache_config=config.cache.redis,
+        lru_config=config.cache.lru,
+        tiered_config=config.cache.tiered,
         cache_app_emojis=config.cache_app_emojis,
     )
 
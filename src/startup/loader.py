@@ -78,6 +78,9 @@ def load_extensions() -> tuple[
     startup_functions: StartupFunctionList = []
     translations: list[ExtensionTranslation] = []
 
+    # Before any extension is imported, since some load their translations at import time
+    i18n.set_active_locales(config.bot.locales)
+
     for _extension in iglob("src/extensions/*"):
         extension_path = Path(_extension)
         name = extension_path.name
@@ -1,19 +1,24 @@
 # SPDX-License-Identifier: MIT
 # Copyright: 2024-2026 NiceBots.xyz
 import time
+import uuid
 from collections.abc import Awaitable, Callable, Coroutine
 from enum import Enum
 from functools import wraps
 from inspect import isawaitable
-from typing import Concatenate, Never, cast
+from typing import Concatenate, Literal, Never, Protocol, cast, final, override
+from weakref import WeakKeyDictionary
 
+import aiocache
 import discord
 from discord.ext import commands
 
 from src import custom
+from src.cache import LRUShard, TieredCache
 
 type ReactiveCooldownSetting[T] = T | Callable[[custom.Bot, custom.Context], T | Coroutine[Never, None, T]]
 type CogCommandFunction[T: commands.Cog, **P] = Callable[Concatenate[T, P], Awaitable[None]]
+type CooldownAlgorithm = Literal["sliding_window", "gcra"]
 
 
 class BucketType(Enum):
@@ -26,6 +31,11 @@ class BucketType(Enum):
     ROLE = "role"  # Per-role cooldown (uses highest role)
 
 
+def is_reactive_setting(value: object) -> bool:
+    """Whether a cooldown setting is a callable to resolve on each invocation rather than a static value."""
+    return callable(value) and not isinstance(value, type)
+
+
 async def parse_reactive_setting[T](value: ReactiveCooldownSetting[T], bot: custom.Bot, ctx: custom.Context) -> T:
     if isinstance(value, type):
         return value  # pyright: ignore [reportReturnType]
@@ -68,6 +78,289 @@ def get_bucket_key(ctx: custom.Context, base_key: str, bucket_type: BucketType)
             return base_key
 
 
+class CooldownBackend(Protocol):
+    async def hit(self, key: str, *, limit: int, per: int, strong: bool) -> float | None:
+        """Record an invocation against a bucket.
+
+        Returns:
+            The number of seconds until the bucket frees up if the invocation is refused, ``None`` otherwise.
+
+        """
+        ...
+
+
+@final
+class CacheCooldownBackend(CooldownBackend):
+    """Sliding-window cooldown stored as a tuple of timestamps in any aiocache backend."""
+
+    def __init__(self, cache: aiocache.BaseCache) -> None:
+        self.cache = cache
+
+    @override
+    async def hit(self, key: str, *, limit: int, per: int, strong: bool) -> float | None:
+        now = time.time()
+        time_stamps = cast("tuple[float, ...]", await self.cache.get(key, default=(), namespace="cooldown"))
+        time_stamps = tuple(filter(lambda x: x > now - per, time_stamps))
+        time_stamps = time_stamps[-limit:]
+
+        if len(time_stamps) < limit or strong:
+            time_stamps = (*time_stamps, now)
+            await self.cache.set(key, time_stamps, namespace="cooldown", ttl=per)
+            limit += 1  # to account for the current command
+
+        if len(time_stamps) >= limit:
+            return min(time_stamps) - now + per
+        return None
+
+
+# KEYS[1]: sorted set of invocation timestamps
+# ARGV: limit, per, strong (0/1), unique member for this invocation
+SLIDING_WINDOW_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local limit = tonumber(ARGV[1])
+local per = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - per)
+redis.call('ZREMRANGEBYRANK', KEYS[1], 0, -(limit + 1))
+local count = redis.call('ZCARD', KEYS[1])
+if count < limit or ARGV[3] == '1' then
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], math.ceil(per * 1000))
+end
+if count < limit then
+    return false
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return tostring(tonumber(oldest[2]) - now + per)
+"""
+
+
+@final
+class RedisCooldownBackend(CooldownBackend):
+    """Sliding-window cooldown evaluated atomically by Redis over a sorted set.
+
+    The whole check-and-record runs in a single Lua script, so concurrent invocations from several
+    shards or replicas cannot both slip through, and each check costs one round trip. Timestamps come
+    from the Redis server clock so replicas with skewed clocks still agree on the window.
+    """
+
+    NAMESPACE = "cooldown:window"
+
+    def __init__(self, cache: aiocache.RedisCache) -> None:
+        self.cache = cache
+        self.script = cache.client.register_script(SLIDING_WINDOW_SCRIPT)
+
+    @override
+    async def hit(self, key: str, *, limit: int, per: int, strong: bool) -> float | None:
+        result = cast(
+            "bytes | None",
+            await self.script(
+                keys=[self.cache.build_key(key, namespace=self.NAMESPACE)],
+                args=[limit, per, int(strong), uuid.uuid4().hex],
+            ),
+        )
+        return None if result is None else float(result)
+
+
+@final
+class CacheGCRACooldownBackend(CooldownBackend):
+    """Generic cell rate algorithm cooldown storing a single theoretical arrival time per bucket.
+
+    Invocations are spaced by ``per / limit`` seconds with a burst tolerance of ``limit`` invocations,
+    so memory and time per check are constant whatever the limit.
+    """
+
+    NAMESPACE = "cooldown:gcra"
+
+    def __init__(self, cache: aiocache.BaseCache) -> None:
+        self.cache = cache
+
+    @override
+    async def hit(self, key: str, *, limit: int, per: int, strong: bool) -> float | None:
+        now = time.time()
+        interval = per / limit
+        tat = max(cast("float", await self.cache.get(key, default=now, namespace=self.NAMESPACE)), now)
+
+        if tat + interval - now <= per:
+            tat += interval
+            await self.cache.set(key, tat, namespace=self.NAMESPACE, ttl=tat - now)
+            return None
+
+        if strong:
+            # Refused invocations still count, but never lock the bucket for more than a full period
+            tat = min(tat + interval, now + 2 * per - interval)
+            await self.cache.set(key, tat, namespace=self.NAMESPACE, ttl=tat - now)
+        return tat + interval - now - per
+
+
+# KEYS[1]: theoretical arrival time of the next invocation
+# ARGV: limit, per, strong (0/1)
+GCRA_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local per = tonumber(ARGV[2])
+local interval = per / tonumber(ARGV[1])
+local tat = math.max(tonumber(redis.call('GET', KEYS[1])) or now, now)
+if tat + interval - now <= per then
+    tat = tat + interval
+    redis.call('SET', KEYS[1], tostring(tat), 'PX', math.ceil((tat - now) * 1000))
+    return false
+end
+if ARGV[3] == '1' then
+    tat = math.min(tat + interval, now + 2 * per - interval)
+    redis.call('SET', KEYS[1], tostring(tat), 'PX', math.ceil((tat - now) * 1000))
+end
+return tostring(tat + interval - now - per)
+"""
+
+
+@final
+class RedisGCRACooldownBackend(CooldownBackend):
+    """Generic cell rate algorithm cooldown evaluated atomically by Redis on a single string key."""
+
+    NAMESPACE = "cooldown:gcra"
+
+    def __init__(self, cache: aiocache.RedisCache) -> None:
+        self.cache = cache
+        self.script = cache.client.register_script(GCRA_SCRIPT)
+
+    @override
+    async def hit(self, key: str, *, limit: int, per: int, strong: bool) -> float | None:
+        result = cast(
+            "bytes | None",
+            await self.script(
+                keys=[self.cache.build_key(key, namespace=self.NAMESPACE)],
+                args=[limit, per, int(strong)],
+            ),
+        )
+        return None if result is None else float(result)
+
+
+@final
+class NearCooldownBackend(CooldownBackend):
+    """Replays refusals locally so spammed buckets are answered without a round trip.
+
+    Other processes can only add uses to a bucket, never remove them, so a bucket refused for a
+    non-strong cooldown stays refused until its retry delay has elapsed. Strong cooldowns record refused
+    invocations and always reach the wrapped backend.
+    """
+
+    def __init__(self, backend: CooldownBackend, max_entries: int = 10_000) -> None:
+        self.backend = backend
+        self.refusals = LRUShard(max_entries=max_entries)
+
+    @override
+    async def hit(self, key: str, *, limit: int, per: int, strong: bool) -> float | None:
+        now = time.monotonic()
+        if not strong and (blocked_until := self.refusals.get(key, now)) is not None:
+            return blocked_until - now
+        retry_after = await self.backend.hit(key, limit=limit, per=per, strong=strong)
+        if retry_after is not None and not strong:
+            self.refusals.set(key, now + retry_after, now + retry_after, now)
+        return retry_after
+
+
+_backends: WeakKeyDictionary[aiocache.BaseCache, dict[CooldownAlgorithm, CooldownBackend]] = WeakKeyDictionary()
+
+
+def _create_cooldown_backend(cache: aiocache.BaseCache, algorithm: CooldownAlgorithm) -> CooldownBackend:
+    if isinstance(cache, TieredCache):
+        return NearCooldownBackend(_create_cooldown_backend(cache.l2, algorithm))
+    match algorithm:
+        case "gcra":
+            if isinstance(cache, aiocache.RedisCache):
+                return RedisGCRACooldownBackend(cache)
+            return CacheGCRACooldownBackend(cache)
+        case "sliding_window":
+            if isinstance(cache, aiocache.RedisCache):
+                return RedisCooldownBackend(cache)
+            return CacheCooldownBackend(cache)
+
+
+def get_cooldown_backend(cache: aiocache.BaseCache, algorithm: CooldownAlgorithm = "sliding_window") -> CooldownBackend:
+    """Get the cooldown backend best suited to the given cache and algorithm, creating it on first use."""
+    backends = _backends.setdefault(cache, {})
+    if (backend := backends.get(algorithm)) is None:
+        backend = backends[algorithm] = _create_cooldown_backend(cache, algorithm)
+    return backend
+
+
+@final
+class CooldownSettings:
+    """Cooldown settings resolved for one invocation."""
+
+    def __init__(
+        self,
+        *,
+        key: str,
+        limit: int,
+        per: int,
+        bucket_type: BucketType,
+        strong: bool,
+        cls: type[CooldownExceeded],
+    ) -> None:
+        self.key = key
+        self.limit = limit
+        self.per = per
+        self.bucket_type = bucket_type
+        self.strong = strong
+        self.cls = cls
+
+
+@final
+class CooldownSpec:
+    """Cooldown settings of a command, compiled once when the command is decorated.
+
+    Static settings are bound as-is. When none of the settings is reactive, :attr:`static` holds the
+    resolved settings and invocations skip resolution entirely. Otherwise only the callables are
+    called on each invocation.
+    """
+
+    def __init__(
+        self,
+        *,
+        key: ReactiveCooldownSetting[str],
+        limit: ReactiveCooldownSetting[int],
+        per: ReactiveCooldownSetting[int],
+        bucket_type: ReactiveCooldownSetting[BucketType],
+        strong: ReactiveCooldownSetting[bool],
+        cls: ReactiveCooldownSetting[type[CooldownExceeded]],
+        algorithm: CooldownAlgorithm,
+    ) -> None:
+        self.settings: dict[str, object] = {
+            "key": key,
+            "limit": limit,
+            "per": per,
+            "bucket_type": bucket_type,
+            "strong": strong,
+            "cls": cls,
+        }
+        self.reactive: dict[str, Callable[[custom.Bot, custom.Context], object]] = {
+            name: value  # pyright: ignore[reportAssignmentType]
+            for name, value in self.settings.items()
+            if is_reactive_setting(value)
+        }
+        self.static: CooldownSettings | None = None if self.reactive else CooldownSettings(**self.settings)  # pyright: ignore[reportArgumentType]
+        self.algorithm: CooldownAlgorithm = algorithm
+        self._cache: aiocache.BaseCache | None = None
+        self._backend: CooldownBackend | None = None
+
+    async def resolve(self, bot: custom.Bot, ctx: custom.Context) -> CooldownSettings:
+        if self.static is not None:
+            return self.static
+        values = dict(self.settings)
+        for name, setting in self.reactive.items():
+            value = setting(bot, ctx)
+            values[name] = await value if isawaitable(value) else value
+        return CooldownSettings(**values)  # pyright: ignore[reportArgumentType]
+
+    def get_backend(self, cache: aiocache.BaseCache) -> CooldownBackend:
+        if self._backend is None or cache is not self._cache:
+            self._backend = get_cooldown_backend(cache, self.algorithm)
+            self._cache = cache
+        return self._backend
+
+
 def cooldown[C: commands.Cog, **P](
     key: ReactiveCooldownSetting[str],
     *,
@@ -76,6 +369,7 @@ def cooldown[C: commands.Cog, **P](
     bucket_type: ReactiveCooldownSetting[BucketType] = BucketType.DEFAULT,
     strong: ReactiveCooldownSetting[bool] = False,
     cls: ReactiveCooldownSetting[type[CooldownExceeded]] = CooldownExceeded,
+    algorithm: CooldownAlgorithm = "sliding_window",
 ) -> Callable[[CogCommandFunction[C, P]], CogCommandFunction[C, P]]:
     """Enhanced cooldown decorator that supports different bucket types.
 
@@ -86,36 +380,31 @@ def cooldown[C: commands.Cog, **P](
         bucket_type: Type of bucket to use for the cooldown
         strong: If True, adds current timestamp even if limit is reached
         cls: Custom exception class to raise
+        algorithm: ``"sliding_window"`` keeps the timestamp of every use in the period, ``"gcra"`` keeps a
+            single timestamp per bucket and spaces uses evenly, allowing bursts of up to ``limit`` uses
+
+    Settings may be static values or callables taking the bot and context (optionally async). Static
+    settings are resolved once here, only callables are evaluated on each invocation.
 
     """
+    spec = CooldownSpec(
+        key=key, limit=limit, per=per, bucket_type=bucket_type, strong=strong, cls=cls, algorithm=algorithm
+    )
 
     def inner(func: CogCommandFunction[C, P]) -> CogCommandFunction[C, P]:
         @wraps(func)
         async def wrapper(self: C, *args: P.args, **kwargs: P.kwargs) -> None:
             ctx: custom.Context = args[0]  # pyright: ignore [reportAssignmentType]
-            cache = ctx.bot.botkit_cache
-            key_value: str = await parse_reactive_setting(key, ctx.bot, ctx)
-            limit_value: int = await parse_reactive_setting(limit, ctx.bot, ctx)
-            per_value: int = await parse_reactive_setting(per, ctx.bot, ctx)
-            strong_value: bool = await parse_reactive_setting(strong, ctx.bot, ctx)
-            cls_value: type[CooldownExceeded] = await parse_reactive_setting(cls, ctx.bot, ctx)
-            bucket_type_value: BucketType = await parse_reactive_setting(bucket_type, ctx.bot, ctx)
+            settings = spec.static or await spec.resolve(ctx.bot, ctx)
 
             # Generate the full cooldown key based on bucket type
-            full_key = get_bucket_key(ctx, key_value, bucket_type_value)
-
-            now = time.time()
-            time_stamps = cast("tuple[float, ...]", await cache.get(full_key, default=(), namespace="cooldown"))
-            time_stamps = tuple(filter(lambda x: x > now - per_value, time_stamps))
-            time_stamps = time_stamps[-limit_value:]
-
-            if len(time_stamps) < limit_value or strong_value:
-                time_stamps = (*time_stamps, now)
-                await cache.set(full_key, time_stamps, namespace="cooldown", ttl=per_value)
-                limit_value += 1  # to account for the current command
+            full_key = get_bucket_key(ctx, settings.key, settings.bucket_type)
 
-            if len(time_stamps) >= limit_value:
-                raise cls_value(min(time_stamps) - now + per_value, bucket_type_value)
+            retry_after = await spec.get_backend(ctx.bot.botkit_cache).hit(
+                full_key, limit=settings.limit, per=settings.per, strong=settings.strong
+            )
+            if retry_after is not None:
+                raise settings.cls(retry_after, settings.bucket_type)
 
             await func(self, *args, **kwargs)
 
@@ -0,0 +1,7 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+import os
+
+# Importing most of ``src`` validates the bot config, which requires a token.
+os.environ.setdefault("BOTKIT__BOT__TOKEN", "test-token")
@@ -0,0 +1,237 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 Communauté Les Frères Poulain, NiceBots.xyz
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from src.database.models import AfkDeadline, AfkDeadlineKind, Dormeur
+from src.extensions.afk_notification.config import AfkNotifConfig
+from src.extensions.afk_notification.main import AfkNotif
+from tests.utils import count_queries, sqlite_database
+
+ROLE_ID = 10
+REMINDER_EVERY = 60
+REMINDER_TIMEOUT = 30
+
+
+class FakeMessage:
+    def __init__(self, message_id: int) -> None:
+        self.id = message_id
+        self.edits: list[Any] = []
+        self.delete_delays: list[float] = []
+
+    async def edit(self, *, view: Any) -> None:
+        self.edits.append(view)
+
+    async def delete(self, *, delay: float) -> None:
+        self.delete_delays.append(delay)
+
+
+class FakeBot:
+    def __init__(self, members: list[Any]) -> None:
+        self.guild = SimpleNamespace(get_member={member.id: member for member in members}.get)
+        self.views: dict[int, Any] = {}
+        self.messages: dict[int, FakeMessage] = {}
+
+    def get_guild(self, _guild_id: int) -> Any:
+        return self.guild
+
+    def add_view(self, view: Any, *, message_id: int) -> None:
+        self.views[message_id] = view
+
+    def get_partial_messageable(self, _channel_id: int) -> Any:
+        return SimpleNamespace(
+            get_partial_message=lambda message_id: self.messages.setdefault(message_id, FakeMessage(message_id))
+        )
+
+
+async def noop() -> None:
+    pass
+
+
+def make_cog(bot: Any = None) -> AfkNotif:
+    config = AfkNotifConfig(
+        start_time="00:00",
+        stop_time="23:59",
+        afk_reminder_every=REMINDER_EVERY,
+        afk_reminder_timeout=REMINDER_TIMEOUT,
+        guild_id=1,
+        logs_channel_id=2,
+        role_id=ROLE_ID,
+    )
+    return AfkNotif(bot or SimpleNamespace(), config)  # pyright: ignore[reportArgumentType]
+
+
+def make_member(member_id: int, *, role: bool = True, voice: bool = False) -> Any:
+    return SimpleNamespace(
+        id=member_id,
+        bot=False,
+        mention=f"<@{member_id}>",
+        roles=[SimpleNamespace(id=ROLE_ID)] if role else [],
+        voice=SimpleNamespace(channel=SimpleNamespace(id=50)) if voice else None,
+    )
+
+
+def test_dormeur_refresh_picks_up_changes() -> None:
+    """Test that the refresh picks up added and removed dormeurs and that other members are not registered."""
+
+    async def run() -> None:
+        async with sqlite_database():
+            cog = make_cog()
+            await Dormeur.create(discord_id=1)
+            await Dormeur.create(discord_id=3)
+            await cog.load_dormeurs()
+            assert cog.dormeur_ids == {1, 3}
+
+            for member in (make_member(1), make_member(2), make_member(3, role=False)):
+                await cog.register_new_member(member)
+            assert [key for key, _ in cog.scheduler.items()] == [(AfkDeadlineKind.REMINDER, 1)]
+
+            # Changed by another process, only seen by the next refresh
+            await Dormeur.filter(discord_id=1).delete()
+            await Dormeur.create(discord_id=2)
+            await cog.register_new_member(make_member(2))
+            assert (AfkDeadlineKind.REMINDER, 2) not in cog.scheduler
+
+            await cog.load_dormeurs()
+            assert cog.dormeur_ids == {2, 3}
+            assert (AfkDeadlineKind.REMINDER, 1) not in cog.scheduler
+            await cog.register_new_member(make_member(1))
+            await cog.register_new_member(make_member(2))
+            assert [key for key, _ in cog.scheduler.items()] == [(AfkDeadlineKind.REMINDER, 2)]
+
+    asyncio.run(run())
+
+
+def test_dormeur_refresh_loop_skips_first_iteration() -> None:
+    """Test that the refresh loop does not query the dormeurs again right after ``on_ready`` loaded them."""
+
+    async def run() -> None:
+        async with sqlite_database():
+            cog = make_cog()
+            await Dormeur.create(discord_id=1)
+            with count_queries() as queries:
+                cog.refresh_loop.start()
+                for _ in range(5):
+                    await asyncio.sleep(0)
+                cog.refresh_loop.cancel()
+            assert len(queries) == 0
+            assert cog.dormeur_ids == set()
+
+    asyncio.run(run())
+
+
+async def persisted_rows() -> dict[tuple[AfkDeadlineKind, int], tuple[int, int | None, datetime]]:
+    return {(row.kind, row.key): (row.member_id, row.channel_id, row.deadline) for row in await AfkDeadline.all()}
+
+
+def test_persist_schedule_writes_changes_only() -> None:
+    """Test that the schedule is written once, and only rewritten when a deadline really changes."""
+
+    async def run() -> None:
+        async with sqlite_database():
+            cog = make_cog()
+            reminder, disconnect = (AfkDeadlineKind.REMINDER, 1), (AfkDeadlineKind.DISCONNECT, 100)
+            cog.scheduler.schedule(reminder, REMINDER_EVERY, noop)
+            cog.scheduler.schedule(disconnect, REMINDER_TIMEOUT, noop)
+            cog.disconnects[100] = (2, 50)
+            await cog.persist_schedule()
+            rows = await persisted_rows()
+            assert {key: value[:2] for key, value in rows.items()} == {reminder: (1, None), disconnect: (2, 50)}
+            assert cog.persisted == rows
+
+            # The next reminder is a period later, the written one still gives the cadence
+            cog.scheduler.schedule(reminder, 2 * REMINDER_EVERY, noop)
+            with count_queries() as queries:
+                await cog.persist_schedule()
+            assert len(queries) == 0
+
+            # Rejoined voice off cadence and answered the reminder
+            cog.scheduler.schedule(reminder, REMINDER_EVERY / 2, noop)
+            cog.scheduler.cancel(disconnect)
+            await cog.persist_schedule()
+            rows = await persisted_rows()
+            assert list(rows) == [reminder]
+            assert rows[reminder][2] - datetime.now(tz=UTC) < timedelta(seconds=REMINDER_EVERY / 2)
+            assert cog.disconnects == {}
+
+    asyncio.run(run())
+
+
+def test_persist_schedule_is_atomic(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a failed write keeps the rows written before and retries on the next call."""
+
+    async def run() -> None:
+        async with sqlite_database():
+            cog = make_cog()
+            cog.scheduler.schedule((AfkDeadlineKind.REMINDER, 1), REMINDER_EVERY, noop)
+            await cog.persist_schedule()
+            written = await persisted_rows()
+
+            async def fail(*_args: Any, **_kwargs: Any) -> None:
+                raise RuntimeError
+
+            cog.scheduler.schedule((AfkDeadlineKind.REMINDER, 1), REMINDER_EVERY / 2, noop)
+            with monkeypatch.context() as patch:
+                patch.setattr(AfkDeadline, "bulk_create", fail)
+                await cog.persist_schedule()
+            assert await persisted_rows() == written
+            assert cog.persisted == written
+
+            await cog.persist_schedule()
+            assert await persisted_rows() != written
+
+    asyncio.run(run())
+
+
+def test_restore_schedule() -> None:
+    """Test that persisted deadlines are scheduled again and restored reminders behave like fresh ones."""
+
+    async def run() -> None:
+        reminded, waiting, left = make_member(1, voice=True), make_member(2, voice=True), make_member(3)
+        bot = FakeBot([reminded, waiting, left])
+        now = datetime.now(tz=UTC)
+        async with sqlite_database():
+            for kind, key, member, channel_id, delay in (
+                (AfkDeadlineKind.REMINDER, 1, reminded, None, -1.5 * REMINDER_EVERY),
+                (AfkDeadlineKind.DISCONNECT, 100, waiting, 50, 10),
+                (AfkDeadlineKind.DISCONNECT, 101, left, 50, -2 * REMINDER_TIMEOUT),
+            ):
+                await AfkDeadline.create(
+                    kind=kind,
+                    key=key,
+                    member_id=member.id,
+                    channel_id=channel_id,
+                    deadline=now + timedelta(seconds=delay),
+                )
+            cog = make_cog(bot)
+            cog.dormeur_ids = {1}
+            await cog.restore_schedule()
+            loop_now = asyncio.get_running_loop().time()
+
+            assert len(cog.persisted) == 3
+            assert cog.scheduler.when((AfkDeadlineKind.REMINDER, 1)) - loop_now == pytest.approx(
+                REMINDER_EVERY / 2, abs=1
+            )
+            assert cog.scheduler.when((AfkDeadlineKind.DISCONNECT, 100)) - loop_now == pytest.approx(10, abs=1)
+            assert (AfkDeadlineKind.DISCONNECT, 101) not in cog.scheduler
+            assert list(bot.views) == [100]
+            assert bot.messages[100].delete_delays == [pytest.approx(10 + REMINDER_TIMEOUT, abs=1)]
+            assert bot.messages[101].delete_delays == [0]
+
+            # Only the row of the member who left changed
+            await cog.persist_schedule()
+            assert set(await persisted_rows()) == {(AfkDeadlineKind.REMINDER, 1), (AfkDeadlineKind.DISCONNECT, 100)}
+
+            view = bot.views[100]
+            waiting.voice = None
+            await view.disconnect_member()
+            assert bot.messages[100].edits == [view]
+            assert view.is_finished()
+            assert view.get_item("afk_notification:awake:2").disabled
+
+    asyncio.run(run())
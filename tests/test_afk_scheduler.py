@@ -0,0 +1,78 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 Communauté Les Frères Poulain, NiceBots.xyz
+
+import asyncio
+
+from src.extensions.afk_notification.scheduler import Callback, DeadlineScheduler
+
+
+def recorder(fired: list[str], key: str) -> Callback:
+    async def callback() -> None:
+        fired.append(key)
+
+    return callback
+
+
+def test_deadlines_fire_in_order() -> None:
+    """Test that callbacks run in deadline order, whatever the order they were scheduled in."""
+
+    async def run() -> None:
+        scheduler: DeadlineScheduler[str] = DeadlineScheduler()
+        fired: list[str] = []
+        scheduler.start()
+        for key, delay in (("c", 0.06), ("a", 0.02), ("d", 0.08), ("b", 0.04)):
+            scheduler.schedule(key, delay, recorder(fired, key))
+        await asyncio.sleep(0.15)
+        assert fired == ["a", "b", "c", "d"]
+        assert len(scheduler) == 0
+        scheduler.stop()
+
+    asyncio.run(run())
+
+
+def test_rescheduling_replaces_deadline() -> None:
+    """Test that scheduling a key again moves its deadline earlier or later and runs it once."""
+
+    async def run() -> None:
+        scheduler: DeadlineScheduler[str] = DeadlineScheduler()
+        fired: list[str] = []
+        scheduler.start()
+        scheduler.schedule("later", 0.02, recorder(fired, "later"))
+        scheduler.schedule("earlier", 10, recorder(fired, "earlier"))
+        scheduler.schedule("other", 0.05, recorder(fired, "other"))
+        scheduler.schedule("later", 0.08, recorder(fired, "later"))
+        scheduler.schedule("earlier", 0.01, recorder(fired, "earlier"))
+        assert len(scheduler) == 3
+
+        await asyncio.sleep(0.03)
+        assert fired == ["earlier"]
+        await asyncio.sleep(0.1)
+        assert fired == ["earlier", "other", "later"]
+        scheduler.stop()
+
+    asyncio.run(run())
+
+
+def test_cancelled_deadlines_do_not_fire() -> None:
+    """Test that a cancelled deadline does not run and that items() only lists the pending keys."""
+
+    async def run() -> None:
+        scheduler: DeadlineScheduler[int] = DeadlineScheduler()
+        fired: list[str] = []
+        scheduler.start()
+        for key in range(200):
+            scheduler.schedule(key, 0.02 + key / 10000, recorder(fired, str(key)))
+        for key in range(0, 200, 2):
+            assert scheduler.cancel(key)
+        assert not scheduler.cancel(0)
+        assert 0 not in scheduler
+        assert scheduler.when(0) is None
+        assert sorted(key for key, _ in scheduler.items()) == list(range(1, 200, 2))
+        assert all(scheduler.when(key) == when for key, when in scheduler.items())
+
+        await asyncio.sleep(0.08)
+        assert fired == [str(key) for key in range(1, 200, 2)]
+        assert scheduler.items() == []
+        scheduler.stop()
+
+    asyncio.run(run())
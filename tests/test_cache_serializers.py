@@ -0,0 +1,31 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+from aiocache.serializers import JsonSerializer
+
+from src.cache import OrjsonSerializer, create_serializer
+from src.config.models import RedisConfig
+
+
+def test_orjson_serializer_round_trips_types() -> None:
+    """Test that tuples, floats and nested containers keep their types."""
+    serializer = OrjsonSerializer()
+    value = {"stamps": (1.0, 2.5), "nested": [(1, "a"), {"x": ()}], "count": 3, "none": None}
+    encoded = serializer.dumps(value)
+    assert isinstance(encoded, bytes)
+    decoded = serializer.loads(encoded)
+    assert decoded == value
+    assert isinstance(decoded["stamps"], tuple)
+    assert isinstance(decoded["stamps"][0], float)
+    assert isinstance(decoded["nested"][0], tuple)
+    assert decoded["nested"][1]["x"] == ()
+    assert serializer.loads(None) is None
+
+
+def test_redis_config_serializer_defaults() -> None:
+    """Test that Redis caches keep aiocache's JSON serializer unless configured otherwise."""
+    config = RedisConfig(host="localhost", port=6379, db=0, ssl=False)
+    assert config.serializer == "json"
+    assert isinstance(create_serializer(config.serializer), JsonSerializer)
+    assert isinstance(create_serializer("orjson"), OrjsonSerializer)
+    assert create_serializer("pickle").loads(create_serializer("pickle").dumps((1.0,))) == (1.0,)
@@ -0,0 +1,291 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 Communauté Les Frères Poulain, NiceBots.xyz
+
+import asyncio
+import contextlib
+from collections.abc import Collection
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from src.database.models import SLOTS_PER_WEEK_CHANNEL_NOTE, ChannelNote, ChannelNoteEvery
+from src.extensions.channel_note import channel_note
+from src.extensions.channel_note.channel_note import (
+    HISTORY_NOSEND_LIMIT,
+    ChannelNoteCog,
+    ChannelNoteConfigModal,
+    render_note,
+)
+from src.extensions.channel_note.config import ChannelNoteConfig
+from src.i18n.classes import apply_locale
+from src.i18n.utils import load_translation
+from tests.utils import count_queries, sqlite_database
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+BOT_ID = 99
+
+
+def make_cog(bot: Any = None, **config: Any) -> ChannelNoteCog:
+    return ChannelNoteCog(bot or SimpleNamespace(user=SimpleNamespace(id=BOT_ID)), ChannelNoteConfig(**config))
+
+
+class FakeBot:
+    """Bot whose channels exist unless listed in ``missing`` and whose sends fail in the channels listed in ``failing``.
+
+    Each send waits for the event of its channel in ``blocked``, if any.
+    """
+
+    def __init__(self, *, missing: Collection[int] = (), failing: Collection[int] = ()) -> None:
+        self.user = SimpleNamespace(id=BOT_ID)
+        self.allowed_mentions = None
+        self.http = self
+        self.missing, self.failing = missing, failing
+        self.blocked: dict[int, asyncio.Event] = {}
+        self.sending: set[int] = set()
+        self.max_sending = 0
+        self.sent: list[int] = []
+
+    def get_channel(self, channel_id: int) -> Any:
+        return None if channel_id in self.missing else SimpleNamespace(id=channel_id)
+
+    async def send_message(self, channel_id: int, _content: None, **_kwargs: Any) -> dict[str, Any]:
+        self.sending.add(channel_id)
+        self.max_sending = max(self.max_sending, len(self.sending))
+        try:
+            await asyncio.sleep(0.01)
+            if (event := self.blocked.get(channel_id)) is not None:
+                await event.wait()
+            if channel_id in self.failing:
+                raise RuntimeError
+        finally:
+            self.sending.discard(channel_id)
+        self.sent.append(channel_id)
+        return {"id": str(1000 + channel_id)}
+
+
+def make_message(channel_id: int, author_id: int) -> Any:
+    return SimpleNamespace(channel=SimpleNamespace(id=channel_id), author=SimpleNamespace(id=author_id))
+
+
+async def create_note(discord_id: int, **kwargs: Any) -> ChannelNote:
+    return await ChannelNote.create(
+        discord_id=discord_id, content="content", header="header", footer="", every=ChannelNoteEvery.H_1, **kwargs
+    )
+
+
+def test_due_in_matches_slots() -> None:
+    """Test that the notes selected by the database are the enabled ones whose slots intersect the given slots."""
+
+    async def run() -> None:
+        async with sqlite_database():
+            for i, every in enumerate(ChannelNoteEvery):
+                for enabled in (True, False):
+                    await ChannelNote.create(
+                        discord_id=i * 2 + enabled, enabled=enabled, content="c", header="h", footer="", every=every
+                    )
+            notes = await ChannelNote.all()
+
+            for slots in ({0}, {1}, {6}, {12}, {24}, {167, 0}, {5, 6, 7}, set(range(13, 24))):
+                due = await ChannelNote.due_in(slots)
+                expected = {note.id for note in notes if note.enabled and note.slots & slots}
+                assert {note.id for note in due} == expected, slots
+
+            assert all(len(note.slots) == SLOTS_PER_WEEK_CHANNEL_NOTE // note.every.period for note in notes)
+
+    asyncio.run(run())
+
+
+def test_activity_is_tracked_from_messages() -> None:
+    """Test that messages update the activity of channels with a note and that it is persisted in one query."""
+
+    async def run() -> None:
+        async with sqlite_database():
+            await create_note(1, last_message_id=10, messages_since=0)
+            await create_note(2)
+            cog = make_cog()
+            await cog.load_activity()
+            assert set(cog.activity) == {1, 2}
+
+            for _ in range(HISTORY_NOSEND_LIMIT + 2):
+                await cog.on_message(make_message(1, 5))
+            await cog.on_message(make_message(2, 5))
+            await cog.on_message(make_message(3, 5))
+            assert cog.activity[1].messages_since == HISTORY_NOSEND_LIMIT
+            assert cog.activity[2].messages_since is None  # unknown until read from the history
+            assert 3 not in cog.activity
+
+            await cog.on_message(make_message(2, BOT_ID))
+            assert cog.activity[2].messages_since == 0
+            with count_queries() as queries:
+                await cog.persist_activity()
+            assert len(queries) == 1
+            assert not any(activity.dirty for activity in cog.activity.values())
+            rows = await ChannelNote.all().order_by("discord_id").values_list("last_message_id", "messages_since")
+            assert rows == [(10, HISTORY_NOSEND_LIMIT), (None, 0)]
+
+            with count_queries() as queries:
+                await cog.persist_activity()
+            assert len(queries) == 0
+
+    asyncio.run(run())
+
+
+def test_messages_since_falls_back_to_history() -> None:
+    """Test that the channel history is only read while the activity of a channel is unknown."""
+
+    async def run() -> None:
+        async with sqlite_database():
+            note = await create_note(1)
+            cog = make_cog()
+            reads: list[int] = []
+
+            async def flatten() -> list[Any]:
+                reads.append(1)
+                return [make_message(1, author) for author in (5, 6, BOT_ID, 5)]
+
+            channel = SimpleNamespace(history=lambda **_: SimpleNamespace(flatten=flatten))
+            assert await cog.get_messages_since(channel, note) == 2  # pyright: ignore[reportArgumentType]
+            assert cog.activity[1].dirty
+            await cog.on_message(make_message(1, 5))
+            assert await cog.get_messages_since(channel, note) == 3  # pyright: ignore[reportArgumentType]
+            assert len(reads) == 1
+
+            quiet = await create_note(2)
+            channel = SimpleNamespace(history=lambda **_: SimpleNamespace(flatten=lambda: asyncio.sleep(0, [])))
+            assert await cog.get_messages_since(channel, quiet) == HISTORY_NOSEND_LIMIT  # pyright: ignore[reportArgumentType]
+
+    asyncio.run(run())
+
+
+def test_modal_edit_keeps_activity() -> None:
+    """Test that editing a note only saves the edited fields, keeping the activity written in the meantime."""
+
+    async def run() -> None:
+        translations = load_translation("src/extensions/channel_note/translations.yml")
+        strings = apply_locale(translations.commands["channel_note"].strings, "en-US")  # pyright: ignore[reportOptionalSubscript]
+        responses: list[str] = []
+
+        async def respond(content: str, **_kwargs: Any) -> None:
+            responses.append(content)
+
+        async with sqlite_database():
+            note = await create_note(1)
+            modal = ChannelNoteConfigModal(SimpleNamespace(), strings, note=note)  # pyright: ignore[reportArgumentType]
+            await ChannelNote.filter(id=note.id).update(last_message_id=10, messages_since=3)
+
+            modal.content_input.refresh_state({"value": "edited"})
+            modal.header_input.refresh_state({"value": note.header})
+            modal.footer_input.refresh_state({"value": note.footer})
+            modal.every_select.refresh_from_modal(SimpleNamespace(data={}), {"values": [note.every.value]})  # pyright: ignore[reportArgumentType]
+            modal.enabled_checkbox.refresh_state({"value": note.enabled})
+            updated_at = note.updated_at
+            await modal.callback(SimpleNamespace(channel=SimpleNamespace(id=1), respond=respond))  # pyright: ignore[reportArgumentType]
+
+            saved = await ChannelNote.get(id=note.id)
+            assert (saved.content, saved.last_message_id, saved.messages_since) == ("edited", 10, 3)
+            assert saved.updated_at > updated_at
+            assert responses == [strings.note_modified]
+
+    asyncio.run(run())
+
+
+def test_delivery_report_counts_outcomes() -> None:
+    """Test that a tick delivers due notes concurrently and reports sent, skipped and failed notes."""
+
+    async def run() -> None:
+        bot = FakeBot(missing={4}, failing={3})
+        async with sqlite_database():
+            for discord_id in range(1, 5):
+                await create_note(discord_id, messages_since=HISTORY_NOSEND_LIMIT)
+            await create_note(5, messages_since=1)
+            cog = make_cog(bot, delivery_concurrency=2)
+            cog.get_current_slot = lambda: 5
+            cog.last_slot = 4
+            await cog.load_activity()
+            await cog.channel_note_task()
+
+            report = cog.last_report
+            assert report is not None
+            assert report.slots == {5}
+            assert (len(report.latencies), report.skipped, report.failed) == (2, 2, 1)
+            assert sorted(bot.sent) == [1, 2]
+            assert bot.max_sending == 2
+            assert cog.last_slot == 5
+            assert (cog.activity[1].last_message_id, cog.activity[1].messages_since) == (1001, 0)
+            assert cog.activity[3].messages_since == HISTORY_NOSEND_LIMIT
+
+    asyncio.run(run())
+
+
+def test_last_slot_is_set_after_deliveries() -> None:
+    """Test that last_slot only moves once every delivery of the tick is done, so a cancelled tick is run again."""
+
+    async def run() -> None:
+        bot = FakeBot()
+        bot.blocked[2] = asyncio.Event()
+        async with sqlite_database():
+            for discord_id in (1, 2):
+                await create_note(discord_id, messages_since=HISTORY_NOSEND_LIMIT)
+            cog = make_cog(bot)
+            cog.get_current_slot = lambda: 5
+            cog.last_slot = 4
+            await cog.load_activity()
+
+            tick = asyncio.create_task(cog.channel_note_task())
+            while bot.sent != [1]:  # noqa: ASYNC110
+                await asyncio.sleep(0.01)
+            assert cog.last_slot == 4
+            assert cog.last_report is None
+            tick.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await tick
+            assert cog.last_slot == 4
+
+            bot.blocked.clear()
+            await cog.channel_note_task()
+            assert bot.sent == [1, 2]
+            assert cog.last_slot == 5
+            assert cog.last_report is not None
+            assert (len(cog.last_report.latencies), cog.last_report.skipped) == (1, 1)
+
+    asyncio.run(run())
+
+
+def test_rendered_components_are_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that notes are only rendered again once updated, and that deleted notes are forgotten in slot 0."""
+
+    async def run() -> None:
+        renders: list[UUID] = []
+
+        def render(note: ChannelNote) -> list[dict[str, Any]]:
+            renders.append(note.id)
+            return render_note(note)
+
+        monkeypatch.setattr(channel_note, "render_note", render)
+        bot = FakeBot()
+        async with sqlite_database():
+            note = await create_note(1, messages_since=HISTORY_NOSEND_LIMIT)
+            deleted = await create_note(2, messages_since=HISTORY_NOSEND_LIMIT)
+            cog = make_cog(bot)
+            components = cog.get_components(note)
+            assert cog.get_components(await ChannelNote.get(id=note.id)) is components
+            assert renders == [note.id]
+
+            note.content = "edited"
+            await note.save(update_fields=["content", "updated_at"])
+            edited = cog.get_components(await ChannelNote.get(id=note.id))
+            assert edited != components
+            assert renders == [note.id, note.id]
+
+            cog.get_components(deleted)
+            await deleted.delete()
+            cog.last_slot = SLOTS_PER_WEEK_CHANNEL_NOTE - 1
+            cog.get_current_slot = lambda: 0
+            await cog.channel_note_task()
+            assert set(cog.rendered) == {note.id}
+            assert renders == [note.id, note.id, deleted.id]
+
+    asyncio.run(run())
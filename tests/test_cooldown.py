@@ -0,0 +1,199 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import aiocache
+import pytest
+
+from src.utils.cooldown import (
+    BucketType,
+    CacheCooldownBackend,
+    CacheGCRACooldownBackend,
+    CooldownBackend,
+    CooldownExceeded,
+    CooldownSpec,
+    NearCooldownBackend,
+    RedisCooldownBackend,
+    RedisGCRACooldownBackend,
+    cooldown,
+    get_cooldown_backend,
+)
+from tests.utils import fake_redis_cache
+
+
+def hits(backend: CooldownBackend, count: int, *, limit: int, strong: bool) -> list[float | None]:
+    async def run() -> list[float | None]:
+        return [await backend.hit("key", limit=limit, per=10, strong=strong) for _ in range(count)]
+
+    return asyncio.run(run())
+
+
+def test_cache_backend_allows_up_to_limit() -> None:
+    """Test that the sliding window lets ``limit`` invocations through then refuses."""
+    results = hits(CacheCooldownBackend(aiocache.SimpleMemoryCache()), 4, limit=2, strong=False)
+    assert results[:2] == [None, None]
+    assert all(r is not None and 0 < r <= 10 for r in results[2:])
+
+
+def test_cache_backend_strong_records_refused_invocations() -> None:
+    """Test that strong cooldowns keep recording refused invocations."""
+    cache = aiocache.SimpleMemoryCache()
+    hits(CacheCooldownBackend(cache), 3, limit=1, strong=True)
+    stored = asyncio.run(cache.get("key", namespace="cooldown"))
+    assert len(stored) == 2
+
+
+def test_gcra_backend_allows_burst_then_spaces_uses() -> None:
+    """Test that GCRA allows ``limit`` uses at once then one use per ``per / limit`` seconds."""
+    cache = aiocache.SimpleMemoryCache()
+    results = hits(CacheGCRACooldownBackend(cache), 3, limit=2, strong=False)
+    assert results[:2] == [None, None]
+    assert results[2] is not None
+    assert 4.9 < results[2] <= 5
+    assert isinstance(asyncio.run(cache.get("key", namespace="cooldown:gcra")), float)
+
+
+def test_gcra_backend_strong_caps_retry_to_period() -> None:
+    """Test that strong GCRA cooldowns never ask to wait more than a full period."""
+    results = hits(CacheGCRACooldownBackend(aiocache.SimpleMemoryCache()), 10, limit=3, strong=True)
+    assert all(r is not None and r <= 10 for r in results[3:])
+    assert results[-1] is not None
+    assert results[-1] > 9.9
+
+
+def test_near_backend_replays_refusals_locally() -> None:
+    """Test that non-strong refusals are answered without reaching the wrapped backend."""
+    inner = CacheCooldownBackend(aiocache.SimpleMemoryCache())
+    calls: list[str] = []
+    original_hit = inner.hit
+
+    async def counting_hit(key: str, *, limit: int, per: int, strong: bool) -> float | None:
+        calls.append(key)
+        return await original_hit(key, limit=limit, per=per, strong=strong)
+
+    inner.hit = counting_hit  # pyright: ignore[reportAttributeAccessIssue]
+    results = hits(NearCooldownBackend(inner), 5, limit=1, strong=False)
+    assert results[0] is None
+    assert all(r is not None and 0 < r <= 10 for r in results[1:])
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("strong", [False, True])
+@pytest.mark.parametrize(
+    ("redis_backend", "memory_backend"),
+    [(RedisCooldownBackend, CacheCooldownBackend), (RedisGCRACooldownBackend, CacheGCRACooldownBackend)],
+)
+def test_redis_backends_match_memory_backends(
+    redis_backend: type[RedisCooldownBackend | RedisGCRACooldownBackend],
+    memory_backend: type[CacheCooldownBackend | CacheGCRACooldownBackend],
+    *,
+    strong: bool,
+) -> None:
+    """Test that the Lua scripts refuse the same invocations with the same retry delay as the memory backends."""
+
+    async def run() -> tuple[list[float | None], list[float | None]]:
+        redis = redis_backend(fake_redis_cache())
+        memory = memory_backend(aiocache.SimpleMemoryCache())
+        redis_results: list[float | None] = []
+        memory_results: list[float | None] = []
+        for _ in range(8):
+            redis_results.append(await redis.hit("key", limit=3, per=10, strong=strong))
+            memory_results.append(await memory.hit("key", limit=3, per=10, strong=strong))
+        return redis_results, memory_results
+
+    redis_results, memory_results = asyncio.run(run())
+    assert redis_results[:3] == [None, None, None]
+    assert [r is None for r in redis_results] == [r is None for r in memory_results]
+    for redis_retry, memory_retry in zip(redis_results[3:], memory_results[3:], strict=True):
+        assert redis_retry == pytest.approx(memory_retry, abs=0.1)
+        assert redis_retry is not None
+        assert 0 < redis_retry <= 10
+
+
+def test_redis_backends_keep_buckets_apart() -> None:
+    """Test that the Lua scripts only count the invocations of their own key, in their own namespace."""
+
+    async def run() -> None:
+        cache = fake_redis_cache()
+        window, gcra = RedisCooldownBackend(cache), RedisGCRACooldownBackend(cache)
+        assert await window.hit("a", limit=1, per=10, strong=False) is None
+        assert await window.hit("a", limit=1, per=10, strong=False) is not None
+        assert await window.hit("b", limit=1, per=10, strong=False) is None
+        assert await gcra.hit("a", limit=1, per=10, strong=False) is None
+        assert await cache.client.zcard(cache.build_key("a", namespace=RedisCooldownBackend.NAMESPACE)) == 1
+        assert 0 < await cache.client.pttl(cache.build_key("a", namespace=RedisGCRACooldownBackend.NAMESPACE)) <= 10_000
+
+    asyncio.run(run())
+
+
+def test_get_cooldown_backend_selection() -> None:
+    """Test that the backend is picked from the cache type and algorithm, and reused."""
+    memory = aiocache.SimpleMemoryCache()
+    redis = aiocache.RedisCache()
+    assert isinstance(get_cooldown_backend(memory), CacheCooldownBackend)
+    assert get_cooldown_backend(memory) is get_cooldown_backend(memory)
+    assert isinstance(get_cooldown_backend(memory, "gcra"), CacheGCRACooldownBackend)
+    assert isinstance(get_cooldown_backend(redis), RedisCooldownBackend)
+    assert isinstance(get_cooldown_backend(redis, "gcra"), RedisGCRACooldownBackend)
+
+
+def test_cooldown_spec_binds_static_settings() -> None:
+    """Test that fully static settings are resolved once at decoration time."""
+    spec = CooldownSpec(
+        key="ping",
+        limit=1,
+        per=5,
+        bucket_type=BucketType.USER,
+        strong=False,
+        cls=CooldownExceeded,
+        algorithm="sliding_window",
+    )
+    assert spec.reactive == {}
+    assert spec.static is not None
+    assert spec.static.cls is CooldownExceeded
+    assert spec.static.bucket_type is BucketType.USER
+
+
+def test_cooldown_spec_resolves_only_reactive_settings() -> None:
+    """Test that sync and async callables are resolved on each invocation."""
+
+    async def per(_bot: Any, ctx: Any) -> int:
+        return ctx.per
+
+    spec = CooldownSpec(
+        key=lambda _bot, ctx: ctx.key,
+        limit=2,
+        per=per,
+        bucket_type=BucketType.DEFAULT,
+        strong=False,
+        cls=CooldownExceeded,
+        algorithm="gcra",
+    )
+    assert spec.static is None
+    assert set(spec.reactive) == {"key", "per"}
+    settings = asyncio.run(spec.resolve(None, SimpleNamespace(key="dynamic", per=30)))  # pyright: ignore[reportArgumentType]
+    assert (settings.key, settings.limit, settings.per) == ("dynamic", 2, 30)
+
+
+def test_cooldown_decorator_raises_when_exhausted() -> None:
+    """Test the decorator end to end against the memory cache."""
+    calls: list[int] = []
+
+    @cooldown("test", limit=1, per=5, bucket_type=BucketType.USER)
+    async def command(_self: Any, _ctx: Any) -> None:
+        calls.append(1)
+
+    ctx = SimpleNamespace(bot=SimpleNamespace(botkit_cache=aiocache.SimpleMemoryCache()), author=SimpleNamespace(id=1))
+
+    async def run() -> None:
+        await command(None, ctx)  # pyright: ignore[reportArgumentType]
+        with pytest.raises(CooldownExceeded) as exc_info:
+            await command(None, ctx)  # pyright: ignore[reportArgumentType]
+        assert 0 < exc_info.value.retry_after <= 5
+        assert exc_info.value.bucket_type is BucketType.USER
+
+    asyncio.run(run())
+    assert calls == [1]
@@ -0,0 +1,267 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+import copy
+import gc
+import math
+import weakref
+from collections.abc import Iterator
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import discord
+import orjson
+import pytest
+from pydantic import ValidationError
+
+from src.i18n.cache import cache_path, load_yaml
+from src.i18n.classes import (
+    LOCALES,
+    ExtensionTranslation,
+    LazyPartialDict,
+    RawTranslation,
+    TranslationStrings,
+    apply_cached_locale,
+    apply_locale,
+    partial_fmt,
+    set_active_locales,
+)
+from src.i18n.cog import AppCommandMapping, EmojiMapping
+
+GLOBAL_KV = {"commands": {"help": "</help:1>", "admin__kick": "</admin kick:2>"}, "emojis": {"ok": "<:ok:3>"}}
+
+
+@pytest.fixture(autouse=True)
+def all_locales() -> Iterator[None]:
+    """Keep every locale, whatever a failing test left active."""
+    set_active_locales(None)
+    yield
+    set_active_locales(None)
+
+
+def test_raw_translation_lookup_matches_fields() -> None:
+    """Test that the compiled locale tables return the field of each locale, with the default locale as fallback."""
+    translation = RawTranslation.model_validate({"en-US": "Hello", "fr": "Bonjour", "pt-BR": "", "de": None})
+    fields = translation.model_dump(by_alias=True)
+
+    for locale in LOCALES:
+        assert translation.get_for_locale(locale) == fields[locale]
+        assert translation.get_for_locale(locale.replace("-", "_")) == fields[locale]
+    assert translation.get_for_locale("xx") is None
+
+    wrapper = apply_locale({"greeting": translation}, "fr")
+    assert wrapper.greeting == "Bonjour"
+    for locale in ("de", "pt-BR", "ja"):
+        assert apply_locale({"greeting": translation}, locale).greeting == "Hello"
+    assert apply_locale({"greeting": translation}, "de", default="fr").greeting == "Bonjour"
+
+
+def test_raw_translation_copies() -> None:
+    """Test that copies of a translation compile their own tables and that translations cannot be reassigned."""
+    translation = RawTranslation.model_validate({"en-US": "Hello", "fr": "Bonjour"})
+
+    for copied in (
+        translation.model_copy(),
+        translation.model_copy(deep=True),
+        copy.copy(translation),
+        copy.deepcopy(translation),
+    ):
+        assert apply_locale({"greeting": copied}, "fr").greeting == "Bonjour"
+        assert apply_locale({"greeting": copied}, "de").greeting == "Hello"
+
+    for deep in (False, True):
+        updated = translation.model_copy(update={"fr": "Salut", "de": "Hallo"}, deep=deep)
+        assert apply_locale({"greeting": updated}, "fr").greeting == "Salut"
+        assert apply_locale({"greeting": updated}, "de").greeting == "Hallo"
+        assert updated.get_for_locale("fr") == "Salut"
+        assert updated.localizations() == {"en-US": "Hello", "fr": "Salut", "de": "Hallo"}
+
+    with pytest.raises(ValidationError, match="frozen"):
+        translation.fr = "Salut"  # pyright: ignore[reportAttributeAccessIssue]
+    assert apply_locale({"greeting": translation}, "fr").greeting == "Bonjour"
+
+
+def test_active_locales_drop_other_translations() -> None:
+    """Test that only the active locales and the default one are kept, other locales falling back to the default."""
+    data = {"en-US": "Hello", "fr": "Bonjour", "de": "Hallo", "pt_BR": "Olá"}
+    assert RawTranslation.model_validate(data).localizations() == {
+        "en-US": "Hello",
+        "fr": "Bonjour",
+        "de": "Hallo",
+        "pt-BR": "Olá",
+    }
+
+    set_active_locales(["fr", "pt_BR"])
+    translation = RawTranslation.model_validate(data)
+    set_active_locales(None)
+
+    assert translation.localizations() == {"en-US": "Hello", "fr": "Bonjour", "pt-BR": "Olá"}
+    assert translation.localizations() == {
+        k: v for k, v in translation.model_dump(by_alias=True).items() if v is not None
+    }
+    # Only the active locales have a slot, the others share the default one
+    assert translation._resolved == ("Hello", "Bonjour", "Olá")  # noqa: SLF001
+    for locale, expected in (("fr", "Bonjour"), ("pt-BR", "Olá"), ("de", "Hello"), ("en-GB", "Hello")):
+        assert apply_locale({"greeting": translation}, locale).greeting == expected
+    assert apply_locale({"greeting": translation.model_copy()}, "pt-BR").greeting == "Olá"
+    with pytest.raises(ValueError, match="Invalid locale"):
+        set_active_locales(["xx"])
+
+
+def test_apply_cached_locale_shares_wrappers() -> None:
+    """Test that cached wrappers are shared per strings and locale and never changed by apply_locale."""
+    raw = {"greeting": RawTranslation.model_validate({"en-US": "Hello", "fr": "Bonjour"})}
+    strings = TranslationStrings(raw)
+    french = apply_cached_locale(strings, "fr")
+
+    assert apply_cached_locale(strings, "fr") is french
+    assert apply_cached_locale(french, "fr") is french
+    assert apply_cached_locale(strings, None) is apply_cached_locale(strings, "en-US")
+    assert apply_cached_locale(TranslationStrings(raw), "fr") is not french
+    assert apply_cached_locale(raw, "fr") is not apply_cached_locale(raw, "fr")
+
+    english = apply_locale(french, "en-US")
+    assert english is not french
+    assert (english.greeting, french.greeting) == ("Hello", "Bonjour")
+    with pytest.raises(ValueError, match="Invalid locale"):
+        apply_cached_locale(strings, "xx")
+
+    wrapper = weakref.ref(french)
+    del strings, french, english
+    gc.collect()
+    assert wrapper() is None
+
+
+def test_translation_wrapper_setters_are_deprecated() -> None:
+    """Test that the locale setters still relocalize unshared wrappers, with a warning, and refuse shared ones."""
+    strings = TranslationStrings({"greeting": RawTranslation.model_validate({"en-US": "Hello", "fr": "Bonjour"})})
+    wrapper = apply_locale(strings, "en-US")
+    with pytest.warns(DeprecationWarning, match="deprecated"):
+        wrapper.locale = "fr"
+    assert wrapper.greeting == "Bonjour"
+    with pytest.warns(DeprecationWarning, match="deprecated"):
+        wrapper.default = "fr"
+    assert wrapper.default == "fr"
+    assert apply_locale(wrapper, "en-US") is wrapper
+    assert wrapper.greeting == "Hello"
+
+    shared = apply_cached_locale(strings, "fr")
+    with pytest.warns(DeprecationWarning, match="deprecated"), pytest.raises(AttributeError, match="apply_locale"):
+        shared.locale = "en-US"
+    assert shared.greeting == "Bonjour"
+
+
+def test_translation_wrapper_nested_strings() -> None:
+    """Test that nested extension translations are resolved for the wrapper locale."""
+    translation = ExtensionTranslation.model_validate(
+        {"strings": {"a": {"en-US": "A", "fr": "Á"}}, "commands": {"ping": {"strings": {"b": {"en-US": "B"}}}}}
+    )
+    wrapper = apply_locale(translation, "fr")
+
+    assert wrapper.strings.a == "Á"
+    assert wrapper.commands["ping"].strings.b == "B"
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "plain",
+        "a {{b}} c",
+        "{commands.admin__kick} and {emojis.ok}!",
+        "{latency}ms {commands.help}",
+        "{user.name} {emojis[ok]} {a[0].b}",
+        "{emojis.ok:>12} {latency:.2f}",
+        "{x:>{w}} {latency}",
+        "{commands.help.upper}",
+        "{commands.keys}",
+    ],
+)
+def test_partial_fmt_matches_format_map(template: str) -> None:
+    """Test that compiled templates render like str.format_map with a LazyPartialDict."""
+    expected = template.format_map(LazyPartialDict(GLOBAL_KV))
+    assert partial_fmt(template, GLOBAL_KV) == expected
+    assert partial_fmt(template, GLOBAL_KV) == expected
+    assert partial_fmt(template, {}) == template.format_map(LazyPartialDict({}))
+
+
+def test_partial_fmt_missing_key_raises() -> None:
+    """Test that a missing attribute of a known key raises like AttrDict."""
+    with pytest.raises(AttributeError):
+        partial_fmt("{commands.missing}", GLOBAL_KV)
+    with pytest.raises(KeyError):
+        partial_fmt("{emojis[missing]}", GLOBAL_KV)
+
+
+def test_load_yaml_cache(tmp_path: Path) -> None:
+    """Test that YAML files are read back from their compiled cache until they change."""
+    path = tmp_path / "translations.yml"
+    path.write_text("strings:\n  a:\n    en-US: A\n", encoding="utf-8")
+    cached = cache_path(path)
+
+    assert load_yaml(path) == {"strings": {"a": {"en-US": "A"}}}
+    entry = orjson.loads(cached.read_bytes())
+    entry["data"] = {"cached": True}
+    cached.write_bytes(orjson.dumps(entry))
+    assert load_yaml(path) == {"cached": True}
+
+    path.write_text("strings:\n  a:\n    en-US: B\n", encoding="utf-8")
+    assert load_yaml(path) == {"strings": {"a": {"en-US": "B"}}}
+
+    cached.write_bytes(b"not json")
+    assert load_yaml(path) == {"strings": {"a": {"en-US": "B"}}}
+    assert orjson.loads(cached.read_bytes())["data"] == {"strings": {"a": {"en-US": "B"}}}
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    [
+        ("day: 2024-01-02\n", {"day": date(2024, 1, 2)}),
+        ("1: one\n", {1: "one"}),
+        ("nan: .nan\n", None),
+    ],
+)
+def test_load_yaml_skips_cache_of_non_json_values(tmp_path: Path, content: str, expected: Any) -> None:
+    """Test that files with values JSON would change are loaded but not cached."""
+    path = tmp_path / "translations.yml"
+    path.write_text(content, encoding="utf-8")
+    for _ in range(2):
+        data = load_yaml(path)
+        if expected is None:
+            assert math.isnan(data["nan"])
+        else:
+            assert data == expected
+            assert type(next(iter(data.values()))) is type(next(iter(expected.values())))
+    assert not cache_path(path).exists()
+
+
+def test_global_kv_mappings_index() -> None:
+    """Test that the command and emoji mappings resolve from the index built by their last rebuild."""
+
+    async def ping(ctx: object) -> None: ...
+
+    command = discord.SlashCommand(ping, name="ping")
+    command.id = 1
+    group = discord.SlashCommandGroup("admin")
+    group.id = 2
+    group.command(name="kick")(ping)
+    emojis = [SimpleNamespace(name=f"e{i}", mention=f"<:e{i}:{i}>") for i in range(64)]
+    bot = SimpleNamespace(
+        walk_application_commands=lambda: iter([command, group, *group.walk_commands()]), app_emojis=emojis
+    )
+    commands, emoji_mapping = AppCommandMapping(bot), EmojiMapping(bot)  # pyright: ignore[reportArgumentType]
+
+    with pytest.raises(KeyError):
+        emoji_mapping["e0"]
+    commands.rebuild()
+    emoji_mapping.rebuild()
+
+    assert dict(commands) == {"ping": "</ping:1>", "admin": "admin", "admin__kick": "</admin kick:2>"}
+    assert commands["admin kick"] == "</admin kick:2>"
+    assert all(emoji_mapping[emoji.name] == emoji.mention for emoji in emojis)
+    emojis.pop()
+    assert "e63" in emoji_mapping
+    emoji_mapping.rebuild()
+    assert "e63" not in emoji_mapping
+    assert len(emoji_mapping) == 63
@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+import asyncio
+
+from src.cache import LRUMemoryCache, LRUShard
+from src.config.models import LRUConfig, LRULimitsConfig
+
+
+def test_shard_evicts_least_recently_used() -> None:
+    """Test that reading an entry protects it from eviction."""
+    shard = LRUShard(max_entries=2)
+    shard.set("a", 1, None, 0)
+    shard.set("b", 2, None, 0)
+    assert shard.get("a", 0) == 1
+    shard.set("c", 3, None, 0)
+    assert list(shard.entries) == ["a", "c"]
+    assert shard.evictions == 1
+
+
+def test_shard_bounds_bytes() -> None:
+    """Test that the byte limit is enforced."""
+    shard = LRUShard(max_bytes=400)
+    for i in range(10):
+        shard.set(str(i), (float(i),) * 5, None, 0)
+    assert 0 < shard.bytes <= 400
+    assert shard.evictions == 10 - len(shard.entries)
+
+
+def test_shard_expires_entries() -> None:
+    """Test that expired entries are dropped on read."""
+    shard = LRUShard()
+    shard.set("a", 1, 10, 0)
+    assert shard.get("a", 5) == 1
+    assert shard.get("a", 10) is None
+    assert shard.expirations == 1
+
+
+def test_shard_purges_expired_entries_on_write() -> None:
+    """Test that writes drop expired entries that are never read again, even without size limits."""
+    shard = LRUShard()
+    for i in range(100):
+        shard.set(str(i), i, 10 + i % 2, 0)
+    shard.set("kept", 1, None, 0)
+    shard.set("0", 0, 20, 5)  # rewritten with a later deadline
+
+    shard.set("new", 1, 30, 10)
+    assert set(shard.entries) == {"0", "kept", "new", *(str(i) for i in range(1, 100, 2))}
+    assert shard.expirations == 49
+    shard.set("new", 1, 30, 11)
+    assert set(shard.entries) == {"0", "kept", "new"}
+    assert shard.expirations == 99
+    assert len(shard.deadlines) == 3
+
+
+def test_cache_limits_per_namespace() -> None:
+    """Test that namespaces are bounded independently and sub-namespaces inherit limits."""
+    cache = LRUMemoryCache(
+        LRUConfig(
+            default=LRULimitsConfig(max_entries=100),
+            namespaces={"cooldown": LRULimitsConfig(max_entries=2)},
+        ),
+        namespace="botkit",
+    )
+
+    async def run() -> None:
+        for i in range(5):
+            await cache.set(str(i), i, namespace="cooldown")
+            await cache.set(str(i), i, namespace="cooldown:gcra")
+            await cache.set(str(i), i)
+        assert await cache.get("4", namespace="cooldown") == 4
+        assert await cache.get("0", namespace="cooldown") is None
+        assert await cache.get("0") == 0
+
+    asyncio.run(run())
+    stats = cache.stats()
+    assert stats["cooldown"]["entries"] == 2
+    assert stats["cooldown:gcra"]["evictions"] == 3
+    assert stats["botkit"]["evictions"] == 0
+    assert cache.evictions == 6
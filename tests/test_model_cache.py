@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+import asyncio
+from typing import Any
+
+import aiocache
+
+from src.database.models import Guild, User
+from src.database.utils.cache import NAMESPACE, _fills, get_cache_key, get_or_none_cached
+from tests.utils import sqlite_database
+
+
+def test_get_cache_key_includes_prefetch_set() -> None:
+    """Test that cache keys depend on the model, the primary key and the prefetch set, but not its order."""
+    assert get_cache_key(User, 1) == "User:1"
+    assert get_cache_key(Guild, 1) == "Guild:1"
+    assert get_cache_key(User, 1, ["b", "a"]) == get_cache_key(User, 1, ["a", "b", "a"]) == "User:1:a,b"
+
+
+def test_read_through_and_invalidation() -> None:
+    """Test that repeat reads skip the database and that save/delete invalidate the cached entry."""
+
+    async def run() -> None:
+        cache = aiocache.SimpleMemoryCache()
+        async with sqlite_database():
+            assert await get_or_none_cached(cache, User, 1, ttl=60) is None
+            assert await cache.get("User:1", namespace=NAMESPACE) == {"row": None}
+
+            await User.create(id=1)
+            assert await cache.get("User:1", namespace=NAMESPACE) is None
+            user = await get_or_none_cached(cache, User, 1, ttl=60)
+            assert user is not None
+            assert user.id == 1
+
+            await User.filter(id=1).delete()  # bulk delete does not send signals
+            cached = await get_or_none_cached(cache, User, 1, ttl=60)
+            assert cached is not None
+            assert cached.id == 1
+
+            await cached.delete()
+            assert await get_or_none_cached(cache, User, 1, ttl=60) is None
+
+    asyncio.run(run())
+
+
+def test_invalidation_during_read_skips_store() -> None:
+    """Test that a row read before a write is not cached when the instance is invalidated during the read."""
+
+    async def run() -> None:
+        cache = aiocache.SimpleMemoryCache()
+        async with sqlite_database():
+            await User.create(id=1)
+            read, release = asyncio.Event(), asyncio.Event()
+            cache_set = cache.set
+
+            async def slow_set(*args: Any, **kwargs: Any) -> Any:
+                read.set()
+                await release.wait()
+                return await cache_set(*args, **kwargs)
+
+            cache.set = slow_set
+            reading = asyncio.create_task(get_or_none_cached(cache, User, 1, ttl=60))
+            await read.wait()
+            await (await User.get(id=1)).delete()
+            release.set()
+
+            assert await reading is not None
+            assert await cache.get("User:1", namespace=NAMESPACE) is None
+            assert _fills == {}
+            cache.set = cache_set
+            assert await get_or_none_cached(cache, User, 1, ttl=60) is None
+
+    asyncio.run(run())
@@ -0,0 +1,50 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+import logging
+
+import pytest
+
+from src.database.instrumentation import QueryMetrics, QueryStats, parse_query
+
+
+def test_parse_query() -> None:
+    """Test that statements are attributed to their operation and table."""
+    assert parse_query('SELECT "id" FROM "user" WHERE "id"=$1') == ("SELECT", "user")
+    assert parse_query('  insert into "guild" ("id") VALUES ($1)') == ("INSERT", "guild")
+    assert parse_query('UPDATE "channelnote" SET "enabled"=$1') == ("UPDATE", "channelnote")
+    assert parse_query('WITH inserted AS (INSERT INTO "user" ("id") VALUES ($1) RETURNING *) SELECT 1') == (
+        "WITH",
+        "user",
+    )
+    assert parse_query("SELECT 1") == ("SELECT", "-")
+
+
+def test_query_stats_histogram() -> None:
+    """Test that latencies land in the right buckets and percentiles are estimated from them."""
+    stats = QueryStats()
+    for duration in (0.0005, 0.0005, 0.003, 0.02, 5.0):
+        stats.record(duration, 2)
+    assert stats.count == 5
+    assert stats.rows == 10
+    assert stats.percentile(0.4) == 0.001
+    assert stats.percentile(0.6) == 0.005
+    assert stats.percentile(1.0) == 5.0
+    data = stats.to_dict()
+    assert data["buckets"]["le_1ms"] == 2
+    assert data["buckets"]["inf"] == 1
+    assert data["max_ms"] == 5000.0
+
+
+def test_slow_queries_are_logged_with_call_site(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that only queries over the threshold are logged, with the code that issued them."""
+    metrics = QueryMetrics(slow_query_threshold=0.1)
+    with caplog.at_level(logging.WARNING, logger="bot.database.queries"):
+        metrics.record('SELECT * FROM "dormeur"', 0.05, 3)
+        metrics.record('SELECT * FROM "dormeur"', 0.5, 3)
+    assert len(caplog.records) == 1
+    assert "500.0 ms, 3 rows" in caplog.records[0].getMessage()
+    snapshot = metrics.snapshot()
+    assert [(entry["model"], entry["operation"], entry["count"], entry["rows"]) for entry in snapshot] == [
+        ("dormeur", "SELECT", 2, 6)
+    ]
@@ -0,0 +1,131 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import orjson
+import pytest
+
+from src.cache import LRUMemoryCache, TieredCache
+from tests.utils import fake_redis_cache
+
+
+def tiered_caches(count: int) -> list[TieredCache]:
+    """Create ``count`` tiered caches, as in separate processes sharing a fake Redis server."""
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    return [
+        TieredCache(LRUMemoryCache(), fake_redis_cache(server), l1_ttl=60, namespace="botkit") for _ in range(count)
+    ]
+
+
+async def wait_for(condition: Callable[[], Awaitable[bool]]) -> None:
+    async with asyncio.timeout(2):
+        while not await condition():  # noqa: ASYNC110
+            await asyncio.sleep(0.01)
+
+
+async def subscribed(*caches: TieredCache) -> None:
+    for cache in caches:
+        cache._ensure_listener()  # noqa: SLF001
+    channel = caches[0].channel
+    await wait_for(lambda: _subscribers(caches, channel))
+
+
+async def _subscribers(caches: tuple[TieredCache, ...], channel: str) -> bool:
+    ((_, count),) = await caches[0].l2.client.pubsub_numsub(channel)
+    return count == len(caches)
+
+
+async def _equals(cache: TieredCache, key: str, expected: Any) -> bool:
+    return await cache.get(key) == expected
+
+
+def test_listener_starts_on_first_use() -> None:
+    """Test that the invalidation listener is only started by the first cache operation."""
+
+    async def run() -> None:
+        (cache,) = tiered_caches(1)
+        assert cache._listener is None  # noqa: SLF001
+        assert await cache.get("missing") is None
+        assert cache._listener is not None  # noqa: SLF001
+        await cache.close()
+
+    asyncio.run(run())
+
+
+def test_reads_fill_and_hit_l1() -> None:
+    """Test that values read from L2 are put in L1 and then served from it."""
+
+    async def run() -> None:
+        writer, reader = tiered_caches(2)
+        await writer.set("key", "value")
+        assert await reader.l1.get("key", namespace="botkit") is None
+        assert await reader.get("key") == "value"
+        assert await reader.l1.get("key", namespace="botkit") == "value"
+
+        await reader.l2.set("key", "changed behind L1", namespace="botkit")
+        assert await reader.get("key") == "value"
+        assert await reader.multi_get(["key", "missing"]) == ["value", None]
+        await writer.close()
+        await reader.close()
+
+    asyncio.run(run())
+
+
+def test_writes_invalidate_other_instances() -> None:
+    """Test that a write from one instance drops the L1 copy of the others."""
+
+    async def run() -> None:
+        writer, reader = tiered_caches(2)
+        await subscribed(writer, reader)
+        await writer.set("key", "old")
+        assert await reader.get("key") == "old"
+
+        await writer.set("key", "new")
+        await wait_for(lambda: _equals(reader, "key", "new"))
+        await writer.delete("key")
+        await wait_for(lambda: _equals(reader, "key", None))
+        await writer.close()
+        await reader.close()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("remote", [False, True])
+def test_invalidation_during_l2_read_skips_l1_fill(*, remote: bool) -> None:
+    """Test that an old value read from L2 is not put in L1 when the key is invalidated during the read."""
+
+    async def run() -> None:
+        (cache,) = tiered_caches(1)
+        await cache.l2.set("key", "old", namespace="botkit")
+        read, release = asyncio.Event(), asyncio.Event()
+        l2_get = cache.l2.get
+
+        async def slow_get(*args: Any, **kwargs: Any) -> Any:
+            value = await l2_get(*args, **kwargs)
+            read.set()
+            await release.wait()
+            return value
+
+        cache.l2.get = slow_get  # pyright: ignore[reportAttributeAccessIssue]
+        reading = asyncio.create_task(cache.get("key"))
+        await read.wait()
+        if remote:
+            await cache._on_invalidation(orjson.dumps(["another instance", "botkit", ["key"]]))  # noqa: SLF001
+        else:
+            await cache.l2.set("key", "new", namespace="botkit")
+            await cache._invalidate("botkit", ["key"])  # noqa: SLF001
+        release.set()
+
+        assert await reading == "old"
+        assert await cache.l1.get("key", namespace="botkit") is None
+        assert cache._fills == {}  # noqa: SLF001
+        cache.l2.get = l2_get  # pyright: ignore[reportAttributeAccessIssue]
+        assert await cache.get("key") == ("old" if remote else "new")
+        assert await cache.l1.get("key", namespace="botkit") is not None
+        await cache.close()
+
+    asyncio.run(run())
@@ -0,0 +1,100 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+import asyncio
+from types import SimpleNamespace
+
+import aiocache
+import pytest
+
+from src.config import config
+from src.database.models import User
+from src.database.utils.preload import _preload, _preload_or_create_user  # pyright: ignore[reportPrivateUsage]
+from src.database.utils.upsert import upsert, upsert_many
+from tests.utils import count_queries, sqlite_database
+
+
+def test_upsert_many_creates_missing_rows() -> None:
+    """Test that existing rows are returned and missing ones created, in fewer statements than get_or_create."""
+
+    async def run() -> None:
+        async with sqlite_database():
+            await User.create(id=1)
+
+            with count_queries() as baseline:
+                for pk in range(1, 21):
+                    await User.get_or_create(id=pk + 100)
+            with count_queries() as queries:
+                users = await upsert_many(User, [*range(1, 21), 1])
+
+            assert sorted(users) == list(range(1, 21))
+            assert all(user.id == pk for pk, user in users.items())
+            assert await User.all().count() == 40
+            assert len(queries) == 2  # insert, then select the row that already existed
+            assert len(baseline) == 40
+
+            with count_queries() as queries:
+                user = await upsert(User, 50)
+            assert user.id == 50
+            assert len(queries) == 1
+
+    asyncio.run(run())
+
+
+@pytest.fixture
+def db_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config.db.cache, "enabled", True)
+
+
+@pytest.mark.usefixtures("db_cache")
+def test_preload_or_create_user_uses_cache() -> None:
+    """Test that repeat preloads of a created user do not reach the database."""
+
+    async def run() -> None:
+        bot = SimpleNamespace(botkit_cache=aiocache.SimpleMemoryCache())
+        async with sqlite_database():
+            with count_queries() as queries:
+                for _ in range(5):
+                    ctx = SimpleNamespace(bot=bot, author=SimpleNamespace(id=7), user_obj=None)
+                    assert await _preload_or_create_user(ctx, [])  # pyright: ignore[reportArgumentType]
+                    assert ctx.user_obj is not None
+                    assert ctx.user_obj.id == 7
+            assert len(queries) == 1
+
+    asyncio.run(run())
+
+
+@pytest.mark.usefixtures("db_cache")
+def test_combined_preload_populates_user_and_guild() -> None:
+    """Test that the combined preload check fills both objects, creating them when asked."""
+
+    async def run() -> None:
+        bot = SimpleNamespace(botkit_cache=aiocache.SimpleMemoryCache())
+        member = SimpleNamespace(id=7)
+
+        def make_ctx() -> SimpleNamespace:
+            return SimpleNamespace(
+                bot=bot, author=member, user=member, guild=SimpleNamespace(id=8), user_obj=None, guild_obj=None
+            )
+
+        async with sqlite_database():
+            ctx = make_ctx()
+            assert await _preload(ctx, user=[], guild=[], create=False)  # pyright: ignore[reportArgumentType]
+            assert ctx.user_obj is None
+            assert ctx.guild_obj is None
+
+            ctx = make_ctx()
+            assert await _preload(ctx, user=[], guild=[], create=True)  # pyright: ignore[reportArgumentType]
+            assert ctx.user_obj is not None
+            assert ctx.user_obj.id == 7
+            assert ctx.guild_obj is not None
+            assert ctx.guild_obj.id == 8
+
+            ctx = make_ctx()
+            with count_queries() as queries:
+                assert await _preload(ctx, user=None, guild=[], create=False)  # pyright: ignore[reportArgumentType]
+            assert ctx.user_obj is None
+            assert ctx.guild_obj is not None
+            assert len(queries) == 0
+
+    asyncio.run(run())
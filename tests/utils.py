@@ -0,0 +1,72 @@
+# SPDX-License-Identifier: MIT
+# Copyright: 2024-2026 NiceBots.xyz
+
+import logging
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING, Any, override
+
+import aiocache
+import pytest
+from tortoise import Tortoise
+
+if TYPE_CHECKING:
+    from fakeredis import FakeServer
+
+
+@asynccontextmanager
+async def sqlite_database(*modules: str) -> AsyncIterator[None]:
+    """Run the bot's models, and any extra model modules, against a fresh in-memory SQLite database."""
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["src.database.models", *modules]})
+    try:
+        await Tortoise.generate_schemas()
+        yield
+    finally:
+        await Tortoise.close_connections()
+
+
+class QueryCounter(logging.Handler):
+    """Collect the statements Tortoise sends to the database."""
+
+    def __init__(self) -> None:
+        super().__init__(logging.DEBUG)
+        self.queries: list[str] = []
+
+    @override
+    def emit(self, record: logging.LogRecord) -> None:
+        # Database clients log each statement as "query: values", connection events use other formats.
+        if record.msg == "%s: %s":
+            self.queries.append(str(record.args[0]))  # pyright: ignore[reportOptionalSubscript]
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Count the statements sent to the database inside the block."""
+    logger = logging.getLogger("tortoise.db_client")
+    counter = QueryCounter()
+    level = logger.level
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(counter)
+    try:
+        yield counter
+    finally:
+        logger.removeHandler(counter)
+        logger.setLevel(level)
+
+
+def fake_redis_cache(server: "FakeServer | None" = None, **kwargs: Any) -> aiocache.RedisCache:
+    """Create a Redis cache backed by fakeredis, sharing ``server`` with other caches if given.
+
+    Lua scripts run through lupa. The calling test is skipped when either is not installed.
+    """
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    cache = aiocache.RedisCache(**kwargs)
+    cache.client = fakeredis.FakeAsyncRedis(server=server)
+    return cache
+
+
+__all__ = ["QueryCounter", "count_queries", "fake_redis_cache", "sqlite_database"]